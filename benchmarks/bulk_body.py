@@ -0,0 +1,139 @@
+"""
+Microbenchmark of bulk body assembly in the streaming engine.
+
+Measures documents per second on a single core for the way from raw search
+response bytes to NDJSON bulk body:
+
+    * dicts - decode response with `json`, build bulk operations of dicts and
+      serialize them line by line, as Elasticsearch client does
+    * raw/<backend> - `SearchPageDecoder` and `BulkBuffer` with every available
+      JSON backend
+
+Usage:
+    python -m benchmarks.bulk_body --docs 1000 --doc_size 1024 --rounds 50
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+from collections.abc import Callable
+
+from elasticsearch_reindex import bulk
+from elasticsearch_reindex.bulk import BulkBuffer, SearchPageDecoder
+
+
+def make_search_response(docs: int, doc_size: int) -> bytes:
+    """
+    Return search response with documents of roughly `doc_size` bytes.
+    """
+    rnd = random.Random(42)
+    hits = []
+    for i in range(docs):
+        text = "".join(rnd.choices(string.ascii_letters + " ", k=doc_size // 2))
+        source = {
+            "id": i,
+            "title": f"Document {i}",
+            "tags": ["alpha", "beta", "gamma"],
+            "price": rnd.random() * 100,
+            "created_at": "2024-01-01T00:00:00Z",
+            "nested": {"flag": bool(i % 2), "count": i * 3},
+            "text": text,
+        }
+        hits.append({"_index": "bench", "_id": str(i), "_source": source, "sort": [i]})
+    return json.dumps({"pit_id": "pit", "hits": {"hits": hits}}).encode()
+
+
+def build_with_dicts(body: bytes) -> int:
+    """
+    Decode response to dicts and serialize bulk operations back.
+    """
+    response = json.loads(body)
+    operations = []
+    for hit in response["hits"]["hits"]:
+        operations.append({"index": {"_index": "bench", "_id": hit["_id"]}})
+        operations.append(hit["_source"])
+    data = "\n".join(json.dumps(item, separators=(",", ":")) for item in operations)
+    return len((data + "\n").encode())
+
+
+def make_raw_builder(decoder: SearchPageDecoder) -> Callable[[bytes], int]:
+    """
+    Return builder of bulk body from raw hits into a reused buffer.
+    """
+    buffer = BulkBuffer()
+
+    def build_raw(body: bytes) -> int:
+        page = decoder.decode(body=body)
+        buffer.clear()
+        for doc_id, routing, source in page.hits:
+            buffer.add(
+                action="index",
+                es_index="bench",
+                doc_id=doc_id,
+                routing=routing,
+                source=source,
+            )
+        with buffer.getbuffer() as view:
+            return view.nbytes
+
+    return build_raw
+
+
+def measure(
+    build: Callable[[bytes], int], body: bytes, docs: int, rounds: int
+) -> float:
+    """
+    Return documents per second of the builder.
+    """
+    build(body)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        build(body)
+    return docs * rounds / (time.perf_counter() - started)
+
+
+def get_backends() -> list[tuple[str, bool, bool]]:
+    """
+    Return available JSON backends as (name, has_simdjson, has_orjson) flags.
+    """
+    backends = [("json", False, False)]
+    if bulk.HAS_ORJSON:
+        backends.append(("orjson", False, True))
+    if bulk.HAS_SIMDJSON:
+        backends.append(("simdjson", True, bulk.HAS_ORJSON))
+    return backends
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--doc_size", type=int, default=1024)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    body = make_search_response(docs=args.docs, doc_size=args.doc_size)
+    print(f"Search response: {args.docs} documents, {len(body) / 1024:.0f}kb")
+
+    baseline = measure(build_with_dicts, body, args.docs, args.rounds)
+    print(f"{'dicts':<16} {baseline:>12,.0f} docs/sec per core")
+
+    available = bulk.HAS_SIMDJSON, bulk.HAS_ORJSON
+    try:
+        for name, has_simdjson, has_orjson in get_backends():
+            # Backend is picked by module flags, the same way as in the stream.
+            bulk.HAS_SIMDJSON, bulk.HAS_ORJSON = has_simdjson, has_orjson
+            rate = measure(
+                make_raw_builder(SearchPageDecoder()), body, args.docs, args.rounds
+            )
+            print(
+                f"{'raw/' + name:<16} {rate:>12,.0f} docs/sec per core "
+                f"({rate / baseline:.1f}x)"
+            )
+    finally:
+        bulk.HAS_SIMDJSON, bulk.HAS_ORJSON = available
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+In-process fake Elasticsearch for benchmarks of reindex orchestration.
+
+Serves just enough of the API for a reindex run: cluster info, `_cat/indices`,
+`_reindex` and `_tasks`. Reindex tasks copy documents at a fixed rate, every
+request is delayed by a fixed latency and counted, so a run can be measured
+without a real cluster.
+"""
+
+import gzip
+import json
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Prefix of fake server threads, so they are not counted as threads of the client.
+THREAD_PREFIX = "fake-es"
+
+ES_INFO = {
+    "version": {"number": "8.16.0", "build_flavor": "default"},
+    "tagline": "You Know, for Search",
+}
+
+
+@dataclass
+class FakeTask:
+    """
+    Dataclass for storing fake reindex task copying documents at a fixed rate.
+    """
+
+    index: str
+    total: int
+    started_at: float
+    duration: float
+    # Time when a status request saw the task completed first.
+    observed_at: float | None = None
+
+    @property
+    def finished_at(self) -> float:
+        return self.started_at + self.duration
+
+    def get_status(self, now: float) -> dict[str, int]:
+        progress = 1.0 if not self.duration else (now - self.started_at) / self.duration
+        created = min(int(self.total * progress), self.total)
+        return {
+            "total": self.total,
+            "created": created,
+            "updated": 0,
+            "deleted": 0,
+            "batches": 1,
+            "version_conflicts": 0,
+            "noops": 0,
+            "throttled_millis": 0,
+        }
+
+
+@dataclass
+class FakeCluster:
+    """
+    Dataclass for storing state shared by fake source and destination.
+    """
+
+    indexes: dict[str, int]
+    doc_rate: float = 10000.0
+    latency: float = 0.0
+    dest_indexes: dict[str, int] = field(default_factory=dict)
+    tasks: dict[str, FakeTask] = field(default_factory=dict)
+    requests: Counter = field(default_factory=Counter)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def create_task(self, index: str, dest_index: str) -> str:
+        total = self.indexes.get(index, 0)
+        with self.lock:
+            task_id = f"fake:{len(self.tasks) + 1}"
+            self.tasks[task_id] = FakeTask(
+                index=dest_index,
+                total=total,
+                started_at=time.monotonic(),
+                duration=total / self.doc_rate,
+            )
+        return task_id
+
+    def get_poll_latencies(self) -> list[float]:
+        """
+        Return delays between completion of tasks and their observation.
+        """
+        return [
+            task.observed_at - task.finished_at
+            for task in self.tasks.values()
+            if task.observed_at is not None
+        ]
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, delayed ACK would stall them.
+    disable_nagle_algorithm = True
+    cluster: FakeCluster
+    dest: bool
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        self._count(method="GET", path=url.path)
+        if url.path == "/":
+            self._send(body=ES_INFO)
+        elif url.path.startswith("/_cat/indices"):
+            self._send(body=self._cat_indexes(params=parse_qs(url.query)))
+        elif url.path == "/_tasks":
+            self._send(body=self._list_tasks())
+        elif url.path.startswith("/_tasks/"):
+            self._get_task(task_id=url.path.rsplit("/", 1)[1])
+        else:
+            self._send_not_found(path=url.path)
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        self._count(method="POST", path=url.path)
+        body = self._read_body()
+        if url.path == "/_reindex":
+            task_id = self.cluster.create_task(
+                index=body["source"]["index"], dest_index=body["dest"]["index"]
+            )
+            self._send(body={"task": task_id})
+        elif url.path.endswith("/_rethrottle"):
+            self._send(body={"nodes": {}})
+        else:
+            self._send_not_found(path=url.path)
+
+    def _count(self, method: str, path: str) -> None:
+        if path.startswith("/_tasks/"):
+            path = "/_tasks/<id>"
+        elif path.startswith("/_cat/indices"):
+            path = "/_cat/indices"
+        with self.cluster.lock:
+            self.cluster.requests[f"{method} {path}"] += 1
+        if self.cluster.latency:
+            time.sleep(self.cluster.latency)
+
+    def _cat_indexes(self, params: dict[str, list[str]]) -> list[dict] | str:
+        indexes = self.cluster.dest_indexes if self.dest else self.cluster.indexes
+        with self.cluster.lock:
+            indexes = sorted(indexes.items())
+        if params.get("format") != ["json"]:
+            return "".join(f"{name} {docs} {docs * 100}\n" for name, docs in indexes)
+        return [
+            {
+                "index": name,
+                "docs.count": str(docs),
+                "store.size": str(docs * 100),
+                "status": "open",
+                "health": "green",
+            }
+            for name, docs in indexes
+        ]
+
+    def _list_tasks(self) -> dict:
+        now = time.monotonic()
+        with self.cluster.lock:
+            running = {
+                task_id: {
+                    "node": "fake",
+                    "id": int(task_id.split(":")[1]),
+                    "action": "indices:data/write/reindex",
+                    "status": task.get_status(now=now),
+                }
+                for task_id, task in self.cluster.tasks.items()
+                if task.finished_at > now
+            }
+        return {"nodes": {"fake": {"name": "fake", "tasks": running}}}
+
+    def _get_task(self, task_id: str) -> None:
+        task = self.cluster.tasks.get(task_id)
+        if task is None:
+            self._send_not_found(path=task_id)
+            return
+        now = time.monotonic()
+        status = task.get_status(now=now)
+        completed = task.finished_at <= now
+        body = {
+            "completed": completed,
+            "task": {
+                "node": "fake",
+                "status": status,
+                "running_time_in_nanos": int((now - task.started_at) * 1e9),
+            },
+        }
+        if completed:
+            with self.cluster.lock:
+                if task.observed_at is None:
+                    task.observed_at = now
+                self.cluster.dest_indexes[task.index] = task.total
+            body["response"] = dict(status, failures=[])
+        self._send(body=body)
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length) if length else b""
+        if self.headers.get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return json.loads(data) if data else {}
+
+    def _send(self, body: dict | list | str, status: int = 200) -> None:
+        if isinstance(body, str):
+            data, content_type = body.encode(), "text/plain"
+        else:
+            data, content_type = json.dumps(body).encode(), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("X-Elastic-Product", "Elasticsearch")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_not_found(self, path: str) -> None:
+        error = {"type": "resource_not_found_exception", "reason": path}
+        self._send(body={"error": error, "status": 404}, status=404)
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def process_request(self, request, client_address) -> None:
+        thread = threading.Thread(
+            target=self.process_request_thread,
+            args=(request, client_address),
+            name=f"{THREAD_PREFIX}-request",
+            daemon=True,
+        )
+        thread.start()
+
+
+class FakeElasticsearch:
+    """
+    Fake source or destination Elasticsearch served from a background thread.
+    """
+
+    def __init__(self, cluster: FakeCluster, dest: bool = False) -> None:
+        handler = type(
+            "ClusterHandler", (FakeHandler,), {"cluster": cluster, "dest": dest}
+        )
+        self._server = FakeServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name=f"{THREAD_PREFIX}-server"
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self) -> "FakeElasticsearch":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
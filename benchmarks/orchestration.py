@@ -0,0 +1,209 @@
+"""
+Benchmark of reindex orchestration overhead against a fake Elasticsearch.
+
+Runs `ReindexManager` against in-process fake source and destination, whose
+reindex tasks copy documents at a fixed rate, for every amount of indexes:
+
+    * requests per task - requests sent to destination per reindex task
+    * peak threads - threads of the client, fake server threads excluded
+    * poll latency - delay between completion of a task and its observation
+    * makespan - duration of the run and its overhead over the ideal one,
+      in which every worker slot starts the next task as soon as one finishes
+
+Results are written to JSON. With a baseline file of a previous run, metrics
+worse than the baseline by more than the tolerance fail the benchmark.
+
+Usage:
+    python -m benchmarks.orchestration --indexes 10,100,1000 --output result.json
+    python -m benchmarks.orchestration --baseline result.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import logging
+import math
+import platform
+import statistics
+import sys
+import threading
+import time
+
+from benchmarks.fake_es import THREAD_PREFIX, FakeCluster, FakeElasticsearch
+from elasticsearch_reindex import ReindexManager
+from elasticsearch_reindex.logger import create_logger
+
+# Metrics compared with the baseline, all of them are better when lower.
+COMPARED_METRICS = (
+    "requests_per_task",
+    "peak_threads",
+    "poll_latency_p95",
+    "makespan_overhead",
+)
+
+
+class ThreadSampler:
+    """
+    Sample amount of client threads in background and keep the peak.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.peak = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{THREAD_PREFIX}-sampler", daemon=True
+        )
+
+    def __enter__(self) -> "ThreadSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            threads = sum(
+                not thread.name.startswith(THREAD_PREFIX)
+                for thread in threading.enumerate()
+            )
+            self.peak = max(self.peak, threads)
+
+
+def get_ideal_makespan(tasks: int, workers: int, duration: float) -> float:
+    """
+    Return duration of equal tasks on worker slots without any overhead.
+    """
+    return math.ceil(tasks / workers) * duration
+
+
+def get_percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * percentile), len(values) - 1)]
+
+
+def run_case(indexes: int, args: argparse.Namespace) -> dict:
+    """
+    Migrate the amount of indexes from fake source and return metrics.
+    """
+    cluster = FakeCluster(
+        indexes={f"bench-{number:05d}": args.docs for number in range(indexes)},
+        doc_rate=args.doc_rate,
+        latency=args.latency,
+    )
+    with (
+        FakeElasticsearch(cluster=cluster) as source,
+        FakeElasticsearch(cluster=cluster, dest=True) as dest,
+    ):
+        manager = ReindexManager.from_dict(
+            data={
+                "source_host": source.url,
+                "dest_host": dest.url,
+                "concurrent_tasks": args.concurrent_tasks,
+                "check_interval": args.check_interval,
+                "engine": args.engine,
+            }
+        )
+        with ThreadSampler() as sampler:
+            started = time.perf_counter()
+            manager.start_reindex()
+            makespan = time.perf_counter() - started
+
+    tasks = len(cluster.tasks)
+    poll_latencies = cluster.get_poll_latencies()
+    ideal_makespan = get_ideal_makespan(
+        tasks=tasks, workers=args.concurrent_tasks, duration=args.docs / args.doc_rate
+    )
+    return {
+        "indexes": indexes,
+        "tasks": tasks,
+        "requests": dict(cluster.requests),
+        "requests_per_task": (sum(cluster.requests.values()) / tasks if tasks else 0.0),
+        "peak_threads": sampler.peak,
+        "poll_latency_mean": (
+            statistics.fmean(poll_latencies) if poll_latencies else 0.0
+        ),
+        "poll_latency_p95": get_percentile(values=poll_latencies, percentile=0.95),
+        "makespan": makespan,
+        "ideal_makespan": ideal_makespan,
+        "makespan_overhead": makespan - ideal_makespan,
+    }
+
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """
+    Return regressions of results against the baseline ones of the same size.
+    """
+    baseline_results = {result["indexes"]: result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        if (previous := baseline_results.get(result["indexes"])) is None:
+            continue
+        for metric in COMPARED_METRICS:
+            limit = previous[metric] * (1 + tolerance)
+            # Small absolute values are noise, e.g. poll latency of instant tasks.
+            if result[metric] > limit and result[metric] - previous[metric] > 0.05:
+                regressions.append(
+                    f"{result['indexes']} indexes: {metric} "
+                    f"{previous[metric]:.3f} -> {result[metric]:.3f}"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--indexes", default="10,100,1000")
+    parser.add_argument("--docs", type=int, default=1000)
+    parser.add_argument("--doc_rate", type=float, default=20000.0)
+    parser.add_argument("--latency", type=float, default=0.001)
+    parser.add_argument("--concurrent_tasks", type=int, default=10)
+    parser.add_argument("--check_interval", type=float, default=0.1)
+    parser.add_argument("--engine", default="thread")
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # Logs of every task would dominate runs with thousands of indexes.
+    create_logger().setLevel(logging.WARNING)
+
+    results = []
+    for indexes in (int(value) for value in args.indexes.split(",")):
+        result = run_case(indexes=indexes, args=args)
+        results.append(result)
+        print(
+            f"{indexes:>6} indexes: "
+            f"{result['requests_per_task']:.2f} requests/task, "
+            f"{result['peak_threads']} threads, "
+            f"poll latency p95 {result['poll_latency_p95'] * 1000:.0f}ms, "
+            f"makespan {result['makespan']:.2f}s "
+            f"(ideal {result['ideal_makespan']:.2f}s)"
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "params": vars(args),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(
+                results=results,
+                baseline=json.load(baseline_file),
+                tolerance=args.tolerance,
+            )
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
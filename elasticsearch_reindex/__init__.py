@@ -1 +1,2 @@
 from .manager import ReindexManager
+from .topology import TopologyRunner
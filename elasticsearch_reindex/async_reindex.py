@@ -0,0 +1,355 @@
+"""
+Module with asyncio interface to ElasticSearch Reindex API.
+"""
+
+import asyncio
+from collections.abc import Iterator
+from functools import partial
+from itertools import count
+from threading import Lock
+from types import TracebackType
+from uuid import uuid4
+
+from elasticsearch_reindex.const import (
+    ES_CHECK_REINDEX_TASK_ENDPOINT,
+    ES_CREATE_REINDEX_TASK_ENDPOINT,
+    ES_LIST_REINDEX_TASKS_ENDPOINT,
+    ES_OPAQUE_ID_HEADER,
+)
+from elasticsearch_reindex.errors import ElasticSearchTransientException
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.reindex import ReindexService
+from elasticsearch_reindex.retry import Retryable
+from elasticsearch_reindex.schema import Config, IndexSlice
+from elasticsearch_reindex.state import StateStore
+
+try:
+    import aiohttp
+except ImportError as exc:  # pragma: no cover
+    raise ImportError(
+        "Asyncio engine requires aiohttp: pip install elasticsearch-reindex[async]"
+    ) from exc
+
+logger = create_logger()
+
+
+class AsyncReindexService(ReindexService):
+    """
+    This class provide asyncio interface to ElasticSearch Reindex API.
+
+    All tasks share one HTTP connections pool and one polling coroutine,
+    so hundreds of tasks are tracked from a single event loop.
+    """
+
+    retryable_errors: Retryable = (
+        aiohttp.ClientConnectionError,
+        asyncio.TimeoutError,
+        ElasticSearchTransientException,
+    )
+
+    def __init__(self, config: Config, state_store: StateStore | None = None):
+        super().__init__(config=config, state_store=state_store)
+        self._aio_session: aiohttp.ClientSession | None = None
+        self._waiters: dict[str, tuple[IndexSlice, asyncio.Future]] = {}
+        # Snapshot of waiting task IDs, read by monitor threads.
+        self._task_ids: list[str] = []
+        self._task_ids_lock = Lock()
+        # Consecutive polls which could not get status of the task.
+        self._check_errors: dict[str, int] = {}
+        self._poller_task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "AsyncReindexService":
+        auth = aiohttp.BasicAuth(*self.http_auth) if self.http_auth else None
+        self._aio_session = aiohttp.ClientSession(
+            auth=auth,
+            headers=self.headers,
+            connector=aiohttp.TCPConnector(limit=self.config.concurrent_tasks),
+            timeout=aiohttp.ClientTimeout(total=self.config.request_timeout),
+        )
+        # Nodes are discovered by blocking requests, once before the first task.
+        await asyncio.to_thread(lambda: self.dest_nodes)
+        self._poller_task = asyncio.create_task(self._poll_tasks())
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._poller_task:
+            self._poller_task.cancel()
+            await asyncio.gather(self._poller_task, return_exceptions=True)
+        if self._aio_session:
+            await self._aio_session.close()
+        self.close()
+
+    @property
+    def aio_session(self) -> aiohttp.ClientSession:
+        """
+        Return opened HTTP session.
+        """
+        if self._aio_session is None:
+            raise RuntimeError("AsyncReindexService must be used as async context")
+        return self._aio_session
+
+    @property
+    def running_tasks(self) -> list[str]:
+        """
+        Return IDs of reindex tasks waiting for completion, safe from any thread.
+        """
+        with self._task_ids_lock:
+            return list(self._task_ids)
+
+    async def transfer_slice_async(self, es_slice: IndexSlice) -> str:
+        """
+        Create reindex task for part of index and wait for it to finish.
+
+        Args:
+            es_slice (IndexSlice): Part of Elasticsearch index to reindex.
+
+        Returns:
+            str: The ID of the completed reindex task.
+        """
+        task_id = await self._create_reindex_task_async(es_slice=es_slice)
+        logger.info(f"Reindex task: {task_id} for {es_slice.name}")
+        self._record_submitted(es_slice=es_slice, task_id=task_id)
+        return await self._wait_for_task(task_id=task_id, es_slice=es_slice)
+
+    async def attach_slice_async(self, es_slice: IndexSlice, task_id: str) -> str:
+        """
+        Wait for already running reindex task, e.g. created by a killed run.
+
+        Args:
+            es_slice (IndexSlice): Part of Elasticsearch index transferred by the task.
+            task_id (str): The ID of the running reindex task.
+
+        Returns:
+            str: The ID of the completed reindex task.
+        """
+        logger.info(f"Reattached to reindex task: {task_id} for {es_slice.name}")
+        return await self._wait_for_task(task_id=task_id, es_slice=es_slice)
+
+    async def _wait_for_task(self, task_id: str, es_slice: IndexSlice) -> str:
+        """
+        Register the task for polling and wait for its completion.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[task_id] = (es_slice, future)
+        self._update_task_ids()
+        self._trace_task(future=future, es_slice=es_slice, task_id=task_id)
+        return await future
+
+    async def _create_reindex_task_async(self, es_slice: IndexSlice) -> str:
+        """
+        Create reindex task via Elasticsearch API, retrying transient failures.
+        """
+        with self.tracer.span(name="submit", category="task", slice=es_slice.name):
+            return await self._retry.call_async(
+                func=partial(
+                    self._submit_reindex_task_async,
+                    es_slice=es_slice,
+                    opaque_id=uuid4().hex,
+                    attempts=count(),
+                ),
+                retryable=self.retryable_errors,
+            )
+
+    async def _submit_reindex_task_async(
+        self, es_slice: IndexSlice, opaque_id: str, attempts: Iterator[int]
+    ) -> str:
+        """
+        Create the task, unless a failed attempt has already created it.
+        """
+        if next(attempts) and (
+            task_id := await self._find_reindex_task_async(opaque_id=opaque_id)
+        ):
+            logger.info(
+                f"Reindex task: {task_id} for {es_slice.name} found after failed request"
+            )
+            return task_id
+        return await self._post_reindex_task_async(
+            es_slice=es_slice, opaque_id=opaque_id
+        )
+
+    async def _post_reindex_task_async(
+        self, es_slice: IndexSlice, opaque_id: str
+    ) -> str:
+        """
+        Make single request to Elasticsearch Reindex API.
+        """
+        with self._node_request(node=self._choose_dest_node()) as es_host:
+            async with self.aio_session.post(
+                url=ES_CREATE_REINDEX_TASK_ENDPOINT.format(es_host=es_host),
+                data=self._encode_body(body=self._get_reindex_body(es_slice=es_slice)),
+                headers={**self.body_headers, ES_OPAQUE_ID_HEADER: opaque_id},
+                params=self.task_params,
+            ) as response:
+                self._check_transient_status(
+                    status=response.status, error=await response.text(), host=es_host
+                )
+                json_data = await response.json()
+        return self._parse_create_response(json_data=json_data, es_slice=es_slice)
+
+    async def _check_task_completed_async(
+        self, task_id: str
+    ) -> tuple[bool, dict[str, int]]:
+        """
+        Make request to Elasticsearch Tasks API and check task status.
+        """
+        with self._node_request(node=self._get_task_node(task_id=task_id)) as es_host:
+            endpoint = ES_CHECK_REINDEX_TASK_ENDPOINT.format(
+                es_host=es_host, task_id=task_id
+            )
+            async with self.aio_session.get(url=endpoint) as response:
+                self._check_transient_status(
+                    status=response.status, error=await response.text(), host=es_host
+                )
+                json_data = await response.json()
+        return self._parse_task_response(json_data=json_data, task_id=task_id)
+
+    async def _list_reindex_tasks_async(self) -> dict[str, dict[str, int]]:
+        """
+        Make single request to Elasticsearch Tasks API for all running reindex tasks.
+        """
+        return self._parse_tasks_list(json_data=await self._get_tasks_list_async())
+
+    async def _find_reindex_task_async(self, opaque_id: str) -> str | None:
+        """
+        Return ID of running reindex task created with the opaque ID.
+        """
+        return self._get_task_by_opaque_id(
+            json_data=await self._get_tasks_list_async(), opaque_id=opaque_id
+        )
+
+    async def _get_tasks_list_async(self) -> dict:
+        """
+        Return Tasks API list of running reindex tasks.
+        """
+        with self._node_request(node=self._get_poll_node()) as es_host:
+            endpoint = ES_LIST_REINDEX_TASKS_ENDPOINT.format(es_host=es_host)
+            async with self.aio_session.get(url=endpoint) as response:
+                self._check_transient_status(
+                    status=response.status, error=await response.text(), host=es_host
+                )
+                response.raise_for_status()
+                return await response.json()
+
+    async def _poll_tasks(self) -> None:
+        """
+        Check statuses of all waiting tasks once per check interval.
+
+        Errors of a single poll are logged, so waiting tasks do not hang.
+        """
+        while True:
+            await asyncio.sleep(self.config.check_interval)
+            if not self._waiters:
+                continue
+            try:
+                await self._poll_once()
+            except Exception as exc:
+                logger.error(f"Can not poll reindex tasks: {exc}")
+
+    async def _poll_once(self) -> None:
+        """
+        List running tasks and fetch statuses of the finished ones.
+        """
+        try:
+            with (
+                self.metrics.time_poll(),
+                self.tracer.span(name="poll", category="poll") as span,
+            ):
+                running = await self.dest_breaker.call_async(
+                    func=self._list_reindex_tasks_async, retryable=self.retryable_errors
+                )
+                span["running"] = len(running)
+        except self.retryable_errors as exc:
+            # Destination is unavailable, so are statuses of single tasks.
+            self._on_check_error(task_ids=list(self._waiters), exc=exc)
+            return
+        except Exception as exc:
+            # Fall back to checking every task separately.
+            logger.error(f"Can not list reindex tasks: {exc}")
+            running = {}
+
+        finished = []
+        for task_id, (es_slice, _) in list(self._waiters.items()):
+            if info := running.get(task_id):
+                self._check_errors.pop(task_id, None)
+                self._report_progress(task_id=task_id, es_slice=es_slice, info=info)
+            else:
+                finished.append(task_id)
+
+        await asyncio.gather(
+            *(self._check_task(task_id=task_id) for task_id in finished)
+        )
+
+    async def _check_task(self, task_id: str) -> None:
+        """
+        Fetch status of the task which is not running anymore.
+        """
+        es_slice, _ = self._waiters[task_id]
+        try:
+            with (
+                self.metrics.time_poll(),
+                self.tracer.span(name="check_task", category="poll", task=task_id),
+            ):
+                completed, info = await self.dest_breaker.call_async(
+                    func=partial(self._check_task_completed_async, task_id=task_id),
+                    retryable=self.retryable_errors,
+                )
+        except self.retryable_errors as exc:
+            self._on_check_error(task_ids=[task_id], exc=exc)
+            return
+        except Exception as exc:
+            self._resolve(task_id=task_id, exc=exc)
+            return
+
+        self._check_errors.pop(task_id, None)
+        self._report_progress(task_id=task_id, es_slice=es_slice, info=info)
+        if completed:
+            logger.info(f"Task finished: {task_id}")
+            self._resolve(task_id=task_id)
+
+    def _report_progress(
+        self, task_id: str, es_slice: IndexSlice, info: dict[str, int]
+    ) -> None:
+        """
+        Report progress of the task, logging errors of the callback.
+        """
+        try:
+            self._on_task_progress(task_id=task_id, es_slice=es_slice, info=info)
+        except Exception as exc:
+            logger.error(f"Can not report progress of task {task_id}: {exc}")
+
+    def _on_check_error(self, task_ids: list[str], exc: BaseException) -> None:
+        """
+        Keep waiting for tasks with unknown status, fail them if it lasts too long.
+        """
+        logger.warning(f"Can not check status of {len(task_ids)} reindex tasks: {exc}")
+        for task_id in task_ids:
+            self._check_errors[task_id] = self._check_errors.get(task_id, 0) + 1
+            if self._check_errors[task_id] >= self.max_check_errors:
+                self._resolve(task_id=task_id, exc=exc)
+
+    def _resolve(self, task_id: str, exc: BaseException | None = None) -> None:
+        """
+        Stop waiting for the task and resolve its future, unless already done.
+        """
+        waiter = self._waiters.get(task_id)
+        self._untrack(task_id=task_id)
+        if waiter is None or waiter[1].done():
+            return
+        if exc is not None:
+            waiter[1].set_exception(exc)
+        else:
+            waiter[1].set_result(task_id)
+
+    def _untrack(self, task_id: str) -> None:
+        self._waiters.pop(task_id, None)
+        self._check_errors.pop(task_id, None)
+        self._update_task_ids()
+
+    def _update_task_ids(self) -> None:
+        with self._task_ids_lock:
+            self._task_ids = list(self._waiters)
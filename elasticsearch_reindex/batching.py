@@ -0,0 +1,101 @@
+"""
+Module with adaptive sizing of reindex batches by destination latency.
+"""
+
+from threading import Lock
+
+from elasticsearch_reindex.const import (
+    DEFAULT_BATCH_INITIAL_SIZE,
+    DEFAULT_BATCH_MAX_SIZE,
+    DEFAULT_BATCH_MIN_SIZE,
+    DEFAULT_BATCH_TARGET_BYTES,
+)
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.schema import IndexSlice
+
+logger = create_logger()
+
+
+def get_avg_doc_size(es_slice: IndexSlice) -> float:
+    """
+    Return average document size of the slice in bytes, 0 if unknown.
+    """
+    if not es_slice.docs_count or not es_slice.store_size:
+        return 0.0
+    return es_slice.store_size / es_slice.docs_count
+
+
+class BatchSizeController:
+    """
+    AIMD controller of bytes per batch, turned into documents per index.
+
+    Batch grows by a fixed step while latency per document stays flat around
+    the best seen one and is halved when destination rejects writes or latency
+    rises. Documents per batch of an index are bytes per batch divided by its
+    average document size. Without the size, the initial documents per batch
+    are scaled by the same factor the bytes per batch have changed.
+    """
+
+    backoff_factor = 0.5
+    # Latency within this part above the best one is considered flat.
+    latency_tolerance = 0.2
+    # Best latency slowly ages, so a single lucky sample does not stop growth.
+    best_latency_decay = 1.02
+
+    def __init__(
+        self,
+        target_bytes: int = DEFAULT_BATCH_TARGET_BYTES,
+        min_size: int = DEFAULT_BATCH_MIN_SIZE,
+        max_size: int = DEFAULT_BATCH_MAX_SIZE,
+        initial_size: int = DEFAULT_BATCH_INITIAL_SIZE,
+    ) -> None:
+        self.min_size = min_size
+        self.max_size = max_size
+        self.initial_size = initial_size
+        self.target_bytes = target_bytes
+        self.min_bytes = target_bytes / 8
+        self.max_bytes = target_bytes * 4
+        self.step = target_bytes / 4
+        self.batch_bytes = float(target_bytes)
+        self._best_latency: float | None = None
+        self._lock = Lock()
+
+    def get_size(self, es_slice: IndexSlice) -> int:
+        """
+        Return documents per batch for the slice.
+        """
+        avg_doc_size = get_avg_doc_size(es_slice=es_slice)
+        with self._lock:
+            if avg_doc_size:
+                size = int(self.batch_bytes / avg_doc_size)
+            else:
+                size = int(self.initial_size * self.batch_bytes / self.target_bytes)
+        return min(max(size, self.min_size), self.max_size)
+
+    def update(self, latency: float, rejected: bool) -> None:
+        """
+        Resize batch by latency per document and rejections since last update.
+        """
+        with self._lock:
+            previous = self.batch_bytes
+            if rejected:
+                self._backoff()
+            elif latency > 0:
+                if self._best_latency is None or latency < self._best_latency:
+                    self._best_latency = latency
+                else:
+                    self._best_latency *= self.best_latency_decay
+                if latency <= self._best_latency * (1 + self.latency_tolerance):
+                    self.batch_bytes = min(self.batch_bytes + self.step, self.max_bytes)
+                elif latency > self._best_latency * (1 + 2 * self.latency_tolerance):
+                    self._backoff()
+
+            if self.batch_bytes != previous:
+                logger.info(
+                    f"Batch size: {previous / 1024:.0f}kb -> "
+                    f"{self.batch_bytes / 1024:.0f}kb "
+                    f"(latency {latency:.2f}ms per document, rejected: {rejected})"
+                )
+
+    def _backoff(self) -> None:
+        self.batch_bytes = max(self.batch_bytes * self.backoff_factor, self.min_bytes)
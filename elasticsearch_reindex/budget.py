@@ -0,0 +1,160 @@
+"""
+Module with concurrency budget of reindex tasks shared by several runs.
+"""
+
+from collections import Counter
+from threading import BoundedSemaphore, Condition
+
+
+class ConcurrencyBudget:
+    """
+    Global and per-cluster limits of running tasks, shared by runs of a topology.
+
+    Every task holds a slot of the budget and of both its source and
+    destination clusters. When a slot is freed, the waiting task with the
+    least loaded destination starts first, which balances destinations fed
+    by several sources.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        cluster_tasks: int | None = None,
+        cluster_limits: dict[str, int] | None = None,
+    ) -> None:
+        self.total = max(total, 1)
+        self.cluster_tasks = cluster_tasks
+        self.cluster_limits = cluster_limits or {}
+        self._running = 0
+        self._cluster_running: Counter[str] = Counter()
+        self._waiting: Counter[tuple[str, str]] = Counter()
+        self._condition = Condition()
+
+    def acquire(self, source: str, dest: str) -> None:
+        """
+        Wait for a slot of the budget and of both clusters.
+        """
+        clusters = (source, dest)
+        with self._condition:
+            self._waiting[clusters] += 1
+            self._condition.notify_all()
+            try:
+                self._condition.wait_for(lambda: self._can_start(clusters=clusters))
+            finally:
+                self._waiting[clusters] -= 1
+                if not self._waiting[clusters]:
+                    del self._waiting[clusters]
+            self._running += 1
+            self._cluster_running.update(set(clusters))
+
+    def release(self, source: str, dest: str) -> None:
+        with self._condition:
+            self._running -= 1
+            self._cluster_running.subtract(set((source, dest)))
+            self._condition.notify_all()
+
+    def get_running(self, cluster: str) -> int:
+        with self._condition:
+            return self._cluster_running[cluster]
+
+    def _get_limit(self, cluster: str) -> int | None:
+        return self.cluster_limits.get(cluster, self.cluster_tasks)
+
+    def _fits(self, clusters: tuple[str, str]) -> bool:
+        if self._running >= self.total:
+            return False
+        for cluster in clusters:
+            limit = self._get_limit(cluster=cluster)
+            if limit is not None and self._cluster_running[cluster] >= limit:
+                return False
+        return True
+
+    def _can_start(self, clusters: tuple[str, str]) -> bool:
+        """
+        Check if the task fits and no fitting waiter has a less loaded destination.
+        """
+        if not self._fits(clusters=clusters):
+            return False
+        dest_running = self._cluster_running[clusters[1]]
+        return all(
+            dest_running <= self._cluster_running[other[1]]
+            for other in self._waiting
+            if self._fits(clusters=other)
+        )
+
+
+class TaskLimit:
+    """
+    Limit of running tasks of a run, changed while tasks are running.
+
+    Lowered limit lets running tasks finish, new ones wait until they fit,
+    zero limit pauses submission.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._running = 0
+        self._condition = Condition()
+
+    @property
+    def running(self) -> int:
+        with self._condition:
+            return self._running
+
+    def set_limit(self, limit: int) -> None:
+        with self._condition:
+            self.limit = limit
+            self._condition.notify_all()
+
+    def acquire(self) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._running < self.limit)
+            self._running += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self._running -= 1
+            self._condition.notify_all()
+
+
+class TaskSlots:
+    """
+    Worker slots of a single run, also bounded by the shared budget and the
+    changing task limit if set.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        budget: ConcurrencyBudget | None = None,
+        source: str = "",
+        dest: str = "",
+        limit: TaskLimit | None = None,
+    ) -> None:
+        self.workers = workers
+        self.budget = budget
+        self.source = source
+        self.dest = dest
+        self.limit = limit
+        self._slots = BoundedSemaphore(value=workers)
+
+    def acquire(self) -> None:
+        self._slots.acquire()
+        if self.limit:
+            self.limit.acquire()
+        if self.budget:
+            self.budget.acquire(source=self.source, dest=self.dest)
+
+    def release(self) -> None:
+        if self.budget:
+            self.budget.release(source=self.source, dest=self.dest)
+        if self.limit:
+            self.limit.release()
+        self._slots.release()
+
+    def join(self) -> None:
+        """
+        Wait until all slots are released, i.e. every task is processed.
+        """
+        for _ in range(self.workers):
+            self._slots.acquire()
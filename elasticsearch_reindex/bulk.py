@@ -0,0 +1,198 @@
+"""
+Module with raw bytes handling of documents streamed through the client.
+
+Search hits are kept as raw `_source` bytes and appended to a reusable NDJSON
+buffer, so documents are never turned into Python dicts on the way from
+source to destination when `pysimdjson` is installed. Without it, `orjson`
+or standard `json` round trip is used.
+"""
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import local
+from typing import Any
+
+try:
+    import simdjson
+except ImportError:  # pragma: no cover
+    HAS_SIMDJSON = False
+else:
+    HAS_SIMDJSON = True
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
+# Parser of JSON bytes into lazy documents of `pysimdjson`.
+LazyParser = Callable[[bytes], Any]
+
+# Response fields needed by the stream, the rest of the hit is not sent at all.
+SEARCH_FILTER_PATH = (
+    "pit_id,hits.hits._id,hits.hits._routing,hits.hits._source,hits.hits.sort"
+)
+BULK_FILTER_PATH = "items.*.status,items.*.result,items.*.error"
+
+
+@dataclass
+class SearchPage:
+    """
+    Dataclass for storing single page of point in time search.
+
+    Every hit is a tuple of document ID, routing and raw `_source` bytes.
+    """
+
+    pit_id: str | None
+    hits: list[tuple[str, str | None, bytes]]
+    search_after: list | None
+
+
+def loads(data: bytes | str) -> dict:
+    """
+    Deserialize JSON with the fastest available library.
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(data: object) -> bytes:
+    """
+    Serialize compact JSON with the fastest available library.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+class SearchPageDecoder:
+    """
+    Decode search response into raw hits.
+
+    Parser of `pysimdjson` is not thread safe and its documents are valid only
+    until the next parse, so every thread has its own one and hits are copied
+    out before returning.
+    """
+
+    def __init__(self) -> None:
+        self._local = local()
+
+    @property
+    def backend(self) -> str:
+        """
+        Return name of the used JSON library.
+        """
+        if HAS_SIMDJSON:
+            return "simdjson"
+        return "orjson" if HAS_ORJSON else "json"
+
+    def decode(self, body: bytes) -> SearchPage:
+        """
+        Return search page with raw `_source` bytes of every hit.
+        """
+        if HAS_SIMDJSON:
+            return self._decode_lazy(body=body)
+        return self._decode_full(body=body)
+
+    def _get_lazy_parser(self) -> LazyParser:
+        """
+        Return parser of the current thread.
+        """
+        if (parser := getattr(self._local, "parser", None)) is None:
+            parser = self._local.parser = simdjson.Parser()
+        return parser.parse
+
+    def _decode_lazy(self, body: bytes) -> SearchPage:
+        """
+        Minify `_source` straight from parsed tape, without Python objects.
+        """
+        document = self._get_lazy_parser()(body)
+        pit_id = document.get("pit_id")
+        raw_hits = document.get("hits", {}).get("hits", [])
+        # Key lookup of lazy object is slow, skip it when no hit is routed.
+        routed = b'"_routing"' in body
+        hits = [
+            (
+                hit["_id"],
+                hit["_routing"] if routed and "_routing" in hit else None,
+                hit["_source"].mini,
+            )
+            for hit in raw_hits
+        ]
+        search_after = raw_hits[-1]["sort"].as_list() if hits else None
+        return SearchPage(pit_id=pit_id, hits=hits, search_after=search_after)
+
+    @staticmethod
+    def _decode_full(body: bytes) -> SearchPage:
+        """
+        Decode whole response and serialize `_source` of every hit back.
+        """
+        response = loads(body)
+        raw_hits = response.get("hits", {}).get("hits", [])
+        hits = [
+            (hit["_id"], hit.get("_routing"), dumps(hit["_source"])) for hit in raw_hits
+        ]
+        search_after = raw_hits[-1]["sort"] if hits else None
+        return SearchPage(
+            pit_id=response.get("pit_id"), hits=hits, search_after=search_after
+        )
+
+
+class BulkBuffer:
+    """
+    Reusable NDJSON body of bulk requests.
+
+    Action line prefix is encoded once per index, raw sources are appended
+    as is. The buffer is cleared, not reallocated, between requests.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._prefixes: dict[tuple[str, str], bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def clear(self) -> None:
+        """
+        Remove buffered documents, keeping allocated memory.
+        """
+        del self._buffer[:]
+
+    def add(
+        self,
+        action: str,
+        es_index: str,
+        doc_id: str,
+        routing: str | None,
+        source: bytes,
+    ) -> None:
+        """
+        Append action line and raw source of single document.
+        """
+        buffer = self._buffer
+        buffer += self._get_prefix(action=action, es_index=es_index)
+        buffer += dumps(doc_id)
+        if routing is not None:
+            buffer += b',"routing":'
+            buffer += dumps(routing)
+        buffer += b"}}\n"
+        buffer += source
+        buffer += b"\n"
+
+    def getbuffer(self) -> memoryview:
+        """
+        Return view of the body, it must be released before the next change.
+        """
+        return memoryview(self._buffer)
+
+    def _get_prefix(self, action: str, es_index: str) -> bytes:
+        key = (action, es_index)
+        if (prefix := self._prefixes.get(key)) is None:
+            prefix = self._prefixes[key] = (
+                b'{"' + action.encode() + b'":{"_index":' + dumps(es_index) + b',"_id":'
+            )
+        return prefix
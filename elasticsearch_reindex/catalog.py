@@ -0,0 +1,89 @@
+"""
+Module with catalog of source and destination indexes cached for the run.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from elasticsearch_reindex.client import ElasticsearchClient
+from elasticsearch_reindex.const import DEFAULT_CATALOG_TTL
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.schema import Index
+
+logger = create_logger()
+
+
+class IndexCatalog:
+    """
+    Indexes of both clusters matching the user expressions.
+
+    Both clusters are listed concurrently and kept for `ttl` seconds, so
+    planning, migration and verification share one listing. Expressions are
+    resolved on source only and the whole destination listing is narrowed to
+    the resolved names, as aliases, data streams and wildcards may exist on
+    source only.
+    """
+
+    def __init__(
+        self,
+        source_client: ElasticsearchClient,
+        dest_client: ElasticsearchClient,
+        expressions: list[str] | None,
+        ttl: float = DEFAULT_CATALOG_TTL,
+    ) -> None:
+        self.source_client = source_client
+        self.dest_client = dest_client
+        self.expressions = expressions
+        self.ttl = ttl
+        self._indexes: tuple[list[Index], list[Index]] | None = None
+        self._fetched_at = 0.0
+        self._lock = Lock()
+
+    def get_indexes(self) -> tuple[list[Index], list[Index]]:
+        """
+        Return source and destination indexes, fetched again once expired.
+        """
+        with self._lock:
+            if self._indexes is None or self._is_expired():
+                self._indexes = self._fetch()
+                self._fetched_at = time.monotonic()
+            return self._indexes
+
+    def get_source_indexes(self) -> list[Index]:
+        return self.get_indexes()[0]
+
+    def get_dest_indexes(self) -> list[Index]:
+        return self.get_indexes()[1]
+
+    def invalidate(self) -> None:
+        """
+        Drop cached indexes, e.g. after destination has changed.
+        """
+        with self._lock:
+            self._indexes = None
+
+    def _is_expired(self) -> bool:
+        return time.monotonic() - self._fetched_at >= self.ttl
+
+    def _fetch(self) -> tuple[list[Index], list[Index]]:
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            source_future = executor.submit(
+                self.source_client.get_indexes, expressions=self.expressions
+            )
+            # Explicit expressions may name hidden indexes, so all are listed.
+            dest_future = executor.submit(
+                self.dest_client.get_indexes, include_hidden=bool(self.expressions)
+            )
+            source_indexes = source_future.result()
+            dest_indexes = dest_future.result()
+        if self.expressions:
+            # Missing names are skipped, so not migrated indexes are absent.
+            names = {index.name for index in source_indexes}
+            dest_indexes = [index for index in dest_indexes if index.name in names]
+        logger.info(
+            f"Index catalog: {len(source_indexes)} source and {len(dest_indexes)} "
+            f"destination indexes in {time.monotonic() - started:.2f}s"
+        )
+        return source_indexes, dest_indexes
@@ -1,12 +1,32 @@
 import click
 
+from elasticsearch_reindex.const import (
+    DEFAULT_BATCH_TARGET_BYTES,
+    DEFAULT_CATALOG_TTL,
+    DEFAULT_ENGINE,
+    DEFAULT_REQUEST_RETRIES,
+    DEFAULT_SCHEDULING,
+    DEFAULT_SLICE_MIN_DOCS,
+    DEFAULT_SLICES,
+    DEFAULT_STREAM_BATCH_SIZE,
+    DEFAULT_STREAM_WRITERS,
+    DEFAULT_TASK_RETRIES,
+    DEFAULT_THROTTLE_MAX_RPS,
+    DEFAULT_THROTTLE_MIN_RPS,
+    DEFAULT_TUNING_JOURNAL,
+    DEFAULT_VERIFY_BUCKETS,
+    DEFAULT_VERIFY_SAMPLE,
+    ENGINES,
+    SCHEDULING_STRATEGIES,
+)
 from elasticsearch_reindex.manager import ReindexManager
+from elasticsearch_reindex.topology import TopologyRunner
 
 
 @click.group(invoke_without_command=True)
 @click.option(
     "--source_host",
-    required=True,
+    required=False,
     type=str,
     help="Source server: Elasticsearch host where data will be transferred from",
 )
@@ -18,7 +38,7 @@ from elasticsearch_reindex.manager import ReindexManager
 )
 @click.option(
     "--dest_host",
-    required=True,
+    required=False,
     type=str,
     help="Destination server: Elasticsearch host where data will be transferred",
 )
@@ -45,16 +65,334 @@ from elasticsearch_reindex.manager import ReindexManager
     "-i",
     required=False,
     multiple=True,
-    help="List of specific Elasticsearch indexes to migrate",
+    help="Indexes to migrate: names, wildcards, aliases, data streams or /regex/",
+)
+@click.option(
+    "--catalog_ttl",
+    required=False,
+    type=float,
+    default=DEFAULT_CATALOG_TTL,
+    help="Seconds the listing of source and destination indexes is reused for",
+)
+@click.option(
+    "--slices",
+    required=False,
+    type=int,
+    default=DEFAULT_SLICES,
+    help="Number of parallel reindex tasks (slices) for single large index",
+)
+@click.option(
+    "--slice_field",
+    required=False,
+    type=str,
+    help="Numeric or date field used for splitting index into slices by range",
+)
+@click.option(
+    "--slice_min_docs",
+    required=False,
+    type=int,
+    default=DEFAULT_SLICE_MIN_DOCS,
+    help="Minimal amount of documents in index for splitting it into slices",
+)
+@click.option(
+    "--scheduling",
+    required=False,
+    type=click.Choice(SCHEDULING_STRATEGIES),
+    default=DEFAULT_SCHEDULING,
+    help="Order of reindex tasks: largest indexes first or source order",
+)
+@click.option(
+    "--engine",
+    required=False,
+    type=click.Choice(ENGINES),
+    default=DEFAULT_ENGINE,
+    help="Execution engine: threads, asyncio event loop (requires aiohttp) or client-side stream",
+)
+@click.option(
+    "--http_compress/--no_http_compress",
+    default=True,
+    help="Gzip compress request bodies sent to destination Elasticsearch",
+)
+@click.option(
+    "--requests_per_second",
+    required=False,
+    type=float,
+    help="Initial throttle of every reindex task (documents per second)",
+)
+@click.option(
+    "--throttle_target_latency",
+    required=False,
+    type=float,
+    help="Enable adaptive throttling: target destination indexing latency (ms per document)",
+)
+@click.option(
+    "--throttle_min_rps",
+    required=False,
+    type=float,
+    default=DEFAULT_THROTTLE_MIN_RPS,
+    help="Minimal throttle of adaptive throttling (documents per second)",
+)
+@click.option(
+    "--throttle_max_rps",
+    required=False,
+    type=float,
+    default=DEFAULT_THROTTLE_MAX_RPS,
+    help="Maximal throttle of adaptive throttling (documents per second)",
+)
+@click.option(
+    "--guard_search_queue",
+    required=False,
+    type=int,
+    help="Enable source guard: source search thread pool queue considered as stress",
+)
+@click.option(
+    "--guard_search_latency",
+    required=False,
+    type=float,
+    help="Enable source guard: source query latency considered as stress (ms per query)",
+)
+@click.option(
+    "--guard_cpu",
+    required=False,
+    type=float,
+    help="Enable source guard: CPU of the busiest source node considered as stress (percent)",
+)
+@click.option(
+    "--tune_dest",
+    is_flag=True,
+    default=False,
+    help="Copy source mappings/settings, disable refresh and replicas for the time of reindex",
+)
+@click.option(
+    "--force_merge",
+    is_flag=True,
+    default=False,
+    help="Force merge destination index after reindex (with --tune_dest)",
+)
+@click.option(
+    "--tuning_journal",
+    required=False,
+    type=str,
+    default=DEFAULT_TUNING_JOURNAL,
+    help="File with original destination settings, used to restore them after crash",
+)
+@click.option(
+    "--state_file",
+    required=False,
+    type=str,
+    help="SQLite file with tasks state: a restarted run reattaches to running tasks and skips finished ones",
+)
+@click.option(
+    "--delta_field",
+    required=False,
+    type=str,
+    help="Date or numeric field, e.g. updated_at: migrated indexes get only documents newer than its watermark",
+)
+@click.option(
+    "--reconcile",
+    is_flag=True,
+    default=False,
+    help="Re-run partially migrated indexes with op_type create, so only missing documents are written",
+)
+@click.option(
+    "--stream_batch_size",
+    required=False,
+    type=int,
+    default=DEFAULT_STREAM_BATCH_SIZE,
+    help="Stream engine: documents per search page and bulk request",
+)
+@click.option(
+    "--stream_writers",
+    required=False,
+    type=int,
+    default=DEFAULT_STREAM_WRITERS,
+    help="Stream engine: amount of concurrent bulk writers",
+)
+@click.option(
+    "--adaptive_batch",
+    is_flag=True,
+    default=False,
+    help="Grow batch size while destination latency is flat, back off on rejections",
+)
+@click.option(
+    "--batch_target_bytes",
+    required=False,
+    type=int,
+    default=DEFAULT_BATCH_TARGET_BYTES,
+    help="Initial bytes per batch of adaptive batch size, split by average document size of index",
+)
+@click.option(
+    "--request_retries",
+    required=False,
+    type=int,
+    default=DEFAULT_REQUEST_RETRIES,
+    help="Retries of requests failed by connection errors, 429 or 5xx, with jittered backoff",
+)
+@click.option(
+    "--task_retries",
+    required=False,
+    type=int,
+    default=DEFAULT_TASK_RETRIES,
+    help="Resubmissions of a failed reindex task with op_type create, copying only missing documents",
+)
+@click.option(
+    "--metrics_port",
+    required=False,
+    type=int,
+    default=None,
+    help="Serve Prometheus metrics on http://0.0.0.0:<port>/metrics during the run",
+)
+@click.option(
+    "--metrics_textfile",
+    required=False,
+    type=str,
+    default=None,
+    help="Write Prometheus metrics to file for node exporter textfile collector",
+)
+@click.option(
+    "--dry_run",
+    is_flag=True,
+    default=False,
+    help="Print plan of the run as JSON without submitting tasks",
+)
+@click.option(
+    "--plan_file",
+    required=False,
+    type=str,
+    default=None,
+    help="Dry run: write plan to the file instead of stdout",
+)
+@click.option(
+    "--benchmark_docs",
+    required=False,
+    type=int,
+    default=0,
+    help="Dry run: estimate duration by transferring sample of documents into a scratch index",
+)
+@click.option(
+    "--data_streams",
+    is_flag=True,
+    default=False,
+    help="Migrate backing indices of data streams oldest first, leaving write and ILM hot indices until cutover",
+)
+@click.option(
+    "--cutover",
+    is_flag=True,
+    default=False,
+    help="Data streams: also migrate write and ILM hot backing indices, once writes to source are stopped",
+)
+@click.option(
+    "--spread_dest_nodes",
+    is_flag=True,
+    default=False,
+    help="Spread reindex tasks and polls across destination data nodes discovered by their HTTP addresses",
+)
+@click.option(
+    "--trace_file",
+    required=False,
+    type=str,
+    default=None,
+    help="Write durations and counts of reindex phases to JSON file in Chrome trace format",
+)
+@click.option(
+    "--profile_file",
+    required=False,
+    type=str,
+    default=None,
+    help="Profile the thread running reindex with cProfile and write stats to the file, "
+    "worker threads of polls and the stream engine are not profiled",
+)
+@click.option(
+    "--topology",
+    required=False,
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="JSON file with source to destination routes migrated under a shared concurrency budget",
+)
+@click.option(
+    "--verify",
+    is_flag=True,
+    default=False,
+    help="Verify migrated indexes by bucket counts and sampled document hashes instead of migration",
+)
+@click.option(
+    "--verify_field",
+    required=False,
+    type=str,
+    default=None,
+    help="Verify: numeric or date field of range buckets, slice_field or delta_field by default",
+)
+@click.option(
+    "--verify_buckets",
+    required=False,
+    type=int,
+    default=DEFAULT_VERIFY_BUCKETS,
+    help="Verify: range buckets per index, differing ones are bisected",
+)
+@click.option(
+    "--verify_sample",
+    required=False,
+    type=int,
+    default=DEFAULT_VERIFY_SAMPLE,
+    help="Verify: random documents per bucket compared by source hash",
+)
+@click.option(
+    "--verify_file",
+    required=False,
+    type=str,
+    default=None,
+    help="Verify: write report to the file instead of stdout",
 )
 def reindex(
-    source_host: str,
-    dest_host: str,
+    source_host: str | None,
+    dest_host: str | None,
     source_http_auth: str,
     dest_http_auth: str,
     check_interval: int,
     concurrent_tasks: int,
     indexes: list[str],
+    catalog_ttl: float,
+    slices: int,
+    slice_field: str | None,
+    slice_min_docs: int,
+    scheduling: str,
+    engine: str,
+    http_compress: bool,
+    requests_per_second: float | None,
+    throttle_target_latency: float | None,
+    throttle_min_rps: float,
+    throttle_max_rps: float,
+    guard_search_queue: int | None,
+    guard_search_latency: float | None,
+    guard_cpu: float | None,
+    tune_dest: bool,
+    force_merge: bool,
+    tuning_journal: str,
+    state_file: str | None,
+    delta_field: str | None,
+    reconcile: bool,
+    stream_batch_size: int,
+    stream_writers: int,
+    adaptive_batch: bool,
+    batch_target_bytes: int,
+    request_retries: int,
+    task_retries: int,
+    metrics_port: int | None,
+    metrics_textfile: str | None,
+    dry_run: bool,
+    plan_file: str | None,
+    benchmark_docs: int,
+    data_streams: bool,
+    cutover: bool,
+    spread_dest_nodes: bool,
+    trace_file: str | None,
+    profile_file: str | None,
+    topology: str | None,
+    verify: bool,
+    verify_field: str | None,
+    verify_buckets: int,
+    verify_sample: int,
+    verify_file: str | None,
 ) -> None:
     config = {
         "source_host": source_host,
@@ -64,6 +402,57 @@ def reindex(
         "check_interval": check_interval,
         "concurrent_tasks": concurrent_tasks,
         "indexes": list(indexes),
+        "catalog_ttl": catalog_ttl,
+        "slices": slices,
+        "slice_field": slice_field,
+        "slice_min_docs": slice_min_docs,
+        "scheduling": scheduling,
+        "engine": engine,
+        "http_compress": http_compress,
+        "requests_per_second": requests_per_second,
+        "throttle_target_latency": throttle_target_latency,
+        "throttle_min_rps": throttle_min_rps,
+        "throttle_max_rps": throttle_max_rps,
+        "guard_search_queue": guard_search_queue,
+        "guard_search_latency": guard_search_latency,
+        "guard_cpu": guard_cpu,
+        "tune_dest": tune_dest,
+        "force_merge": force_merge,
+        "tuning_journal": tuning_journal,
+        "state_file": state_file,
+        "delta_field": delta_field,
+        "reconcile": reconcile,
+        "stream_batch_size": stream_batch_size,
+        "stream_writers": stream_writers,
+        "adaptive_batch": adaptive_batch,
+        "batch_target_bytes": batch_target_bytes,
+        "request_retries": request_retries,
+        "task_retries": task_retries,
+        "metrics_port": metrics_port,
+        "metrics_textfile": metrics_textfile,
+        "dry_run": dry_run,
+        "plan_file": plan_file,
+        "benchmark_docs": benchmark_docs,
+        "data_streams": data_streams,
+        "cutover": cutover,
+        "spread_dest_nodes": spread_dest_nodes,
+        "trace_file": trace_file,
+        "profile_file": profile_file,
+        "verify_field": verify_field,
+        "verify_buckets": verify_buckets,
+        "verify_sample": verify_sample,
+        "verify_file": verify_file,
     }
-    reindex_manager = ReindexManager.from_dict(data=config)
-    reindex_manager.start_reindex()
+    reindex_manager: ReindexManager | TopologyRunner
+    if topology:
+        reindex_manager = TopologyRunner.from_file(base=config, path=topology)
+    elif source_host and dest_host:
+        reindex_manager = ReindexManager.from_dict(data=config)
+    else:
+        raise click.UsageError("--source_host and --dest_host are required")
+    if not verify:
+        reindex_manager.start_reindex()
+        return
+    results = reindex_manager.start_verify()
+    if not all(result.ok for result in results):
+        raise SystemExit(1)
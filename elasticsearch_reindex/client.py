@@ -1,12 +1,35 @@
+import re
+
 from elasticsearch import Elasticsearch, exceptions
 
+from elasticsearch_reindex.const import (
+    DEFAULT_CATALOG_CHUNK,
+    DEFAULT_LONG_REQUEST_TIMEOUT,
+)
 from elasticsearch_reindex.errors import (
     ES_NODE_NOT_FOUND_ERROR,
     ElasticSearchNodeNotFoundException,
 )
-from elasticsearch_reindex.schema import ElasticsearchConfig, HttpAuth, Index
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.schema import (
+    DataStream,
+    ElasticsearchConfig,
+    HttpAuth,
+    Index,
+)
 from elasticsearch_reindex.utils import chunkify
 
+logger = create_logger()
+
+
+def is_regex_expression(expression: str) -> bool:
+    """
+    Check if index expression is a `/regex/`, matched by the client.
+    """
+    return (
+        len(expression) > 2 and expression.startswith("/") and expression.endswith("/")
+    )
+
 
 class ElasticsearchClient:
     """
@@ -42,12 +65,233 @@ class ElasticsearchClient:
         """
         return self._http_auth.as_tuple() if self._http_auth else None
 
-    def get_indexes(self) -> list[Index]:
+    def get_indexes(
+        self, expressions: list[str] | None = None, include_hidden: bool = False
+    ) -> list[Index]:
         """
-        Return all Elasticsearch indexes and amount of documents.
+        Return Elasticsearch indexes, amount of documents and store size.
+
+        Names, wildcards, aliases and data streams are resolved by the cluster,
+        `/regex/` expressions are matched against all indexes. Without
+        expressions all indexes except hidden ones are returned, unless
+        `include_hidden` is set.
         """
-        indexes = self.client.cat.indices(h="index,docs.count", s="index")
-        return self._parse_indexes(indexes=indexes.split())
+        if not expressions:
+            return [
+                index
+                for index in self._cat_indexes(expression=None)
+                if include_hidden or not index.name.startswith(".")
+            ]
+
+        names = [expr for expr in expressions if not is_regex_expression(expr)]
+        patterns = [
+            re.compile(expr[1:-1]) for expr in expressions if is_regex_expression(expr)
+        ]
+        indexes = {}
+        # Long lists of names are split to keep request line short.
+        for chunk in chunkify(lst=names, n=DEFAULT_CATALOG_CHUNK):
+            for index in self._cat_indexes_by_names(names=chunk):
+                indexes[index.name] = index
+        if patterns:
+            for index in self.get_indexes():
+                if any(pattern.fullmatch(index.name) for pattern in patterns):
+                    indexes[index.name] = index
+        return sorted(indexes.values(), key=lambda index: index.name)
+
+    def get_data_streams(self) -> list[DataStream]:
+        """
+        Return all data streams with backing indices, the oldest one first.
+        """
+        response = self.client.indices.get_data_stream(name="*")
+        return [
+            DataStream(
+                name=data_stream["name"],
+                indices=[index["index_name"] for index in data_stream["indices"]],
+                template=data_stream.get("template"),
+                ilm_policy=data_stream.get("ilm_policy"),
+            )
+            for data_stream in response["data_streams"]
+        ]
+
+    def get_ilm_phases(self, es_index: str) -> dict[str, str | None]:
+        """
+        Return current ILM phase of indexes, None for not managed ones.
+        """
+        response = self.client.ilm.explain_lifecycle(index=es_index)
+        return {
+            name: info.get("phase") if info.get("managed") else None
+            for name, info in response["indices"].items()
+        }
+
+    def get_field_range(self, es_index: str, field: str) -> tuple[float, float] | None:
+        """
+        Return min and max values of numeric or date field in index.
+        """
+        response = self.client.search(
+            index=es_index,
+            size=0,
+            aggs={
+                "min_value": {"min": {"field": field}},
+                "max_value": {"max": {"field": field}},
+            },
+        )
+        aggs = response["aggregations"]
+        min_value, max_value = aggs["min_value"]["value"], aggs["max_value"]["value"]
+        if min_value is None or max_value is None:
+            return None
+        return min_value, max_value
+
+    def count_documents(self, es_index: str, query: dict | None = None) -> int:
+        """
+        Return amount of index documents matching the query.
+        """
+        response = self.client.count(index=es_index, query=query)
+        return response["count"]
+
+    def count_buckets(self, es_index: str, queries: list[dict]) -> list[int]:
+        """
+        Return amount of index documents matching every query by one request.
+        """
+        response = self.client.search(
+            index=es_index,
+            size=0,
+            aggs={
+                "buckets": {
+                    "filters": {
+                        "filters": {str(i): query for i, query in enumerate(queries)}
+                    }
+                }
+            },
+        )
+        buckets = response["aggregations"]["buckets"]["buckets"]
+        return [buckets[str(i)]["doc_count"] for i in range(len(queries))]
+
+    def get_random_documents(
+        self, es_index: str, query: dict | None, size: int, seed: int
+    ) -> dict[str, dict]:
+        """
+        Return sources of random documents matching the query by their IDs.
+        """
+        response = self.client.search(
+            index=es_index,
+            size=size,
+            track_total_hits=False,
+            query={
+                "function_score": {
+                    "query": query or {"match_all": {}},
+                    "random_score": {"seed": seed, "field": "_seq_no"},
+                    "boost_mode": "replace",
+                }
+            },
+        )
+        return {hit["_id"]: hit["_source"] for hit in response["hits"]["hits"]}
+
+    def get_documents(self, es_index: str, ids: list[str]) -> dict[str, dict]:
+        """
+        Return sources of index documents by their IDs, whatever their routing.
+        """
+        response = self.client.search(
+            index=es_index,
+            size=len(ids),
+            track_total_hits=False,
+            query={"ids": {"values": ids}},
+        )
+        return {hit["_id"]: hit["_source"] for hit in response["hits"]["hits"]}
+
+    def get_nodes_stats(self) -> dict:
+        """
+        Return write thread pool and indexing stats of all nodes.
+        """
+        response = self.client.nodes.stats(
+            metric="thread_pool,indices", index_metric="indexing"
+        )
+        return dict(response)
+
+    def get_search_stats(self) -> dict:
+        """
+        Return search thread pool, search and OS stats of all nodes.
+        """
+        response = self.client.nodes.stats(
+            metric="thread_pool,indices,os", index_metric="search"
+        )
+        return dict(response)
+
+    def index_exists(self, es_index: str) -> bool:
+        """
+        Check if index exists.
+        """
+        return bool(self.client.indices.exists(index=es_index))
+
+    def get_index_definition(self, es_index: str) -> dict:
+        """
+        Return mappings and settings of the index.
+        """
+        response = self.client.indices.get(index=es_index)
+        return response[es_index]
+
+    def create_index(self, es_index: str, mappings: dict, settings: dict) -> None:
+        """
+        Create index with provided mappings and settings.
+        """
+        self.client.indices.create(index=es_index, mappings=mappings, settings=settings)
+
+    def delete_index(self, es_index: str) -> None:
+        """
+        Delete index if it exists.
+        """
+        self.client.options(ignore_status=404).indices.delete(index=es_index)
+
+    def get_index_settings(
+        self, es_index: str, names: tuple[str, ...]
+    ) -> dict[str, str | None]:
+        """
+        Return flat index settings, not set ones are returned as None.
+        """
+        response = self.client.indices.get_settings(
+            index=es_index, name=",".join(names), flat_settings=True
+        )
+        settings = response[es_index]["settings"]
+        return {name: settings.get(name) for name in names}
+
+    def put_index_settings(self, es_index: str, settings: dict) -> None:
+        """
+        Update dynamic index settings, None value resets setting to default.
+        """
+        self.client.indices.put_settings(index=es_index, settings=settings)
+
+    def force_merge(self, es_index: str, max_num_segments: int = 1) -> None:
+        """
+        Force merge index segments and wait for it.
+        """
+        self.client.options(
+            request_timeout=DEFAULT_LONG_REQUEST_TIMEOUT
+        ).indices.forcemerge(index=es_index, max_num_segments=max_num_segments)
+
+    def wait_for_green(self, es_index: str) -> bool:
+        """
+        Wait for green index health, return False on timeout.
+        """
+        response = self.client.options(
+            request_timeout=DEFAULT_LONG_REQUEST_TIMEOUT, ignore_status=408
+        ).cluster.health(
+            index=es_index,
+            wait_for_status="green",
+            timeout=f"{DEFAULT_LONG_REQUEST_TIMEOUT}s",
+        )
+        return not response["timed_out"]
+
+    def open_point_in_time(self, es_index: str, keep_alive: str) -> str:
+        """
+        Open point in time of the index and return its ID.
+        """
+        response = self.client.open_point_in_time(index=es_index, keep_alive=keep_alive)
+        return response["id"]
+
+    def close_point_in_time(self, pit_id: str) -> None:
+        """
+        Close point in time, releasing its search contexts.
+        """
+        self.client.close_point_in_time(id=pit_id)
 
     def _prepare_es_client(
         self, es_host: str, es_http_auth: tuple[str, str] | None = None
@@ -69,13 +313,48 @@ class ElasticsearchClient:
 
         return client
 
+    def _cat_indexes(self, expression: str | None) -> list[Index]:
+        """
+        Return open indexes matching the expression, all if not provided.
+        """
+        response = self.client.cat.indices(
+            index=expression,
+            format="json",
+            h="index,docs.count,store.size",
+            s="index",
+            bytes="b",
+            expand_wildcards="open",
+        )
+        return self._parse_indexes(indexes=response.body)
+
+    def _cat_indexes_by_names(self, names: list[str]) -> list[Index]:
+        """
+        Return indexes matching the names, skipping missing ones.
+        """
+        try:
+            return self._cat_indexes(expression=",".join(names))
+        except exceptions.NotFoundError:
+            if len(names) == 1:
+                logger.debug(f"Index not found: {names[0]}")
+                return []
+        # Some of the names are missing, so halves are resolved separately.
+        middle = len(names) // 2
+        return self._cat_indexes_by_names(
+            names=names[:middle]
+        ) + self._cat_indexes_by_names(names=names[middle:])
+
     @staticmethod
-    def _parse_indexes(indexes: list[str]) -> list[Index]:
+    def _parse_indexes(indexes: list[dict]) -> list[Index]:
         """
-        Return all indexes in Elasticsearch and amount of documents.
+        Return indexes with amount of documents and store size from JSON rows.
+
+        Counters of closed or recovering indexes are null.
         """
         return [
-            Index(name=name, docs_count=int(count))
-            for name, count in chunkify(lst=indexes, n=2)
-            if not name.startswith(".")
+            Index(
+                name=row["index"],
+                docs_count=int(row.get("docs.count") or 0),
+                store_size=int(row.get("store.size") or 0),
+            )
+            for row in indexes
         ]
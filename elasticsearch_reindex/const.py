@@ -5,7 +5,121 @@ Module with project constants.
 # Endpoint for create internal ElasticSearch reindex task.
 ES_CREATE_REINDEX_TASK_ENDPOINT = "{es_host}/_reindex?pretty&wait_for_completion=false"
 ES_CHECK_REINDEX_TASK_ENDPOINT = "{es_host}/_tasks/{task_id}"
+# Endpoint for list all running reindex tasks by single request.
+ES_LIST_REINDEX_TASKS_ENDPOINT = "{es_host}/_tasks?actions=*reindex&detailed=true"
+ES_RETHROTTLE_REINDEX_TASK_ENDPOINT = "{es_host}/_reindex/{task_id}/_rethrottle"
+# Header recorded with the created task, so a task of a lost response is found.
+ES_OPAQUE_ID_HEADER = "X-Opaque-Id"
+# Endpoints of destination nodes discovery: HTTP addresses and check of a node.
+ES_NODES_HTTP_ENDPOINT = "{es_host}/_nodes/http"
+ES_CHECK_NODE_ENDPOINT = "{es_host}/"
+# Endpoints of streaming engine: point in time search on source, bulk on destination.
+ES_SEARCH_ENDPOINT = "{es_host}/_search"
+ES_BULK_ENDPOINT = "{es_host}/_bulk"
 
 DEFAULT_CHECK_INTERVAL = 10
 DEFAULT_CONCURRENT_TASKS = 1
 DEFAULT_REQUEST_TIMEOUT = 60
+# Timeout for long blocking requests: force merge and waiting for green status.
+DEFAULT_LONG_REQUEST_TIMEOUT = 3600
+
+# Split index into manual slices only when it contains at least this documents.
+DEFAULT_SLICES = 1
+DEFAULT_SLICE_MIN_DOCS = 1_000_000
+
+# Order of reindex tasks submission.
+SCHEDULING_FIFO = "fifo"
+SCHEDULING_LONGEST_FIRST = "longest_first"
+SCHEDULING_STRATEGIES = (SCHEDULING_FIFO, SCHEDULING_LONGEST_FIRST)
+DEFAULT_SCHEDULING = SCHEDULING_LONGEST_FIRST
+
+# Execution engine of reindex tasks.
+ENGINE_THREAD = "thread"
+ENGINE_ASYNCIO = "asyncio"
+# Client-side PIT + search_after reading and bulk writing, no remote reindex.
+ENGINE_STREAM = "stream"
+ENGINES = (ENGINE_THREAD, ENGINE_ASYNCIO, ENGINE_STREAM)
+DEFAULT_ENGINE = ENGINE_THREAD
+
+# Bounds of adaptive reindex throttle (documents per second for single task).
+DEFAULT_THROTTLE_MIN_RPS = 100
+DEFAULT_THROTTLE_MAX_RPS = 20000
+# Destination write thread pool queue considered as overload.
+DEFAULT_THROTTLE_WRITE_QUEUE = 100
+# Part of source guard thresholds below which throttle and concurrency recover.
+GUARD_RECOVERY_HEADROOM = 0.8
+
+# Journal of original destination settings changed for bulk load.
+DEFAULT_TUNING_JOURNAL = ".elasticsearch_reindex_tuning.json"
+
+# Destination op_type of reconciliation, existing documents are not overwritten.
+OP_TYPE_CREATE = "create"
+
+# Streaming engine: documents per search page and bulk request, bulk writers.
+DEFAULT_STREAM_BATCH_SIZE = 1000
+DEFAULT_STREAM_WRITERS = 4
+# Point in time is kept alive between two search pages of a slice.
+DEFAULT_STREAM_KEEP_ALIVE = "5m"
+
+# Dry run: scratch index of the sampled benchmark is this prefix + source index.
+BENCHMARK_INDEX_PREFIX = "elasticsearch-reindex-benchmark-"
+# Planned actions of an index.
+PLAN_FULL = "full"
+PLAN_RESUME = "resume"
+PLAN_RECONCILE = "reconcile"
+PLAN_DELTA = "delta"
+PLAN_DATA_STREAM = "data_stream"
+
+# ILM phase of indexes still written to, migrated only on cutover.
+ILM_PHASE_HOT = "hot"
+
+# Index catalog: seconds it is cached for, index names per `_cat/indices` request.
+DEFAULT_CATALOG_TTL = 300
+DEFAULT_CATALOG_CHUNK = 100
+
+# Verification: range buckets per index, sampled documents hashed per bucket,
+# bisection of a mismatched range stops at this amount of source documents.
+DEFAULT_VERIFY_BUCKETS = 16
+DEFAULT_VERIFY_SAMPLE = 100
+DEFAULT_VERIFY_MIN_DOCS = 100
+# Seed of random sample, the same documents are checked by repeated runs.
+VERIFY_SAMPLE_SEED = 42
+
+# Adaptive batch size: bytes per batch and bounds of documents per batch.
+DEFAULT_BATCH_TARGET_BYTES = 5 * 1024 * 1024
+DEFAULT_BATCH_MIN_SIZE = 100
+DEFAULT_BATCH_MAX_SIZE = 10000
+# Documents per batch of slices with unknown document size, ES default one.
+DEFAULT_BATCH_INITIAL_SIZE = 1000
+
+# Retries of transient request failures: attempts and exponential backoff bounds.
+DEFAULT_REQUEST_RETRIES = 5
+DEFAULT_RETRY_BASE_DELAY = 1.0
+DEFAULT_RETRY_MAX_DELAY = 30.0
+# Consecutive transient failures opening circuit breaker of a cluster, seconds open.
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_RESET_TIMEOUT = 30.0
+# Seconds to wait for a discovered destination node to respond.
+DEFAULT_NODE_PROBE_TIMEOUT = 5
+# Consecutive failed status checks of a running task before it is failed.
+DEFAULT_MAX_CHECK_ERRORS = 30
+# Resubmissions of a failed reindex task, scoped to documents still missing.
+DEFAULT_TASK_RETRIES = 2
+# HTTP statuses of overloaded or restarting cluster, worth retrying.
+ES_TRANSIENT_STATUSES = (429, 502, 503, 504)
+# Tasks API error types of a temporarily unreachable node, worth retrying.
+ES_TRANSIENT_ERROR_TYPES = (
+    "node_not_connected_exception",
+    "node_disconnected_exception",
+    "connect_transport_exception",
+    "es_rejected_execution_exception",
+    "circuit_breaking_exception",
+)
+# Tasks API error types of a task unknown to the cluster, e.g. after node restart.
+ES_TASK_NOT_FOUND_ERROR_TYPES = (
+    "illegal_argument_exception",
+    "resource_not_found_exception",
+)
+
+# Throughput rates of progress reporting are averaged over this window, seconds.
+DEFAULT_METRICS_WINDOW = 60
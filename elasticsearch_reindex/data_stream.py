@@ -0,0 +1,71 @@
+"""
+Module with selection of data stream backing indices to migrate.
+"""
+
+import re
+from fnmatch import fnmatchcase
+from itertools import zip_longest
+
+from elasticsearch_reindex.client import is_regex_expression
+from elasticsearch_reindex.const import ILM_PHASE_HOT
+from elasticsearch_reindex.schema import DataStream
+
+
+def match_expressions(name: str, expressions: list[str] | None) -> bool:
+    """
+    Check if name matches any of names, wildcards or `/regex/` expressions.
+
+    Without expressions every name matches.
+    """
+    if not expressions:
+        return True
+    for expression in expressions:
+        if is_regex_expression(expression):
+            if re.fullmatch(expression[1:-1], name):
+                return True
+        elif fnmatchcase(name, expression):
+            return True
+    return False
+
+
+def is_hot_index(
+    data_stream: DataStream, es_index: str, ilm_phases: dict[str, str | None]
+) -> bool:
+    """
+    Check if backing index is still written to: the write or ILM hot index.
+    """
+    return (
+        es_index == data_stream.write_index or ilm_phases.get(es_index) == ILM_PHASE_HOT
+    )
+
+
+def get_backing_indices(
+    data_streams: list[DataStream], ilm_phases: dict[str, str | None], cutover: bool
+) -> tuple[dict[str, str], list[str]]:
+    """
+    Return data stream of every backing index to migrate and held hot indices.
+
+    Backing indices are ordered by age, the oldest generation of every data
+    stream first, so all streams progress in parallel. Hot indices are held
+    back until cutover, when writes are stopped on source.
+    """
+    backing: dict[str, str] = {}
+    held = []
+    generations = zip_longest(
+        *[
+            [(es_index, data_stream) for es_index in data_stream.indices]
+            for data_stream in sorted(data_streams, key=lambda stream: stream.name)
+        ]
+    )
+    for generation in generations:
+        for item in generation:
+            if item is None:
+                continue
+            es_index, data_stream = item
+            if not cutover and is_hot_index(
+                data_stream=data_stream, es_index=es_index, ilm_phases=ilm_phases
+            ):
+                held.append(es_index)
+                continue
+            backing[es_index] = data_stream.name
+    return backing, held
@@ -7,6 +7,14 @@ ES_TASK_ID_ERROR = (
     "Can not retrieve task status "
     "from ElasticSearch server: {host} and task id: {task_id}"
 )
+ES_BULK_ERROR = "Can not write {failed} documents of {es_index}, first error: {error}"
+ES_TRANSIENT_ERROR = "Temporary failure of ElasticSearch server: {host}: {error}"
+ES_CIRCUIT_OPEN_ERROR = (
+    "Requests to ElasticSearch server: {host} are suspended "
+    "for {retry_after:.0f}s after repeated failures"
+)
+ES_TASK_CREATE_ERROR = "Can not create reindex task for {es_index}: {error}"
+ES_TASK_FAILED_ERROR = "Reindex task: {task_id} failed: {error}"
 
 
 class BaseCustomException(Exception):
@@ -24,3 +32,27 @@ class ElasticSearchInvalidTaskIDException(BaseCustomException):
     """
     Exception raised when got ElasticSearch invalid task ID.
     """
+
+
+class ElasticSearchBulkException(BaseCustomException):
+    """
+    Exception raised when ElasticSearch rejected documents of bulk request.
+    """
+
+
+class ElasticSearchTransientException(BaseCustomException):
+    """
+    Exception raised when ElasticSearch is temporarily unavailable or overloaded.
+    """
+
+
+class ElasticSearchCircuitOpenException(ElasticSearchTransientException):
+    """
+    Exception raised when requests to ElasticSearch are suspended by circuit breaker.
+    """
+
+
+class ElasticSearchTaskException(BaseCustomException):
+    """
+    Exception raised when ElasticSearch reindex task can not be created or failed.
+    """
@@ -0,0 +1,270 @@
+"""
+Module with Prometheus exporter of reindex metrics.
+"""
+
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+from elasticsearch_reindex.logger import create_logger
+
+if TYPE_CHECKING:
+    from elasticsearch_reindex.reindex import ReindexService
+
+logger = create_logger()
+
+METRICS_PREFIX = "elasticsearch_reindex_"
+METRICS_PATH = "/metrics"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass
+class MetricFamily:
+    """
+    Dataclass for storing samples of a single metric.
+
+    Every sample is a tuple of name suffix (`_sum`, `_count` of summaries),
+    labels and value.
+    """
+
+    name: str
+    type: str
+    help: str
+    samples: list[tuple[str, dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, value: float, suffix: str = "", **labels: str) -> "MetricFamily":
+        self.samples.append((suffix, labels, value))
+        return self
+
+
+def format_metrics(families: list[MetricFamily]) -> str:
+    """
+    Return metrics in Prometheus text exposition format.
+    """
+    lines = []
+    for family in families:
+        name = f"{METRICS_PREFIX}{family.name}"
+        lines.append(f"# HELP {name} {family.help}")
+        lines.append(f"# TYPE {name} {family.type}")
+        for suffix, labels, value in family.samples:
+            lines.append(
+                f"{name}{suffix}{_format_labels(labels=labels)} {_format_value(value)}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = (
+        f'{key}="{_escape_label(value=value)}"' for key, value in sorted(labels.items())
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    # `g` format would round large counters.
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def collect_service_metrics(service: "ReindexService") -> list[MetricFamily]:
+    """
+    Return throughput of indexes, poll latency and failures of clusters.
+    """
+    indexes = service.metrics.get_indexes_stats()
+    run = service.metrics.get_run_stats()
+    families = [
+        MetricFamily(
+            name="documents_total",
+            type="counter",
+            help="Documents processed by reindex tasks.",
+        ),
+        MetricFamily(
+            name="documents_planned",
+            type="gauge",
+            help="Documents of scheduled slices.",
+        ),
+        MetricFamily(
+            name="bytes_total",
+            type="counter",
+            help="Bytes processed, estimated by average document size for remote tasks.",
+        ),
+        MetricFamily(
+            name="batches_total", type="counter", help="Batches written to destination."
+        ),
+        MetricFamily(
+            name="version_conflicts_total",
+            type="counter",
+            help="Documents skipped as version conflicts.",
+        ),
+        MetricFamily(
+            name="throttled_seconds_total",
+            type="counter",
+            help="Time tasks were throttled.",
+        ),
+        MetricFamily(
+            name="documents_per_second",
+            type="gauge",
+            help="Documents rate over the rolling window.",
+        ),
+        MetricFamily(
+            name="eta_seconds",
+            type="gauge",
+            help="Seconds left at the current rate, -1 if nothing moves.",
+        ),
+    ]
+    scopes = [({"index": es_index}, stats) for es_index, stats in indexes.items()]
+    # The run is an index of its own for dashboards, totals need no sum().
+    scopes.append(({"index": "_all"}, run))
+    for labels, stats in scopes:
+        values = (
+            stats.docs,
+            stats.total,
+            stats.bytes,
+            stats.batches,
+            stats.version_conflicts,
+            stats.throttled_millis / 1000,
+            stats.docs_per_second,
+            stats.eta if stats.eta is not None else -1,
+        )
+        for family, value in zip(families, values):
+            family.add(value, **labels)
+
+    families.append(
+        MetricFamily(
+            name="poll_duration_seconds",
+            type="summary",
+            help="Duration of task status polls of destination.",
+        )
+        .add(service.metrics.poll_seconds, suffix="_sum")
+        .add(service.metrics.poll_count, suffix="_count")
+    )
+    failures = MetricFamily(
+        name="request_failures_total",
+        type="counter",
+        help="Transient request failures by cluster.",
+    )
+    circuit_open = MetricFamily(
+        name="circuit_open",
+        type="gauge",
+        help="1 while requests to the cluster are suspended.",
+    )
+    for cluster, breaker in service.breakers.items():
+        failures.add(breaker.failures_total, cluster=cluster, host=breaker.host)
+        circuit_open.add(int(bool(breaker.retry_after)), cluster=cluster)
+    return families + [failures, circuit_open]
+
+
+class MetricsExporter:
+    """
+    Expose metrics on HTTP `/metrics` endpoint and/or in a textfile.
+
+    Metrics are collected on every scrape. The textfile for node exporter
+    textfile collector is replaced atomically every interval and once more
+    on stop, so the final state of the run stays visible.
+    """
+
+    def __init__(
+        self,
+        collect: Callable[[], list[MetricFamily]],
+        port: int | None = None,
+        textfile: str | None = None,
+        interval: float = 10,
+    ) -> None:
+        self._collect = collect
+        self.port = port
+        self.textfile = textfile
+        self.interval = interval
+        self._server: ThreadingHTTPServer | None = None
+        self._threads: list[Thread] = []
+        self._stopped = Event()
+
+    def start(self) -> None:
+        """
+        Start HTTP server and textfile writer threads.
+        """
+        if self.port is not None:
+            self._server = ThreadingHTTPServer(("", self.port), self._create_handler())
+            self.port = self._server.server_port
+            self._start_thread(target=self._server.serve_forever, name="http")
+            logger.info(f"Metrics exported on port {self.port}{METRICS_PATH}")
+        if self.textfile:
+            self._start_thread(
+                target=partial(self._write_textfiles, path=self.textfile),
+                name="textfile",
+            )
+            logger.info(f"Metrics written to {self.textfile}")
+
+    def stop(self) -> None:
+        """
+        Stop exporting, writing the final textfile.
+        """
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def render(self) -> str:
+        """
+        Return current metrics in text exposition format.
+        """
+        return format_metrics(families=self._collect())
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Replace the textfile atomically, so collector never reads half of it.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as textfile:
+            textfile.write(self.render())
+        os.replace(tmp_path, path)
+
+    def _start_thread(self, target: Callable[[], None], name: str) -> None:
+        thread = Thread(target=target, name=f"metrics-{name}", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _write_textfiles(self, path: str) -> None:
+        """
+        Write the textfile every interval until stopped, and once after.
+        """
+        while True:
+            stopped = self._stopped.wait(self.interval)
+            try:
+                self.write_textfile(path=path)
+            except Exception as exc:
+                logger.error(f"Can not write metrics to {path}: {exc}")
+            if stopped:
+                return
+
+    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != METRICS_PATH:
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                # Scrapes are too frequent for the migration log.
+                pass
+
+        return MetricsHandler
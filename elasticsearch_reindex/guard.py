@@ -0,0 +1,255 @@
+"""
+Module with guard of source cluster load, pausing or throttling reindex tasks.
+"""
+
+from dataclasses import dataclass
+from threading import Event, Thread
+
+from elasticsearch_reindex.budget import TaskLimit
+from elasticsearch_reindex.client import ElasticsearchClient
+from elasticsearch_reindex.const import (
+    DEFAULT_THROTTLE_MAX_RPS,
+    DEFAULT_THROTTLE_MIN_RPS,
+    GUARD_RECOVERY_HEADROOM,
+)
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.reindex import ReindexService
+
+logger = create_logger()
+
+
+@dataclass
+class SourceLoad:
+    """
+    Dataclass for storing search load of source cluster nodes.
+
+    Queue, rejected and query counters are summed up across nodes, rejected
+    and query counters are cumulative. CPU is the one of the busiest node.
+    """
+
+    search_queue: int
+    search_rejected: int
+    query_total: int
+    query_time_ms: int
+    cpu_percent: float
+
+    @classmethod
+    def from_nodes_stats(cls, stats: dict) -> "SourceLoad":
+        """
+        Initialize SourceLoad from Nodes Stats API response.
+        """
+        load = cls(
+            search_queue=0,
+            search_rejected=0,
+            query_total=0,
+            query_time_ms=0,
+            cpu_percent=0.0,
+        )
+        for node in stats["nodes"].values():
+            search_pool = node.get("thread_pool", {}).get("search", {})
+            search = node.get("indices", {}).get("search", {})
+            load.search_queue += search_pool.get("queue", 0)
+            load.search_rejected += search_pool.get("rejected", 0)
+            load.query_total += search.get("query_total", 0)
+            load.query_time_ms += search.get("query_time_in_millis", 0)
+            load.cpu_percent = max(
+                load.cpu_percent, node.get("os", {}).get("cpu", {}).get("percent", 0)
+            )
+        return load
+
+    def latency_since(self, previous: "SourceLoad") -> float:
+        """
+        Return average query latency (ms per query) since previous sample.
+        """
+        queries = self.query_total - previous.query_total
+        if queries <= 0:
+            return 0.0
+        return (self.query_time_ms - previous.query_time_ms) / queries
+
+    def rejected_since(self, previous: "SourceLoad") -> int:
+        """
+        Return amount of rejected search requests since previous sample.
+        """
+        return max(self.search_rejected - previous.search_rejected, 0)
+
+
+@dataclass
+class GuardDecision:
+    """
+    Dataclass for storing task limit and source throttle set by the guard.
+    """
+
+    tasks: int
+    requests_per_second: float | None
+
+
+class SourceGuard:
+    """
+    Controller of concurrency and throttle of tasks by source load.
+
+    While source rejects searches or its search queue, query latency or CPU
+    exceeds a threshold, running tasks limit is halved down to zero (paused)
+    and throttle is halved down to the minimum. While every metric stays below
+    a part of its threshold, one more task is allowed and throttle doubles
+    until the cap is lifted.
+    """
+
+    backoff_factor = 0.5
+
+    def __init__(
+        self,
+        max_tasks: int,
+        max_search_queue: int | None = None,
+        max_search_latency: float | None = None,
+        max_cpu: float | None = None,
+        min_rps: float = DEFAULT_THROTTLE_MIN_RPS,
+        max_rps: float = DEFAULT_THROTTLE_MAX_RPS,
+    ) -> None:
+        self.max_tasks = max_tasks
+        self.max_search_queue = max_search_queue
+        self.max_search_latency = max_search_latency
+        self.max_cpu = max_cpu
+        self.min_rps = min_rps
+        self.max_rps = max_rps
+        self.tasks = max_tasks
+        self.requests_per_second: float | None = None
+
+    def update(
+        self,
+        previous: SourceLoad,
+        current: SourceLoad,
+        requests_per_second: float | None = None,
+    ) -> GuardDecision | None:
+        """
+        Return new limits for the load change or None if they are unchanged.
+
+        Throttle is backed off from the current one of tasks if known.
+        """
+        metrics = self._get_metrics(previous=previous, current=current)
+        if current.rejected_since(previous) > 0 or any(
+            value > threshold for value, threshold in metrics
+        ):
+            tasks = self.tasks // 2
+            base_rps = requests_per_second or self.requests_per_second or self.max_rps
+            source_rps = max(base_rps * self.backoff_factor, self.min_rps)
+        elif all(
+            value < threshold * GUARD_RECOVERY_HEADROOM for value, threshold in metrics
+        ):
+            tasks = min(self.tasks + 1, self.max_tasks)
+            source_rps = None
+            if self.requests_per_second is not None:
+                source_rps = self.requests_per_second / self.backoff_factor
+                if source_rps >= self.max_rps:
+                    source_rps = None
+        else:
+            return None
+
+        if tasks == self.tasks and source_rps == self.requests_per_second:
+            return None
+
+        logger.info(
+            f"Source search queue: {current.search_queue}, "
+            f"query latency: {current.latency_since(previous):.2f}ms, "
+            f"CPU: {current.cpu_percent:.0f}%. "
+            f"Tasks: {self.tasks} -> {tasks}, "
+            f"source throttle: {self._format_rps(self.requests_per_second)} -> "
+            f"{self._format_rps(source_rps)}"
+        )
+        self.tasks, self.requests_per_second = tasks, source_rps
+        return GuardDecision(tasks=tasks, requests_per_second=source_rps)
+
+    def _get_metrics(
+        self, previous: SourceLoad, current: SourceLoad
+    ) -> list[tuple[float, float]]:
+        """
+        Return pairs of value and threshold of configured metrics.
+        """
+        metrics = [
+            (current.search_queue, self.max_search_queue),
+            (current.latency_since(previous), self.max_search_latency),
+            (current.cpu_percent, self.max_cpu),
+        ]
+        return [
+            (value, threshold) for value, threshold in metrics if threshold is not None
+        ]
+
+    @staticmethod
+    def _format_rps(requests_per_second: float | None) -> str:
+        if requests_per_second is None:
+            return "unlimited"
+        return f"{requests_per_second:.0f}"
+
+
+class SourceGuardMonitor:
+    """
+    Sample source nodes stats, limit running tasks and rethrottle live ones.
+    """
+
+    def __init__(
+        self,
+        es_client: ElasticsearchClient,
+        reindex_service: ReindexService,
+        guard: SourceGuard,
+        task_limit: TaskLimit,
+        check_interval: int,
+    ) -> None:
+        self._es_client = es_client
+        self._reindex_service = reindex_service
+        self._guard = guard
+        self._task_limit = task_limit
+        self._check_interval = check_interval
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, name="reindex-guard", daemon=True)
+
+    def start(self) -> None:
+        """
+        Start sampling thread.
+        """
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling thread and lift the source throttle of new tasks.
+        """
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._reindex_service.source_requests_per_second = None
+
+    def _run(self) -> None:
+        previous = self._sample()
+        while not self._stopped.wait(self._check_interval):
+            current = self._sample()
+            if previous is not None and current is not None:
+                self._apply(previous=previous, current=current)
+            previous = current or previous
+
+    def _sample(self) -> SourceLoad | None:
+        try:
+            return SourceLoad.from_nodes_stats(stats=self._es_client.get_search_stats())
+        except Exception as exc:
+            logger.error(f"Can not get source nodes stats: {exc}")
+            return None
+
+    def _apply(self, previous: SourceLoad, current: SourceLoad) -> None:
+        """
+        Apply limits if the guard changed them.
+        """
+        decision = self._guard.update(
+            previous=previous,
+            current=current,
+            requests_per_second=self._reindex_service.effective_requests_per_second,
+        )
+        if decision is None:
+            return
+
+        if decision.tasks != self._task_limit.limit:
+            self._task_limit.set_limit(limit=decision.tasks)
+        if decision.requests_per_second != (
+            self._reindex_service.source_requests_per_second
+        ):
+            # New tasks are created with the current throttle.
+            self._reindex_service.source_requests_per_second = (
+                decision.requests_per_second
+            )
+            self._reindex_service.rethrottle_running_tasks()
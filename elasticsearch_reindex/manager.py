@@ -1,13 +1,85 @@
+import asyncio
+import cProfile
+import json
 import os
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
-from typing import Any
+import sys
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, replace
+from functools import partial
+from threading import Lock
+from typing import TYPE_CHECKING
 
+from elasticsearch_reindex.batching import BatchSizeController
+from elasticsearch_reindex.budget import ConcurrencyBudget, TaskLimit, TaskSlots
+from elasticsearch_reindex.catalog import IndexCatalog
 from elasticsearch_reindex.client import ElasticsearchClient
-from elasticsearch_reindex.const import DEFAULT_CHECK_INTERVAL, DEFAULT_CONCURRENT_TASKS
+from elasticsearch_reindex.const import (
+    DEFAULT_BATCH_TARGET_BYTES,
+    DEFAULT_CATALOG_TTL,
+    DEFAULT_CHECK_INTERVAL,
+    DEFAULT_CONCURRENT_TASKS,
+    DEFAULT_ENGINE,
+    DEFAULT_REQUEST_RETRIES,
+    DEFAULT_SCHEDULING,
+    DEFAULT_SLICE_MIN_DOCS,
+    DEFAULT_SLICES,
+    DEFAULT_STREAM_BATCH_SIZE,
+    DEFAULT_STREAM_WRITERS,
+    DEFAULT_TASK_RETRIES,
+    DEFAULT_THROTTLE_MAX_RPS,
+    DEFAULT_THROTTLE_MIN_RPS,
+    DEFAULT_TUNING_JOURNAL,
+    DEFAULT_VERIFY_BUCKETS,
+    DEFAULT_VERIFY_SAMPLE,
+    ENGINE_ASYNCIO,
+    ENGINE_STREAM,
+    OP_TYPE_CREATE,
+    PLAN_DATA_STREAM,
+    PLAN_DELTA,
+    PLAN_FULL,
+    PLAN_RECONCILE,
+    PLAN_RESUME,
+    SCHEDULING_FIFO,
+)
+from elasticsearch_reindex.data_stream import get_backing_indices, match_expressions
+from elasticsearch_reindex.exporter import (
+    MetricFamily,
+    MetricsExporter,
+    collect_service_metrics,
+)
+from elasticsearch_reindex.guard import SourceGuard, SourceGuardMonitor
 from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.metrics import ThroughputStats
+from elasticsearch_reindex.planner import BenchmarkResult, ReindexBenchmark, build_plan
 from elasticsearch_reindex.reindex import ReindexService
-from elasticsearch_reindex.schema import Config, Index
-from elasticsearch_reindex.utils import check_migrated_indexes
+from elasticsearch_reindex.scheduler import ReindexScheduler, SchedulePlan
+from elasticsearch_reindex.schema import Config, Index, IndexSlice
+from elasticsearch_reindex.state import (
+    TASK_DONE,
+    TASK_FAILED,
+    TASK_PENDING,
+    TASK_RUNNING,
+    StateStore,
+    TaskRecord,
+)
+from elasticsearch_reindex.stream import StreamReindexService
+from elasticsearch_reindex.throttle import ThrottleController, ThrottleMonitor
+from elasticsearch_reindex.tracing import Tracer
+from elasticsearch_reindex.tuning import IndexTuner, TuningJournal
+from elasticsearch_reindex.utils import (
+    build_pit_slices,
+    build_range_slices,
+    check_migrated_indexes,
+    format_bytes,
+    format_duration,
+    get_delta_query,
+)
+from elasticsearch_reindex.verify import IndexVerification, IndexVerifier, RangeMismatch
+
+if TYPE_CHECKING:
+    from elasticsearch_reindex.async_reindex import AsyncReindexService
 
 logger = create_logger()
 
@@ -17,7 +89,10 @@ class ReindexManager:
     Logic for input args handling.
     """
 
-    def __init__(self, config: Config) -> None:
+    def __init__(self, config: Config, budget: ConcurrencyBudget | None = None) -> None:
+        if config.data_streams:
+            # Backing indices are transferred oldest first.
+            config = replace(config, scheduling=SCHEDULING_FIFO)
         self._config = config
         self._es_dest_client = ElasticsearchClient.from_config(
             config=config.dest_es_config
@@ -25,10 +100,44 @@ class ReindexManager:
         self._es_source_client = ElasticsearchClient.from_config(
             config=config.source_es_config
         )
-        self._reindex_service = ReindexService(config=config)
+        self._catalog = IndexCatalog(
+            source_client=self._es_source_client,
+            dest_client=self._es_dest_client,
+            expressions=config.indexes,
+            ttl=config.catalog_ttl,
+        )
+        # Concurrency budget shared with other runs of a topology.
+        self._budget = budget
+        # Limit of running tasks lowered by the source guard.
+        self._task_limit: TaskLimit | None = None
+        self._slot_executor: ThreadPoolExecutor | None = None
+        self._state_store = self._open_state_store()
+        # Records spans of run phases shared with services, if tracing is enabled.
+        self._tracer = Tracer(enabled=bool(config.trace_file))
+        self._reindex_service = self._create_reindex_service()
+        # Running tasks of the previous run to reattach to, by slice name.
+        self._resume_tasks: dict[str, str] = {}
+        # Names of delta slices, resubmitted as is since they overwrite documents.
+        self._delta_slices: set[str] = set()
+        # Backing indices of destination data streams are created by rollover.
+        self._tuner = (
+            self._create_tuner()
+            if config.tune_dest and not config.data_streams
+            else None
+        )
+        self._tasks_left = 0
+        # Counters of the scheduler for the metrics exporter.
+        self._tasks_queued = 0
+        self._tasks_finished = {TASK_DONE: 0, TASK_FAILED: 0}
+        self._task_retries = 0
+        # Service running the tasks, the asyncio engine creates its own.
+        self._active_service = self._reindex_service
+        self._lock = Lock()
 
     @classmethod
-    def from_dict(cls, data: dict) -> "ReindexManager":
+    def from_dict(
+        cls, data: dict, budget: ConcurrencyBudget | None = None
+    ) -> "ReindexManager":
         """
         Initialize Manages class from dict settings.
         """
@@ -40,8 +149,50 @@ class ReindexManager:
             indexes=data.get("indexes", []),
             check_interval=data.get("check_interval", DEFAULT_CHECK_INTERVAL),
             concurrent_tasks=data.get("concurrent_tasks", DEFAULT_CONCURRENT_TASKS),
+            slices=data.get("slices", DEFAULT_SLICES),
+            slice_field=data.get("slice_field"),
+            slice_min_docs=data.get("slice_min_docs", DEFAULT_SLICE_MIN_DOCS),
+            scheduling=data.get("scheduling", DEFAULT_SCHEDULING),
+            engine=data.get("engine", DEFAULT_ENGINE),
+            http_compress=data.get("http_compress", True),
+            requests_per_second=data.get("requests_per_second"),
+            throttle_target_latency=data.get("throttle_target_latency"),
+            throttle_min_rps=data.get("throttle_min_rps", DEFAULT_THROTTLE_MIN_RPS),
+            throttle_max_rps=data.get("throttle_max_rps", DEFAULT_THROTTLE_MAX_RPS),
+            guard_search_queue=data.get("guard_search_queue"),
+            guard_search_latency=data.get("guard_search_latency"),
+            guard_cpu=data.get("guard_cpu"),
+            tune_dest=data.get("tune_dest", False),
+            force_merge=data.get("force_merge", False),
+            tuning_journal=data.get("tuning_journal", DEFAULT_TUNING_JOURNAL),
+            state_file=data.get("state_file"),
+            delta_field=data.get("delta_field"),
+            reconcile=data.get("reconcile", False),
+            stream_batch_size=data.get("stream_batch_size", DEFAULT_STREAM_BATCH_SIZE),
+            stream_writers=data.get("stream_writers", DEFAULT_STREAM_WRITERS),
+            adaptive_batch=data.get("adaptive_batch", False),
+            batch_target_bytes=data.get(
+                "batch_target_bytes", DEFAULT_BATCH_TARGET_BYTES
+            ),
+            request_retries=data.get("request_retries", DEFAULT_REQUEST_RETRIES),
+            task_retries=data.get("task_retries", DEFAULT_TASK_RETRIES),
+            metrics_port=data.get("metrics_port"),
+            metrics_textfile=data.get("metrics_textfile"),
+            dry_run=data.get("dry_run", False),
+            plan_file=data.get("plan_file"),
+            benchmark_docs=data.get("benchmark_docs", 0),
+            verify_field=data.get("verify_field"),
+            verify_buckets=data.get("verify_buckets", DEFAULT_VERIFY_BUCKETS),
+            verify_sample=data.get("verify_sample", DEFAULT_VERIFY_SAMPLE),
+            verify_file=data.get("verify_file"),
+            catalog_ttl=data.get("catalog_ttl", DEFAULT_CATALOG_TTL),
+            data_streams=data.get("data_streams", False),
+            cutover=data.get("cutover", False),
+            spread_dest_nodes=data.get("spread_dest_nodes", False),
+            trace_file=data.get("trace_file"),
+            profile_file=data.get("profile_file"),
         )
-        return cls(config=config)
+        return cls(config=config, budget=budget)
 
     def start_reindex(self) -> None:
         """
@@ -51,68 +202,1150 @@ class ReindexManager:
             1. Retrieves source and destination indexes
             2. Filters indexes based on user input (if provided)
             3. Identifies indexes that need migration
-            4. Initiates concurrent reindexing tasks
-            5. Processes the results of the reindexing tasks
+            4. Splits large indexes into slices (if configured)
+            5. Skips finished slices of the previous run (if state file is set)
+            6. Builds reconcile slices of partially migrated indexes (if enabled)
+            7. Builds delta slices of migrated indexes (if delta field is set)
+            8. Initiates concurrent reindexing tasks
+            9. Processes the results of the reindexing tasks
+
+        Dry run stops after step 7 and writes the plan of the run as JSON.
+        In data stream mode backing indices are migrated instead of indexes.
+        Phases are traced to `trace_file` and the run is profiled to
+        `profile_file`, if set.
 
         Raises:
             ElasticsearchException: If there's an error communicating with Elasticsearch
             Exception: For any other unexpected errors during the process
         """
-        source_indexes = self._get_source_indexes()
-        dest_indexes = self._get_destination_indexes()
+        with self._profile(), self._trace():
+            if self._config.data_streams:
+                self._start_data_stream_reindex()
+            else:
+                self._start_index_reindex()
 
-        not_migrated_indexes, partial_migrated_indexes = self._identify_migration_needs(
-            source_indexes=source_indexes, dest_indexes=dest_indexes
-        )
+    def _start_index_reindex(self) -> None:
+        """
+        Migrate indexes, steps are described by `start_reindex`.
+        """
+        with self._tracer.span(name="discovery") as span:
+            source_indexes = self._get_source_indexes()
+            dest_indexes = self._get_destination_indexes()
+            span.update(
+                source_indexes=len(source_indexes), dest_indexes=len(dest_indexes)
+            )
+
+        with self._tracer.span(name="planning") as span:
+            not_migrated_indexes, partial_migrated_indexes = (
+                self._identify_migration_needs(
+                    source_indexes=source_indexes, dest_indexes=dest_indexes
+                )
+            )
+            span.update(
+                not_migrated=len(not_migrated_indexes),
+                partial_migrated=len(partial_migrated_indexes),
+            )
 
         self._log_migration_status(
             source_indexes, dest_indexes, not_migrated_indexes, partial_migrated_indexes
         )
-        if not not_migrated_indexes:
+        resumable_indexes = self._get_resumable_indexes(
+            partial_migrated_indexes=partial_migrated_indexes
+        )
+        reconcile_indexes = self._get_reconcile_indexes(
+            partial_migrated_indexes=partial_migrated_indexes,
+            resumable_indexes=resumable_indexes,
+        )
+        migration_indexes = (
+            set(not_migrated_indexes) | resumable_indexes | reconcile_indexes
+        )
+        if not migration_indexes and not self._config.delta_field:
             logger.info("No indexes require migration. Process complete.")
             return
 
         try:
-            self._execute_reindex_tasks(not_migrated_indexes)
+            with self._tracer.span(name="slicing") as span:
+                index_slices = self._get_index_slices(
+                    indexes=[
+                        index
+                        for index in source_indexes
+                        if index.name in migration_indexes - reconcile_indexes
+                    ],
+                    missing_indexes=set(not_migrated_indexes),
+                )
+                index_slices = self._resume_slices(
+                    index_slices=index_slices, missing_indexes=set(not_migrated_indexes)
+                )
+                index_slices.extend(
+                    self._get_reconcile_slices(
+                        indexes=[
+                            index
+                            for index in source_indexes
+                            if index.name in reconcile_indexes
+                        ]
+                    )
+                )
+                if delta_field := self._config.delta_field:
+                    self._begin_watermarks(
+                        indexes=migration_indexes, delta_field=delta_field
+                    )
+                    index_slices.extend(
+                        self._get_delta_slices(
+                            source_indexes=source_indexes,
+                            dest_indexes=dest_indexes,
+                            exclude_indexes=migration_indexes,
+                            delta_field=delta_field,
+                        )
+                    )
+                span["slices"] = len(index_slices)
+            if self._config.dry_run:
+                self._dry_run(
+                    index_slices=index_slices, resumable_indexes=resumable_indexes
+                )
+                return
+            if index_slices:
+                with self._tracer.span(name="execution", slices=len(index_slices)):
+                    self._execute_reindex_tasks(index_slices)
+            self._commit_watermarks(
+                indexes=migration_indexes
+                | {es_slice.index for es_slice in index_slices}
+            )
         except Exception as e:
             logger.error(f"An error occurred during reindexing: {str(e)}")
             raise
+        finally:
+            if self._state_store:
+                self._state_store.close()
 
-    def _execute_reindex_tasks(self, not_migrated_indexes: list[str]) -> None:
+    def _start_data_stream_reindex(self) -> None:
         """
-        Execute reindexing tasks concurrently.
+        Migrate backing indices of source data streams into destination ones.
+
+        Backing indices are transferred in parallel, oldest first, with
+        op_type `create` required by data streams, so re-runs skip existing
+        documents. Write and ILM hot indices are left until cutover.
         """
-        # Calculate max concurrent task depends on CPU count.
-        max_workers = min(self._config.concurrent_tasks, (os.cpu_count() or 1) * 5)
+        try:
+            with self._tracer.span(name="discovery") as span:
+                backing_streams = self._get_backing_streams()
+                span["backing_indices"] = len(backing_streams)
+            if not backing_streams:
+                logger.info("No backing indices require migration. Process complete.")
+                return
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {}
-            for es_index in not_migrated_indexes:
-                kwargs: dict[str, Any] = {
-                    "es_index": es_index,
-                    "check_interval": self._config.check_interval,
-                }
-                future = executor.submit(self._reindex_service.transfer_index, **kwargs)
-                futures[future] = es_index
+            source_indexes = {
+                index.name: index
+                for index in self._es_source_client.get_indexes(
+                    expressions=list(backing_streams)
+                )
+            }
+            index_slices = self._get_index_slices(
+                indexes=[
+                    source_indexes[name]
+                    for name in backing_streams
+                    if name in source_indexes
+                ]
+            )
+            index_slices = [
+                replace(
+                    es_slice,
+                    dest_index=backing_streams[es_slice.index],
+                    op_type=OP_TYPE_CREATE,
+                )
+                for es_slice in index_slices
+            ]
+            dest_streams = {
+                data_stream.name
+                for data_stream in self._es_dest_client.get_data_streams()
+            }
+            index_slices = self._resume_slices(
+                index_slices=index_slices,
+                missing_indexes={
+                    name
+                    for name, stream in backing_streams.items()
+                    if stream not in dest_streams
+                },
+            )
+            if self._config.dry_run:
+                self._dry_run(index_slices=index_slices, resumable_indexes=set())
+                return
+            if index_slices:
+                with self._tracer.span(name="execution", slices=len(index_slices)):
+                    self._execute_reindex_tasks(index_slices)
+        except Exception as e:
+            logger.error(f"An error occurred during reindexing: {str(e)}")
+            raise
+        finally:
+            if self._state_store:
+                self._state_store.close()
 
-            self._process_result(futures=futures)
+    def _get_backing_streams(self) -> dict[str, str]:
+        """
+        Return data stream of every backing index to migrate, oldest first.
+        """
+        data_streams = [
+            data_stream
+            for data_stream in self._es_source_client.get_data_streams()
+            if match_expressions(
+                name=data_stream.name, expressions=self._config.indexes
+            )
+        ]
+        ilm_phases = {}
+        if data_streams and not self._config.cutover:
+            ilm_phases = self._es_source_client.get_ilm_phases(
+                es_index=",".join(data_stream.name for data_stream in data_streams)
+            )
+        backing_streams, held = get_backing_indices(
+            data_streams=data_streams,
+            ilm_phases=ilm_phases,
+            cutover=self._config.cutover,
+        )
+        logger.info(
+            f"Source contains {len(data_streams)} data streams, "
+            f"{len(backing_streams)} backing indices to migrate"
+        )
+        if held:
+            logger.info(f"Hot backing indices left until cutover: {', '.join(held)}")
+        return backing_streams
 
-    def _get_source_indexes(self) -> list[Index]:
+    def start_verify(self) -> list[IndexVerification]:
+        """
+        Verify migrated indexes by bucket counts and sampled document hashes.
+
+        Indexes are verified concurrently, the report with differing ranges
+        and documents is written as JSON.
+        """
+        source_indexes = self._get_source_indexes()
+        dest_names = {index.name for index in self._get_destination_indexes()}
+        verifier = IndexVerifier(
+            source_client=self._es_source_client,
+            dest_client=self._es_dest_client,
+            field=(
+                self._config.verify_field
+                or self._config.slice_field
+                or self._config.delta_field
+            ),
+            buckets=self._config.verify_buckets,
+            sample_docs=self._config.verify_sample,
+        )
+        with ThreadPoolExecutor(max_workers=self._config.concurrent_tasks) as executor:
+            results = list(
+                executor.map(
+                    verifier.verify,
+                    [
+                        index.name
+                        for index in source_indexes
+                        if index.name in dest_names
+                    ],
+                )
+            )
+        results.extend(
+            self._get_missing_verification(es_index=index)
+            for index in source_indexes
+            if index.name not in dest_names
+        )
+
+        for result in results:
+            self._log_verification(result=result)
+        failed = sum(not result.ok for result in results)
+        logger.info(f"Verified {len(results)} indexes, {failed} differ")
+        self._write_report(
+            report=json.dumps([asdict(result) for result in results], indent=2),
+            path=self._config.verify_file,
+        )
+        return results
+
+    @staticmethod
+    def _get_missing_verification(es_index: Index) -> IndexVerification:
+        """
+        Return verification of index missing on destination.
+        """
+        return IndexVerification(
+            index=es_index.name,
+            field=None,
+            source_docs=es_index.docs_count,
+            dest_docs=0,
+            buckets=0,
+            ranges=[
+                RangeMismatch(
+                    lower=None,
+                    upper=None,
+                    query=None,
+                    source_docs=es_index.docs_count,
+                    dest_docs=0,
+                )
+            ],
+        )
+
+    @staticmethod
+    def _log_verification(result: IndexVerification) -> None:
         """
-        Retrieve and filter source indexes.
+        Log verification result of the index.
         """
-        source_indexes = self._es_source_client.get_indexes()
-        if user_indexes := self._config.indexes:
-            return self._filter_user_indexes(
-                user_indexes=user_indexes, source_indexes=source_indexes
+        if result.ok:
+            logger.info(
+                f"Index: {result.index} verified: {result.source_docs} documents, "
+                f"{result.buckets} buckets, {result.sampled_docs} sampled documents"
             )
-        return source_indexes
+            return
+        logger.error(
+            f"Index: {result.index} differs: {result.source_docs} documents on "
+            f"source, {result.dest_docs} on destination, {len(result.ranges)} "
+            f"ranges differ, {len(result.missing_ids)} sampled documents missing, "
+            f"{len(result.different_ids)} different"
+        )
+        for mismatch in result.ranges:
+            if mismatch.lower is None:
+                scope = "whole index"
+            else:
+                scope = f"{result.field} [{mismatch.lower}, {mismatch.upper}]"
+            logger.error(
+                f"Index: {result.index} {scope}: {mismatch.source_docs} documents "
+                f"on source, {mismatch.dest_docs} on destination"
+            )
+
+    def _execute_reindex_tasks(self, index_slices: list[IndexSlice]) -> None:
+        """
+        Execute reindexing tasks concurrently with the configured engine.
+
+        Slices of the same index are scheduled together as separate tasks,
+        in the order produced by the scheduler.
+        """
+        plan = self._plan_schedule(index_slices=index_slices)
+        self._tasks_left = self._tasks_queued = len(plan.index_slices)
+        if self._tuner:
+            # Restore indexes left tuned by a killed run.
+            self._tuner.restore_pending()
+            self._tuner.register(index_slices=plan.index_slices)
+
+        exporter = self._start_exporter()
+        try:
+            if self._config.engine == ENGINE_ASYNCIO:
+                asyncio.run(self._execute_async_tasks(plan=plan))
+            else:
+                self._reindex_service.metrics.register(index_slices=plan.index_slices)
+                self._execute_threaded_tasks(plan=plan)
+                self._log_run_summary(
+                    stats=self._reindex_service.metrics.get_run_stats()
+                )
+        finally:
+            # Destination has changed, verification must see current counts.
+            self._catalog.invalidate()
+            if exporter:
+                exporter.stop()
+            if self._tuner:
+                self._tuner.restore_pending()
+
+    def _plan_schedule(self, index_slices: list[IndexSlice]) -> SchedulePlan:
+        """
+        Return submission order of slices by the configured scheduling.
+        """
+        scheduler = ReindexScheduler(
+            workers=self._config.concurrent_tasks, strategy=self._config.scheduling
+        )
+        plan = scheduler.plan(index_slices=index_slices)
+        # Reattached tasks are already running on destination, so go first.
+        plan.index_slices.sort(
+            key=lambda es_slice: es_slice.name not in self._resume_tasks
+        )
+        self._log_schedule_plan(plan=plan)
+        return plan
+
+    def _dry_run(
+        self, index_slices: list[IndexSlice], resumable_indexes: set[str]
+    ) -> None:
+        """
+        Write plan of the run without submitting tasks.
+        """
+        plan = self._plan_schedule(index_slices=index_slices)
+        actions = {
+            es_slice.name: self._get_plan_action(
+                es_slice=es_slice, resumable_indexes=resumable_indexes
+            )
+            for es_slice in plan.index_slices
+        }
+        migration_plan = build_plan(
+            config=self._config,
+            plan=plan,
+            actions=actions,
+            reattached_tasks=sorted(self._resume_tasks),
+        )
+        if self._config.benchmark_docs and index_slices:
+            migration_plan.benchmark = self._run_benchmark(index_slices=index_slices)
+        if (seconds := migration_plan.estimated_seconds) is not None:
+            logger.info(f"Estimated duration: {format_duration(seconds)}")
+        self._write_report(report=migration_plan.to_json(), path=self._config.plan_file)
+
+    def _get_plan_action(
+        self, es_slice: IndexSlice, resumable_indexes: set[str]
+    ) -> str:
+        """
+        Return why the slice is transferred.
+        """
+        if self._config.data_streams:
+            return PLAN_DATA_STREAM
+        if es_slice.name in self._delta_slices:
+            return PLAN_DELTA
+        if es_slice.op_type == OP_TYPE_CREATE:
+            return PLAN_RECONCILE
+        if es_slice.index in resumable_indexes:
+            return PLAN_RESUME
+        return PLAN_FULL
+
+    def _run_benchmark(self, index_slices: list[IndexSlice]) -> BenchmarkResult:
+        """
+        Measure rate of a single task with the configured engine.
+        """
+        reindex_service = self._create_reindex_service()
+        try:
+            return ReindexBenchmark(
+                reindex_service=reindex_service,
+                dest_client=self._es_dest_client,
+                sample_docs=self._config.benchmark_docs,
+            ).run(index_slices=index_slices)
+        finally:
+            reindex_service.close()
+
+    @staticmethod
+    def _write_report(report: str, path: str | None) -> None:
+        """
+        Write JSON report to the file or stdout, logs go to stderr.
+        """
+        if not path:
+            sys.stdout.write(report + "\n")
+            return
+        with open(path, "w") as report_file:
+            report_file.write(report + "\n")
+        logger.info(f"Report written to {path}")
+
+    def _execute_threaded_tasks(self, plan: SchedulePlan) -> None:
+        """
+        Submit a new task as soon as a slot is free, while a single poller
+        thread tracks all running tasks.
+        """
+        self._task_limit = self._create_task_limit(plan=plan)
+        slots = TaskSlots(
+            workers=plan.workers,
+            budget=self._budget,
+            source=self._config.source_host,
+            dest=self._config.dest_host,
+            limit=self._task_limit,
+        )
+        throttle = self._start_throttle(reindex_service=self._reindex_service)
+        guard = self._start_guard(reindex_service=self._reindex_service, plan=plan)
+        # Restore of finished indexes waits for green status and resubmission of
+        # failed tasks may wait for destination, so both run aside.
+        restore_executor = ThreadPoolExecutor(max_workers=plan.workers)
+        try:
+            for es_slice in plan.index_slices:
+                slots.acquire()
+                self._dequeue_task()
+                future = self._submit_slice(es_slice=es_slice)
+                future.add_done_callback(
+                    partial(
+                        self._process_result,
+                        es_slice=es_slice,
+                        slots=slots,
+                        restore_executor=restore_executor,
+                    )
+                )
+
+            # Slots are released after result processing, so taking all of them
+            # back means every task is finished and processed.
+            slots.join()
+        finally:
+            if guard:
+                guard.stop()
+            if throttle:
+                throttle.stop()
+            restore_executor.shutdown(wait=True)
+            self._reindex_service.close()
+
+    async def _execute_async_tasks(self, plan: SchedulePlan) -> None:
+        """
+        Run all tasks from one event loop, bounded by semaphore of worker slots.
+        """
+        # Imported lazily: asyncio engine requires optional aiohttp dependency.
+        from elasticsearch_reindex.async_reindex import AsyncReindexService
+
+        slots = asyncio.Semaphore(value=plan.workers)
+        async with AsyncReindexService(
+            config=self._config, state_store=self._state_store
+        ) as service:
+            self._active_service = service
+            service.tracer = self._tracer
+            service.metrics.register(index_slices=plan.index_slices)
+            self._task_limit = self._create_task_limit(plan=plan)
+            throttle = self._start_throttle(reindex_service=service)
+            guard = self._start_guard(reindex_service=service, plan=plan)
+            if self._budget or self._task_limit:
+                self._slot_executor = ThreadPoolExecutor(max_workers=plan.workers)
+            try:
+                await asyncio.gather(
+                    *(
+                        self._transfer_slice_async(
+                            service=service, es_slice=es_slice, slots=slots
+                        )
+                        for es_slice in plan.index_slices
+                    )
+                )
+            finally:
+                if guard:
+                    guard.stop()
+                if throttle:
+                    throttle.stop()
+                if self._slot_executor:
+                    self._slot_executor.shutdown(wait=False)
+            self._log_run_summary(stats=service.metrics.get_run_stats())
+
+    async def _transfer_slice_async(
+        self,
+        service: "AsyncReindexService",
+        es_slice: IndexSlice,
+        slots: asyncio.Semaphore,
+    ) -> None:
+        """
+        Transfer single slice when a slot is free and log the result.
+        """
+        async with slots, self._shared_slot():
+            self._dequeue_task()
+            attempt = 0
+            while True:
+                try:
+                    task_id = await self._run_slice_async(
+                        service=service, es_slice=es_slice
+                    )
+                except Exception as exc:
+                    if retry_slice := self._get_retry_slice(
+                        es_slice=es_slice, exc=exc, attempt=attempt
+                    ):
+                        es_slice, attempt = retry_slice, attempt + 1
+                        continue
+                    self._log_result(es_slice=es_slice, task_id=None, exc=exc)
+                else:
+                    self._log_result(es_slice=es_slice, task_id=task_id, exc=None)
+                    self._log_reconcile_result(
+                        es_slice=es_slice,
+                        stats=service.get_task_stats(
+                            es_slice=es_slice, task_id=task_id
+                        ),
+                    )
+                break
+
+        if self._tuner and self._tuner.after_slice(es_slice=es_slice):
+            await asyncio.to_thread(self._restore_index, es_slice.index)
+
+    @asynccontextmanager
+    async def _shared_slot(self) -> AsyncIterator[None]:
+        """
+        Hold a slot of the task limit of the source guard and of the shared
+        budget, if the run is a part of topology.
+        """
+        if self._budget is None and self._task_limit is None:
+            yield
+            return
+        slots = TaskSlots(
+            workers=1,
+            budget=self._budget,
+            source=self._config.source_host,
+            dest=self._config.dest_host,
+            limit=self._task_limit,
+        )
+        # Waiting threads are bounded by worker slots, so they can not starve
+        # the default executor used by the tuner.
+        await asyncio.get_running_loop().run_in_executor(
+            self._slot_executor, slots.acquire
+        )
+        try:
+            yield
+        finally:
+            slots.release()
+
+    async def _run_slice_async(
+        self, service: "AsyncReindexService", es_slice: IndexSlice
+    ) -> str:
+        """
+        Reattach to the running task of the slice or transfer it by a new one.
+        """
+        if resume_task_id := self._resume_tasks.pop(es_slice.name, None):
+            return await service.attach_slice_async(
+                es_slice=es_slice, task_id=resume_task_id
+            )
+        if self._tuner:
+            await asyncio.to_thread(self._tuner.before_slice, es_slice)
+        return await service.transfer_slice_async(es_slice=es_slice)
+
+    def _open_state_store(self) -> StateStore | None:
+        """
+        Open state file, read only by a dry run.
+        """
+        if not self._config.state_file:
+            return None
+        if not self._config.dry_run:
+            return StateStore(
+                path=self._config.state_file, es_host=self._config.dest_host
+            )
+        if not os.path.exists(self._config.state_file):
+            return None
+        return StateStore(
+            path=self._config.state_file, es_host=self._config.dest_host, read_only=True
+        )
+
+    def _create_reindex_service(self) -> ReindexService:
+        """
+        Create service of the configured engine for the threaded execution.
+        """
+        if self._config.engine == ENGINE_STREAM:
+            service: ReindexService = StreamReindexService(
+                config=self._config,
+                source_client=self._es_source_client,
+                dest_client=self._es_dest_client,
+                state_store=self._state_store,
+            )
+        else:
+            service = ReindexService(config=self._config, state_store=self._state_store)
+        service.tracer = self._tracer
+        return service
+
+    def _start_throttle(
+        self, reindex_service: ReindexService
+    ) -> ThrottleMonitor | None:
+        """
+        Start adaptive throttling and batch sizing of tasks if enabled.
+
+        Streaming engine sizes batches by its own bulk latency instead of
+        destination nodes stats.
+        """
+        batch_controller = self._create_batch_controller()
+        reindex_service.batch_controller = batch_controller
+        if self._config.engine == ENGINE_STREAM:
+            batch_controller = None
+        if not self._config.throttle_target_latency and not batch_controller:
+            return None
+
+        controller = None
+        if self._config.throttle_target_latency:
+            controller = ThrottleController(
+                target_latency=self._config.throttle_target_latency,
+                requests_per_second=self._config.requests_per_second,
+                min_rps=self._config.throttle_min_rps,
+                max_rps=self._config.throttle_max_rps,
+            )
+        throttle = ThrottleMonitor(
+            es_client=self._es_dest_client,
+            reindex_service=reindex_service,
+            controller=controller,
+            check_interval=self._config.check_interval,
+            batch_controller=batch_controller,
+        )
+        throttle.start()
+        return throttle
+
+    def _create_task_limit(self, plan: SchedulePlan) -> TaskLimit | None:
+        if not self._config.guard_enabled:
+            return None
+        return TaskLimit(limit=plan.workers)
+
+    def _start_guard(
+        self, reindex_service: ReindexService, plan: SchedulePlan
+    ) -> SourceGuardMonitor | None:
+        """
+        Start guard of source load if any threshold is set.
+        """
+        if self._task_limit is None:
+            return None
+        guard = SourceGuardMonitor(
+            es_client=self._es_source_client,
+            reindex_service=reindex_service,
+            guard=SourceGuard(
+                max_tasks=plan.workers,
+                max_search_queue=self._config.guard_search_queue,
+                max_search_latency=self._config.guard_search_latency,
+                max_cpu=self._config.guard_cpu,
+                min_rps=self._config.throttle_min_rps,
+                max_rps=self._config.throttle_max_rps,
+            ),
+            task_limit=self._task_limit,
+            check_interval=self._config.check_interval,
+        )
+        guard.start()
+        return guard
+
+    @contextmanager
+    def _trace(self) -> Iterator[None]:
+        """
+        Write spans of the run to the trace file and log time of every phase.
+        """
+        try:
+            yield
+        finally:
+            if self._config.trace_file:
+                totals = self._tracer.get_totals()
+                logger.info(
+                    "Traced phases: "
+                    + ", ".join(
+                        f"{name} {seconds:.2f}s ({spans})"
+                        for name, (spans, seconds) in totals.items()
+                    )
+                )
+                self._tracer.write(path=self._config.trace_file)
+
+    @contextmanager
+    def _profile(self) -> Iterator[None]:
+        """
+        Profile the calling thread, which runs the event loop of asyncio engine.
+        """
+        if not self._config.profile_file:
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(self._config.profile_file)
+            logger.info(f"Profile written to {self._config.profile_file}")
+
+    def _start_exporter(self) -> MetricsExporter | None:
+        """
+        Start exporting metrics on HTTP endpoint and/or to textfile if enabled.
+        """
+        if self._config.metrics_port is None and not self._config.metrics_textfile:
+            return None
+        exporter = MetricsExporter(
+            collect=self._collect_metrics,
+            port=self._config.metrics_port,
+            textfile=self._config.metrics_textfile,
+            interval=self._config.check_interval,
+        )
+        exporter.start()
+        return exporter
+
+    def _collect_metrics(self) -> list[MetricFamily]:
+        """
+        Return state of the scheduler and metrics of the running service.
+        """
+        with self._lock:
+            queued = self._tasks_queued
+            running = self._tasks_left - self._tasks_queued
+            finished = dict(self._tasks_finished)
+            retries = self._task_retries
+
+        tasks = MetricFamily(
+            name="tasks",
+            type="gauge",
+            help="Tasks waiting for a worker slot and in flight.",
+        )
+        tasks.add(queued, state="queued").add(running, state="running")
+        tasks_finished = MetricFamily(
+            name="tasks_finished_total",
+            type="counter",
+            help="Finished tasks by status.",
+        )
+        for status, value in finished.items():
+            tasks_finished.add(value, status=status)
+        task_retries = MetricFamily(
+            name="task_retries_total", type="counter", help="Failed tasks resubmitted."
+        ).add(retries)
+        return [tasks, tasks_finished, task_retries] + collect_service_metrics(
+            service=self._active_service
+        )
+
+    def _dequeue_task(self) -> None:
+        """
+        Count the task taken by a worker slot.
+        """
+        with self._lock:
+            self._tasks_queued -= 1
+
+    def _create_batch_controller(self) -> BatchSizeController | None:
+        """
+        Create adaptive batch size controller if enabled.
+        """
+        if not self._config.adaptive_batch:
+            return None
+        return BatchSizeController(target_bytes=self._config.batch_target_bytes)
+
+    def _create_tuner(self) -> IndexTuner:
+        """
+        Return tuner of destination indexes with journal of original settings.
+        """
+        journal = TuningJournal(
+            path=self._config.tuning_journal, es_host=self._config.dest_host
+        )
+        return IndexTuner(
+            source_client=self._es_source_client,
+            dest_client=self._es_dest_client,
+            journal=journal,
+            force_merge=self._config.force_merge,
+        )
+
+    def _restore_index(self, es_index: str) -> None:
+        """
+        Restore original settings of the finished index.
+        """
+        if self._tuner is None:
+            return
+        try:
+            self._tuner.restore(es_index=es_index)
+        except Exception as exc:
+            logger.error(f"Index: {es_index} settings restore failed: {exc}")
+
+    def _submit_slice(self, es_slice: IndexSlice) -> Future:
+        """
+        Submit reindex task, failed submission is returned as failed future.
+        """
+        try:
+            if resume_task_id := self._resume_tasks.pop(es_slice.name, None):
+                return self._reindex_service.attach_slice(
+                    es_slice=es_slice, task_id=resume_task_id
+                )
+            if self._tuner:
+                self._tuner.before_slice(es_slice=es_slice)
+            return self._reindex_service.submit_slice(es_slice=es_slice)
+        except Exception as exc:
+            future: Future = Future()
+            future.set_exception(exc)
+            return future
+
+    def _get_index_slices(
+        self, indexes: list[Index], missing_indexes: set[str] | None = None
+    ) -> list[IndexSlice]:
+        """
+        Return reindex work units, splitting large indexes into slices.
+
+        Index missing on destination has nothing to resume and its stored
+        slices may be limited by the query of a delta pass, so it is split
+        again and replaces them.
+        """
+        missing_indexes = missing_indexes or set()
+        index_slices = []
+        for es_index in indexes:
+            if es_index.name not in missing_indexes and (
+                stored_slices := self._get_stored_slices(es_index=es_index)
+            ):
+                index_slices.extend(stored_slices)
+                continue
+
+            new_slices = self._split_index(es_index=es_index)
+            if self._state_store:
+                self._state_store.reset_slices(index_slices=new_slices)
+            index_slices.extend(new_slices)
+        return index_slices
+
+    def _get_stored_slices(self, es_index: Index) -> list[IndexSlice]:
+        """
+        Return slices recorded by the previous run, so ranges stay the same.
+        """
+        if not self._state_store:
+            return []
+        records = self._state_store.get_records(es_index=es_index.name)
+        return [record.es_slice for record in records]
+
+    def _get_resumable_indexes(self, partial_migrated_indexes: list[str]) -> set[str]:
+        """
+        Return partially migrated indexes with unfinished slices of previous run.
+        """
+        if not self._state_store:
+            return set()
+        return (
+            set(partial_migrated_indexes) & self._state_store.get_unfinished_indexes()
+        )
+
+    def _get_reconcile_indexes(
+        self, partial_migrated_indexes: list[str], resumable_indexes: set[str]
+    ) -> set[str]:
+        """
+        Return partially migrated indexes to reconcile, if enabled.
+        """
+        if not self._config.reconcile:
+            return set()
+        return set(partial_migrated_indexes) - resumable_indexes
+
+    def _get_reconcile_slices(self, indexes: list[Index]) -> list[IndexSlice]:
+        """
+        Return slices which create only documents missing on destination.
+
+        Existing documents are rejected as version conflicts without being
+        rewritten, which is much cheaper than a blind re-run.
+        """
+        reconcile_slices = []
+        for es_index in indexes:
+            reconcile_slices.extend(self._split_index(es_index=es_index))
+        for es_slice in reconcile_slices:
+            es_slice.op_type = OP_TYPE_CREATE
+
+        if self._state_store:
+            self._state_store.reset_slices(index_slices=reconcile_slices)
+        return reconcile_slices
+
+    def _resume_slices(
+        self, index_slices: list[IndexSlice], missing_indexes: set[str]
+    ) -> list[IndexSlice]:
+        """
+        Skip finished slices and reattach to tasks still running on destination.
+
+        Slices of indexes missing on destination are transferred again even if
+        recorded as finished.
+        """
+        if not self._state_store:
+            return index_slices
+
+        records = {
+            record.es_slice.name: record for record in self._state_store.get_records()
+        }
+        resumed = []
+        for es_slice in index_slices:
+            record = records.get(es_slice.name)
+            status = self._get_resume_status(record=record) if record else TASK_PENDING
+
+            if status == TASK_DONE and es_slice.index not in missing_indexes:
+                self._state_store.task_finished(es_slice=es_slice, status=TASK_DONE)
+                continue
+            if status == TASK_RUNNING and record and record.task_id:
+                self._resume_tasks[es_slice.name] = record.task_id
+            resumed.append(es_slice)
+
+        logger.info(
+            f"Resumed state: {len(index_slices) - len(resumed)} finished slices skipped, "
+            f"{len(self._resume_tasks)} running tasks reattached"
+        )
+        return resumed
+
+    def _get_resume_status(self, record: TaskRecord) -> str:
+        """
+        Return actual status of recorded slice, checking its task on destination.
+        """
+        if record.status != TASK_RUNNING or not record.task_id:
+            return record.status
+        try:
+            completed = self._reindex_service.is_task_completed(task_id=record.task_id)
+        except Exception as exc:
+            logger.warning(
+                f"Task: {record.task_id} for {record.es_slice.name} is lost, "
+                f"resubmitting: {exc}"
+            )
+            return TASK_FAILED
+        return TASK_DONE if completed else TASK_RUNNING
+
+    def _get_delta_slices(
+        self,
+        source_indexes: list[Index],
+        dest_indexes: list[Index],
+        exclude_indexes: set[str],
+        delta_field: str,
+    ) -> list[IndexSlice]:
+        """
+        Return slices with documents changed since watermark of migrated indexes.
+        """
+        dest_names = {index.name for index in dest_indexes}
+        delta_indexes = [
+            index
+            for index in source_indexes
+            if index.name in dest_names and index.name not in exclude_indexes
+        ]
+        delta_slices = []
+        for es_index in delta_indexes:
+            if es_slice := self._get_delta_slice(
+                es_index=es_index, delta_field=delta_field
+            ):
+                delta_slices.append(es_slice)
+
+        if self._state_store:
+            self._state_store.reset_slices(index_slices=delta_slices)
+        self._delta_slices.update(es_slice.name for es_slice in delta_slices)
+        logger.info(
+            f"Indexes requiring delta migration: "
+            f"{len(delta_slices)}/{len(delta_indexes)}"
+        )
+        return delta_slices
+
+    def _get_delta_slice(self, es_index: Index, delta_field: str) -> IndexSlice | None:
+        """
+        Return slice with documents of index newer than its watermark.
+        """
+        watermark = self._get_watermark(es_index=es_index.name, delta_field=delta_field)
+        if watermark is None:
+            logger.warning(
+                f"Index: {es_index.name} has no watermark of field {delta_field}, "
+                f"skipping delta migration"
+            )
+            return None
+
+        query = get_delta_query(field=delta_field, watermark=watermark)
+        docs_count = self._es_source_client.count_documents(
+            es_index=es_index.name, query=query
+        )
+        if not docs_count:
+            return None
+
+        self._begin_watermarks(indexes={es_index.name}, delta_field=delta_field)
+        logger.info(
+            f"Index: {es_index.name} has {docs_count} documents "
+            f"since {delta_field} watermark {watermark}"
+        )
+        store_size = 0
+        if es_index.docs_count:
+            store_size = es_index.store_size * docs_count // es_index.docs_count
+        return IndexSlice(
+            index=es_index.name,
+            query=query,
+            docs_count=docs_count,
+            store_size=store_size,
+        )
+
+    def _get_watermark(self, es_index: str, delta_field: str) -> float | None:
+        """
+        Return committed watermark of the index or max value on destination.
+
+        Destination max value is used for indexes copied without state file.
+        """
+        if self._state_store:
+            watermark = self._state_store.get_watermark(
+                es_index=es_index, field=delta_field
+            )
+            if watermark is not None:
+                return watermark
+
+        field_range = self._es_dest_client.get_field_range(
+            es_index=es_index, field=delta_field
+        )
+        return field_range[1] if field_range else None
+
+    def _begin_watermarks(self, indexes: set[str], delta_field: str) -> None:
+        """
+        Record source max value of delta field before indexes are transferred.
+        """
+        if not self._state_store:
+            return
+        for es_index in indexes:
+            field_range = self._es_source_client.get_field_range(
+                es_index=es_index, field=delta_field
+            )
+            if field_range:
+                self._state_store.begin_watermark(
+                    es_index=es_index, field=delta_field, value=field_range[1]
+                )
+
+    def _commit_watermarks(self, indexes: set[str]) -> None:
+        """
+        Commit watermarks of indexes with all slices transferred.
+        """
+        if not self._state_store or not self._config.delta_field:
+            return
+        unfinished = self._state_store.get_unfinished_indexes()
+        for es_index in indexes - unfinished:
+            watermark = self._state_store.commit_watermark(es_index=es_index)
+            if watermark is not None:
+                logger.info(
+                    f"Index: {es_index} {self._config.delta_field} watermark: "
+                    f"{watermark}"
+                )
+
+    def _split_index(self, es_index: Index) -> list[IndexSlice]:
+        """
+        Split index by range over slice field if it is large enough.
+
+        Streaming engine without slice field uses point in time slices.
+        """
+        slices, slice_field = self._config.slices, self._config.slice_field
+        if slices <= 1 or es_index.docs_count < self._config.slice_min_docs:
+            return [self._get_whole_index_slice(es_index=es_index)]
+
+        if self._config.engine == ENGINE_STREAM and not slice_field:
+            index_slices = build_pit_slices(es_index=es_index.name, slices=slices)
+        elif slice_field:
+            index_slices = self._split_index_by_range(
+                es_index=es_index, slice_field=slice_field
+            )
+        else:
+            return [self._get_whole_index_slice(es_index=es_index)]
+
+        logger.info(f"Index: {es_index.name} split into {len(index_slices)} slices")
+        # Assume documents are distributed evenly across slices.
+        for es_slice in index_slices:
+            es_slice.docs_count = es_index.docs_count // len(index_slices)
+            es_slice.store_size = es_index.store_size // len(index_slices)
+        return index_slices
+
+    def _split_index_by_range(
+        self, es_index: Index, slice_field: str
+    ) -> list[IndexSlice]:
+        """
+        Split index into range slices over min and max values of slice field.
+        """
+        field_range = self._es_source_client.get_field_range(
+            es_index=es_index.name, field=slice_field
+        )
+        if field_range is None:
+            logger.warning(
+                f"Index: {es_index.name} has no values in field {slice_field}, "
+                f"transferring without slices"
+            )
+            return [IndexSlice(index=es_index.name)]
+
+        min_value, max_value = field_range
+        return build_range_slices(
+            es_index=es_index.name,
+            field=slice_field,
+            min_value=min_value,
+            max_value=max_value,
+            slices=self._config.slices,
+        )
+
+    def _get_source_indexes(self) -> list[Index]:
+        """
+        Retrieve source indexes matching user expressions from the catalog.
+        """
+        return self._catalog.get_source_indexes()
 
     def _get_destination_indexes(self) -> list[Index]:
         """
-        Retrieve destination indexes.
+        Retrieve destination indexes from the catalog.
         """
-        return self._es_dest_client.get_indexes()
+        return self._catalog.get_dest_indexes()
+
+    @staticmethod
+    def _get_whole_index_slice(es_index: Index) -> IndexSlice:
+        """
+        Return single slice covering the whole index.
+        """
+        return IndexSlice(
+            index=es_index.name,
+            docs_count=es_index.docs_count,
+            store_size=es_index.store_size,
+        )
+
+    @staticmethod
+    def _log_schedule_plan(plan: SchedulePlan) -> None:
+        """
+        Log expected makespan of the reindex tasks.
+        """
+        logger.info(
+            f"Scheduled {len(plan.index_slices)} reindex tasks "
+            f"({plan.total_docs} documents, {format_bytes(plan.total_bytes)}) "
+            f"across {plan.workers} worker slots"
+        )
+        logger.info(
+            f"Expected makespan: {plan.makespan_docs} documents, "
+            f"{format_bytes(plan.makespan_bytes)} on the busiest slot "
+            f"({plan.parallel_ratio:.0%} of sequential run)"
+        )
+
+    def _log_run_summary(self, stats: ThroughputStats) -> None:
+        """
+        Log average throughput of the whole run, to compare concurrency settings.
+        """
+        elapsed = max(stats.elapsed, 1e-3)
+        logger.info(
+            f"Migrated {stats.docs} documents ({format_bytes(stats.bytes)}) in "
+            f"{format_duration(stats.elapsed)} with {self._config.concurrent_tasks} "
+            f"concurrent tasks: {stats.docs / elapsed:.0f} docs/s, "
+            f"{format_bytes(stats.bytes / elapsed)}/s, {stats.batches} batches, "
+            f"{stats.version_conflicts} version conflicts, "
+            f"{self._task_retries} task retries"
+        )
 
     @staticmethod
     def _log_migration_status(
@@ -146,27 +1379,127 @@ class ReindexManager:
             source_indexes=source_indexes, dest_indexes=dest_indexes
         )
 
-    @staticmethod
-    def _filter_user_indexes(
-        user_indexes: list[str], source_indexes: list[Index]
-    ) -> list[Index]:
+    def _process_result(
+        self,
+        future: Future,
+        es_slice: IndexSlice,
+        slots: TaskSlots,
+        restore_executor: ThreadPoolExecutor,
+        attempt: int = 0,
+    ) -> None:
+        """
+        Process finished reindex task result and free its slot.
+
+        Failed slice is resubmitted instead, keeping the slot.
+        """
+        exc = future.exception()
+        if exc and (
+            retry_slice := self._get_retry_slice(
+                es_slice=es_slice, exc=exc, attempt=attempt
+            )
+        ):
+            restore_executor.submit(
+                self._resubmit_slice,
+                es_slice=retry_slice,
+                slots=slots,
+                restore_executor=restore_executor,
+                attempt=attempt + 1,
+            )
+            return
+
+        try:
+            if exc:
+                self._log_result(es_slice=es_slice, task_id=None, exc=exc)
+            else:
+                task_id = future.result()
+                self._log_result(es_slice=es_slice, task_id=task_id, exc=None)
+                self._log_reconcile_result(
+                    es_slice=es_slice,
+                    stats=self._reindex_service.get_task_stats(
+                        es_slice=es_slice, task_id=task_id
+                    ),
+                )
+
+            if self._tuner and self._tuner.after_slice(es_slice=es_slice):
+                restore_executor.submit(self._restore_index, es_slice.index)
+        finally:
+            slots.release()
+
+    def _resubmit_slice(
+        self,
+        es_slice: IndexSlice,
+        slots: TaskSlots,
+        restore_executor: ThreadPoolExecutor,
+        attempt: int,
+    ) -> None:
         """
-        Filter source indexes by user provided indexes.
+        Submit failed slice again and process its result in the same slot.
         """
-        return [index for index in source_indexes if index.name in user_indexes]
+        future = self._submit_slice(es_slice=es_slice)
+        future.add_done_callback(
+            partial(
+                self._process_result,
+                es_slice=es_slice,
+                slots=slots,
+                restore_executor=restore_executor,
+                attempt=attempt,
+            )
+        )
+
+    def _get_retry_slice(
+        self, es_slice: IndexSlice, exc: BaseException, attempt: int
+    ) -> IndexSlice | None:
+        """
+        Return failed slice to resubmit, None if task retries are exhausted.
+
+        Documents already copied by the failed task are skipped as version
+        conflicts by op_type `create`, so only the rest is written. Reindex API
+        copies documents in no particular order, so the slice query can not be
+        narrowed by progress of the failed task. Delta slices overwrite existing
+        documents, so they are resubmitted as is.
+        """
+        if attempt >= self._config.task_retries:
+            return None
+        with self._lock:
+            self._task_retries += 1
+        logger.warning(
+            f"Index: {es_slice.name} failed: {exc}. Resubmitting remaining "
+            f"documents, attempt {attempt + 1}/{self._config.task_retries}"
+        )
+        if es_slice.name in self._delta_slices:
+            return es_slice
+        return replace(es_slice, op_type=OP_TYPE_CREATE)
+
+    def _log_result(
+        self, es_slice: IndexSlice, task_id: str | None, exc: BaseException | None
+    ) -> None:
+        """
+        Log and record reindex task result and amount of tasks left.
+        """
+        status = TASK_FAILED if exc else TASK_DONE
+        with self._lock:
+            self._tasks_left -= 1
+            self._tasks_finished[status] += 1
+            tasks_left = self._tasks_left
+
+        if self._state_store:
+            self._state_store.task_finished(es_slice=es_slice, status=status)
+
+        if exc:
+            logger.error(f"Index: {es_slice.name} generated an exception: {exc}")
+        else:
+            logger.info(f"Task id: {task_id}. Reindex completed: {es_slice.name}.")
+            logger.info(f"Tasks left: {tasks_left}")
 
     @staticmethod
-    def _process_result(futures: dict[Future, str]) -> None:
+    def _log_reconcile_result(es_slice: IndexSlice, stats: dict[str, int]) -> None:
         """
-        Process ThreadPoolExecutor tasks result.
+        Log amount of created and already existing documents of reconciled slice.
         """
-        for future in as_completed(futures):
-            index = futures[future]
-            try:
-                task_id = future.result()
-                futures.pop(future, None)
-            except Exception as exc:
-                logger.error(f"Index: {index} generated an exception: {exc}")
-            else:
-                logger.info(f"Task id: {task_id}. Reindex completed: {index}.")
-                logger.info(f"Tasks left: {len(futures)}")
+        if es_slice.op_type != OP_TYPE_CREATE or not stats:
+            return
+        logger.info(
+            f"Index: {es_slice.name} reconciled: {stats['created']} documents "
+            f"created, {stats['version_conflicts']} existing skipped as version "
+            f"conflicts"
+        )
@@ -0,0 +1,280 @@
+"""
+Module with throughput metrics of reindex tasks.
+"""
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from threading import Lock
+
+from elasticsearch_reindex.batching import get_avg_doc_size
+from elasticsearch_reindex.const import DEFAULT_METRICS_WINDOW
+from elasticsearch_reindex.schema import IndexSlice
+from elasticsearch_reindex.utils import format_bytes, format_duration
+
+# Task status counters of processed documents.
+DONE_COUNTERS = ("created", "updated", "deleted", "noops", "version_conflicts")
+
+
+class RollingRate:
+    """
+    Rate of growing documents and bytes counters over the last window.
+    """
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self._samples: deque[tuple[float, int, int]] = deque()
+
+    def add(self, timestamp: float, docs: int, size: int) -> None:
+        """
+        Add sample of counters, keeping one sample older than the window as base.
+        """
+        self._samples.append((timestamp, docs, size))
+        while len(self._samples) > 2 and self._samples[1][0] <= timestamp - self.window:
+            self._samples.popleft()
+
+    def get(self) -> tuple[float, float]:
+        """
+        Return documents and bytes per second.
+        """
+        if len(self._samples) < 2:
+            return 0.0, 0.0
+        (start, start_docs, start_size), (end, docs, size) = (
+            self._samples[0],
+            self._samples[-1],
+        )
+        if end <= start:
+            return 0.0, 0.0
+        return (docs - start_docs) / (end - start), (size - start_size) / (end - start)
+
+
+@dataclass
+class ThroughputStats:
+    """
+    Dataclass for storing throughput of a task, an index or the whole run.
+    """
+
+    docs: int
+    total: int
+    bytes: int
+    batches: int
+    version_conflicts: int
+    throttled_millis: int
+    docs_per_second: float
+    bytes_per_second: float
+    elapsed: float
+
+    @property
+    def eta(self) -> float | None:
+        """
+        Return seconds left at the current rate, None if nothing moves.
+        """
+        if not self.docs_per_second:
+            return None
+        return max(self.total - self.docs, 0) / self.docs_per_second
+
+    def format(self) -> str:
+        """
+        Return short description of rates and ETA.
+        """
+        eta = format_duration(self.eta) if self.eta is not None else "unknown"
+        message = (
+            f"{self.docs_per_second:.0f} docs/s, "
+            f"{format_bytes(self.bytes_per_second)}/s, ETA {eta}"
+        )
+        if self.throttled_millis:
+            message += f", throttled {format_duration(self.throttled_millis / 1000)}"
+        return message
+
+
+@dataclass
+class MetricsScope:
+    """
+    Dataclass for storing counters of a task, an index or the whole run.
+    """
+
+    rate: RollingRate
+    started: float
+    planned: int = 0
+    total: int = 0
+    docs: int = 0
+    bytes: int = 0
+    batches: int = 0
+    version_conflicts: int = 0
+    throttled_millis: int = 0
+
+    def add(self, deltas: dict[str, int], timestamp: float) -> None:
+        for key, delta in deltas.items():
+            setattr(self, key, getattr(self, key) + delta)
+        self.rate.add(timestamp=timestamp, docs=self.docs, size=self.bytes)
+
+    def get_stats(self, timestamp: float) -> ThroughputStats:
+        docs_per_second, bytes_per_second = self.rate.get()
+        return ThroughputStats(
+            docs=self.docs,
+            total=max(self.planned, self.total),
+            bytes=self.bytes,
+            batches=self.batches,
+            version_conflicts=self.version_conflicts,
+            throttled_millis=self.throttled_millis,
+            docs_per_second=docs_per_second,
+            bytes_per_second=bytes_per_second,
+            elapsed=timestamp - self.started,
+        )
+
+
+class ReindexMetrics:
+    """
+    Throughput of reindex tasks, summed up per index and for the whole run.
+
+    Every status of a task is turned into deltas of its counters, which are
+    added to the task, its index and the run. Rates are averaged over a
+    rolling window, ETA is the rest of planned documents at that rate.
+    Bytes are reported by the stream engine, for remote tasks they are
+    estimated by average document size of the index.
+    """
+
+    def __init__(self, window: float = DEFAULT_METRICS_WINDOW) -> None:
+        self.window = window
+        self._tasks: dict[str, MetricsScope] = {}
+        # The highest counters reached by any task of the slice, by slice name.
+        self._slices: dict[str, dict[str, int]] = {}
+        self._indexes: dict[str, MetricsScope] = {}
+        self._run = self._create_scope()
+        self._reported_at = time.monotonic()
+        # Count and total duration of status polls of the destination.
+        self.poll_count = 0
+        self.poll_seconds = 0.0
+        self._lock = Lock()
+
+    def register(self, index_slices: list[IndexSlice]) -> None:
+        """
+        Register planned slices, their documents are the base of ETA.
+        """
+        with self._lock:
+            if not self._run.docs:
+                # Run starts with its first slices, not with the service.
+                self._run = self._create_scope()
+            for es_slice in index_slices:
+                # Slice planned again, e.g. by a delta pass, is a new one.
+                self._slices.pop(es_slice.name, None)
+                self._get_index_scope(
+                    es_index=es_slice.index
+                ).planned += es_slice.docs_count
+                self._run.planned += es_slice.docs_count
+
+    def start_task(self, task_id: str) -> None:
+        """
+        Record start of the task, so its first status already has a rate.
+        """
+        with self._lock:
+            self._tasks[task_id] = self._create_scope()
+
+    def update(
+        self, task_id: str, es_slice: IndexSlice, info: dict[str, int]
+    ) -> ThroughputStats:
+        """
+        Add the last status of the task and return its throughput.
+
+        Retried slice adds to its index and the run only beyond the progress
+        of its previous tasks, so every slice is counted once.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if (task := self._tasks.get(task_id)) is None:
+                task = self._tasks[task_id] = self._create_scope()
+            deltas = self._get_deltas(task=task, es_slice=es_slice, info=info)
+            task.add(deltas=deltas, timestamp=now)
+
+            reached = self._slices.setdefault(es_slice.name, {})
+            slice_deltas = {}
+            for key in deltas:
+                value = getattr(task, key)
+                slice_deltas[key] = max(value - reached.get(key, 0), 0)
+                reached[key] = max(value, reached.get(key, 0))
+            for scope in (self._get_index_scope(es_index=es_slice.index), self._run):
+                scope.add(deltas=slice_deltas, timestamp=now)
+            return task.get_stats(timestamp=now)
+
+    def get_index_stats(self, es_index: str) -> ThroughputStats:
+        """
+        Return throughput of all tasks of the index.
+        """
+        with self._lock:
+            return self._get_index_scope(es_index=es_index).get_stats(
+                timestamp=time.monotonic()
+            )
+
+    def get_run_stats(self) -> ThroughputStats:
+        """
+        Return throughput of all tasks.
+        """
+        with self._lock:
+            return self._run.get_stats(timestamp=time.monotonic())
+
+    def get_indexes_stats(self) -> dict[str, ThroughputStats]:
+        """
+        Return throughput of every registered index.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                es_index: scope.get_stats(timestamp=now)
+                for es_index, scope in self._indexes.items()
+            }
+
+    @contextmanager
+    def time_poll(self) -> Iterator[None]:
+        """
+        Measure duration of a status poll, failed ones included.
+        """
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.poll_count += 1
+                self.poll_seconds += time.monotonic() - started
+
+    def should_report(self, interval: float) -> bool:
+        """
+        Return True at most once per interval.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._reported_at < interval:
+                return False
+            self._reported_at = now
+            return True
+
+    def _create_scope(self) -> MetricsScope:
+        now = time.monotonic()
+        rate = RollingRate(window=self.window)
+        rate.add(timestamp=now, docs=0, size=0)
+        return MetricsScope(rate=rate, started=now)
+
+    def _get_index_scope(self, es_index: str) -> MetricsScope:
+        if (scope := self._indexes.get(es_index)) is None:
+            scope = self._indexes[es_index] = self._create_scope()
+        return scope
+
+    @staticmethod
+    def _get_deltas(
+        task: MetricsScope, es_slice: IndexSlice, info: dict[str, int]
+    ) -> dict[str, int]:
+        """
+        Return growth of counters since the previous status of the task.
+        """
+        docs = sum(info.get(key, 0) for key in DONE_COUNTERS)
+        size = info.get("bytes") or int(docs * get_avg_doc_size(es_slice=es_slice))
+        values = {
+            "total": info.get("total", 0),
+            "docs": docs,
+            "bytes": size,
+            "batches": info.get("batches", 0),
+            "version_conflicts": info.get("version_conflicts", 0),
+            "throttled_millis": info.get("throttled_millis", 0),
+        }
+        return {key: value - getattr(task, key) for key, value in values.items()}
@@ -0,0 +1,131 @@
+"""
+Module with destination nodes to spread reindex tasks across.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from threading import Lock
+from urllib.parse import urlparse
+
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.retry import CircuitBreaker
+
+logger = create_logger()
+
+
+def get_node_url(publish_address: str, scheme: str) -> str:
+    """
+    Return URL of node HTTP publish address, e.g. `host/10.0.0.1:9200`.
+
+    Host name is preferred over IP address, so TLS certificates match.
+    """
+    host, _, address = publish_address.rpartition("/")
+    if host:
+        port = address.rsplit(":", 1)[1]
+        address = f"{host}:{port}"
+    return f"{scheme}://{address}"
+
+
+def get_task_node_id(task_id: str) -> str:
+    """
+    Return ID of the node owning the task, task ID is `<node_id>:<number>`.
+    """
+    return task_id.rsplit(":", 1)[0]
+
+
+def is_data_node(roles: list[str]) -> bool:
+    return any(role == "data" or role.startswith("data_") for role in roles)
+
+
+@dataclass
+class DestNode:
+    """
+    Dataclass for storing destination node with health of its requests.
+    """
+
+    node_id: str
+    url: str
+    breaker: CircuitBreaker
+
+    @property
+    def healthy(self) -> bool:
+        return not self.breaker.retry_after
+
+
+class NodePool:
+    """
+    Destination data nodes, each task is coordinated by the node it is sent to.
+
+    New task goes to the healthy node coordinating the fewest running tasks,
+    ties are broken round-robin. Tasks are polled on the node which owns them,
+    known from the node ID prefix of task ID. A failed request suspends the
+    node for a while. Without healthy nodes requests go to the default host.
+    """
+
+    def __init__(self, default_host: str, nodes: list[DestNode]) -> None:
+        self.default_host = default_host
+        self.nodes = nodes
+        self._by_id = {node.node_id: node for node in nodes}
+        self._cursor = 0
+        self._lock = Lock()
+
+    @classmethod
+    def from_nodes_info(
+        cls, default_host: str, json_data: dict, reset_timeout: float
+    ) -> "NodePool":
+        """
+        Initialize pool from response of Nodes API with HTTP info.
+
+        Nodes without HTTP or data roles are skipped, all nodes are used
+        if none has roles, e.g. on clusters with a single node type.
+        """
+        scheme = urlparse(default_host).scheme or "http"
+        http_nodes = {
+            node_id: info
+            for node_id, info in json_data.get("nodes", {}).items()
+            if info.get("http", {}).get("publish_address")
+        }
+        data_nodes = {
+            node_id: info
+            for node_id, info in http_nodes.items()
+            if is_data_node(roles=info.get("roles", []))
+        }
+        nodes = []
+        for node_id, info in sorted((data_nodes or http_nodes).items()):
+            url = get_node_url(
+                publish_address=info["http"]["publish_address"], scheme=scheme
+            )
+            breaker = CircuitBreaker(
+                host=url, failure_threshold=1, reset_timeout=reset_timeout
+            )
+            nodes.append(DestNode(node_id=node_id, url=url, breaker=breaker))
+        return cls(default_host=default_host, nodes=nodes)
+
+    def choose(self, running_tasks: list[str]) -> DestNode | None:
+        """
+        Return healthy node for a new task, None if there is no such node.
+        """
+        load = Counter(get_task_node_id(task_id=task_id) for task_id in running_tasks)
+        with self._lock:
+            self._cursor += 1
+            candidates = [
+                (load[node.node_id], (position - self._cursor) % len(self.nodes), node)
+                for position, node in enumerate(self.nodes)
+                if node.healthy
+            ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda candidate: candidate[:2])[2]
+
+    def get_task_node(self, task_id: str) -> DestNode | None:
+        """
+        Return healthy node owning the task, if known.
+        """
+        node = self._by_id.get(get_task_node_id(task_id=task_id))
+        return node if node and node.healthy else None
+
+    def get_poll_node(self) -> DestNode | None:
+        """
+        Return next healthy node for listing tasks of the whole cluster.
+        """
+        return self.choose(running_tasks=[])
@@ -0,0 +1,204 @@
+"""
+Module with dry run plan of migration and estimate of its duration.
+"""
+
+import json
+import time
+from dataclasses import asdict, dataclass, field, replace
+
+from elasticsearch_reindex.batching import get_avg_doc_size
+from elasticsearch_reindex.client import ElasticsearchClient
+from elasticsearch_reindex.const import BENCHMARK_INDEX_PREFIX
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.metrics import DONE_COUNTERS
+from elasticsearch_reindex.reindex import ReindexService
+from elasticsearch_reindex.scheduler import SchedulePlan, get_slice_weight
+from elasticsearch_reindex.schema import Config, IndexSlice
+from elasticsearch_reindex.utils import format_bytes, format_duration
+
+logger = create_logger()
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Dataclass for storing rate of a single task transferring a sample.
+    """
+
+    index: str
+    docs: int
+    bytes: int
+    seconds: float
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.docs / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class IndexPlan:
+    """
+    Dataclass for storing planned transfer of a single index.
+    """
+
+    index: str
+    # One of `full`, `resume`, `reconcile`, `delta` or `data_stream`.
+    action: str
+    docs: int
+    bytes: int
+    slices: int
+
+
+@dataclass
+class MigrationPlan:
+    """
+    Dataclass for storing plan of a run, reviewed before the migration.
+    """
+
+    source_host: str
+    dest_host: str
+    engine: str
+    scheduling: str
+    workers: int
+    indexes: list[IndexPlan]
+    # Slice names in submission order.
+    order: list[str]
+    total_docs: int
+    total_bytes: int
+    makespan_docs: int
+    makespan_bytes: int
+    benchmark: BenchmarkResult | None = None
+    reattached_tasks: list[str] = field(default_factory=list)
+
+    @property
+    def estimated_seconds(self) -> float | None:
+        """
+        Return duration of the busiest slot at the benchmarked rate, if measured.
+
+        Rate of a single task is assumed to hold for all concurrent tasks, so
+        the estimate is optimistic when destination is already saturated.
+        """
+        if self.benchmark is None:
+            return None
+        if self.makespan_bytes and self.benchmark.bytes_per_second:
+            return self.makespan_bytes / self.benchmark.bytes_per_second
+        if self.benchmark.docs_per_second:
+            return self.makespan_docs / self.benchmark.docs_per_second
+        return None
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        if self.benchmark is not None:
+            data["benchmark"].update(
+                docs_per_second=self.benchmark.docs_per_second,
+                bytes_per_second=self.benchmark.bytes_per_second,
+            )
+        data["estimated_seconds"] = self.estimated_seconds
+        return data
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+
+def build_plan(
+    config: Config,
+    plan: SchedulePlan,
+    actions: dict[str, str],
+    reattached_tasks: list[str],
+) -> MigrationPlan:
+    """
+    Return migration plan of scheduled slices, indexes in submission order.
+
+    Actions are keyed by slice name.
+    """
+    indexes: dict[str, IndexPlan] = {}
+    for es_slice in plan.index_slices:
+        if (index_plan := indexes.get(es_slice.index)) is None:
+            index_plan = indexes[es_slice.index] = IndexPlan(
+                index=es_slice.index,
+                action=actions[es_slice.name],
+                docs=0,
+                bytes=0,
+                slices=0,
+            )
+        index_plan.docs += es_slice.docs_count
+        index_plan.bytes += es_slice.store_size
+        index_plan.slices += 1
+
+    return MigrationPlan(
+        source_host=config.source_host,
+        dest_host=config.dest_host,
+        engine=config.engine,
+        scheduling=config.scheduling,
+        workers=plan.workers,
+        indexes=list(indexes.values()),
+        order=[es_slice.name for es_slice in plan.index_slices],
+        total_docs=plan.total_docs,
+        total_bytes=plan.total_bytes,
+        makespan_docs=plan.makespan_docs,
+        makespan_bytes=plan.makespan_bytes,
+        reattached_tasks=reattached_tasks,
+    )
+
+
+class ReindexBenchmark:
+    """
+    Measure rate of a single task by transferring a sample into a scratch index.
+
+    The heaviest slice is sampled with the configured engine, so the rate
+    reflects its documents, batch size and destination. The scratch index
+    is deleted afterwards.
+    """
+
+    def __init__(
+        self,
+        reindex_service: ReindexService,
+        dest_client: ElasticsearchClient,
+        sample_docs: int,
+    ) -> None:
+        self.reindex_service = reindex_service
+        self.dest_client = dest_client
+        self.sample_docs = sample_docs
+
+    def run(self, index_slices: list[IndexSlice]) -> BenchmarkResult:
+        """
+        Transfer sample of the heaviest slice and return its rate.
+        """
+        es_slice = max(index_slices, key=get_slice_weight)
+        scratch_index = f"{BENCHMARK_INDEX_PREFIX}{es_slice.index}"
+        sample = replace(
+            es_slice, dest_index=scratch_index, max_docs=self.sample_docs, op_type=None
+        )
+        logger.info(
+            f"Benchmark: transferring {self.sample_docs} documents of "
+            f"{es_slice.name} into {scratch_index}"
+        )
+        # Scratch index may be left by a killed dry run.
+        self.dest_client.delete_index(es_index=scratch_index)
+        try:
+            started = time.monotonic()
+            task_id = self.reindex_service.transfer_slice(es_slice=sample)
+            seconds = time.monotonic() - started
+            info = self.reindex_service.get_task_stats(es_slice=sample, task_id=task_id)
+        finally:
+            self.dest_client.delete_index(es_index=scratch_index)
+
+        docs = sum(info.get(key, 0) for key in DONE_COUNTERS)
+        result = BenchmarkResult(
+            index=es_slice.index,
+            docs=docs,
+            bytes=info.get("bytes") or int(docs * get_avg_doc_size(es_slice=es_slice)),
+            seconds=(
+                info["running_millis"] / 1000 if "running_millis" in info else seconds
+            ),
+        )
+        logger.info(
+            f"Benchmark: {result.docs} documents in {format_duration(result.seconds)}, "
+            f"{result.docs_per_second:.0f} docs/s, "
+            f"{format_bytes(result.bytes_per_second)}/s per task"
+        )
+        return result
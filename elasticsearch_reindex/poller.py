@@ -0,0 +1,194 @@
+"""
+Module with single poller of Elasticsearch reindex tasks statuses.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
+
+from elasticsearch_reindex.const import DEFAULT_MAX_CHECK_ERRORS
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.schema import IndexSlice
+
+logger = create_logger()
+
+# Return statuses of all running reindex tasks by task id.
+ListTasks = Callable[[], dict[str, dict[str, int]]]
+# Return completion flag and status of a single task.
+GetTask = Callable[[str], tuple[bool, dict[str, int]]]
+# Receive progress of a single task.
+OnProgress = Callable[[str, IndexSlice, dict[str, int]], None]
+
+
+@dataclass
+class TrackedTask:
+    """
+    Dataclass for storing reindex task waiting for completion.
+    """
+
+    task_id: str
+    es_slice: IndexSlice
+    future: Future = field(default_factory=Future)
+    # Consecutive polls which could not get the task status.
+    check_errors: int = 0
+
+
+class TaskPoller:
+    """
+    Poll all tracked reindex tasks with one Tasks API request per interval.
+
+    Running tasks are taken from the list of reindex tasks. Tasks missing in
+    the list are finished, so their result is fetched one by one and the
+    waiting future is resolved with the task id.
+
+    Retryable errors of status requests do not fail tasks, which keep running
+    on the destination, until they repeat for `max_check_errors` polls.
+    Unexpected errors fail only the task they belong to, errors of progress
+    callback are logged, so the polling thread keeps running.
+    """
+
+    def __init__(
+        self,
+        list_tasks: ListTasks,
+        get_task: GetTask,
+        check_interval: int,
+        on_progress: OnProgress | None = None,
+        retryable: tuple[type[BaseException], ...] = (),
+        max_check_errors: int = DEFAULT_MAX_CHECK_ERRORS,
+    ) -> None:
+        self._list_tasks = list_tasks
+        self._get_task = get_task
+        self._on_progress = on_progress
+        self._retryable = retryable
+        self.check_interval = check_interval
+        self.max_check_errors = max_check_errors
+
+        self._tasks: dict[str, TrackedTask] = {}
+        self._lock = Lock()
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    @property
+    def tracked_tasks(self) -> list[str]:
+        """
+        Return IDs of tasks waiting for completion.
+        """
+        with self._lock:
+            return list(self._tasks)
+
+    def track(self, task_id: str, es_slice: IndexSlice) -> Future:
+        """
+        Start tracking the task and return future resolved on its completion.
+        """
+        task = TrackedTask(task_id=task_id, es_slice=es_slice)
+        with self._lock:
+            self._tasks[task_id] = task
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = Thread(
+                    target=self._run, name="reindex-task-poller", daemon=True
+                )
+                self._thread.start()
+        return task.future
+
+    def stop(self) -> None:
+        """
+        Stop polling thread.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> None:
+        """
+        Check statuses of all tracked tasks once.
+        """
+        with self._lock:
+            tasks = list(self._tasks.values())
+        if not tasks:
+            return
+
+        try:
+            running = self._list_tasks()
+        except self._retryable as exc:
+            # Destination is unavailable, so are statuses of single tasks.
+            self._on_check_error(tasks=tasks, exc=exc)
+            return
+        except Exception as exc:
+            # Fall back to checking every task separately.
+            logger.error(f"Can not list reindex tasks: {exc}")
+            running = {}
+
+        for task in tasks:
+            try:
+                if info := running.get(task.task_id):
+                    task.check_errors = 0
+                    self._report_progress(task=task, info=info)
+                else:
+                    self._check_task(task=task)
+            except Exception as exc:
+                logger.error(f"Can not check status of task {task.task_id}: {exc}")
+                self._fail(task=task, exc=exc)
+
+    def _run(self) -> None:
+        """
+        Poll tracked tasks until stopped.
+        """
+        while not self._stopped.wait(self.check_interval):
+            try:
+                self.poll()
+            except Exception as exc:
+                logger.error(f"Can not poll reindex tasks: {exc}")
+
+    def _check_task(self, task: TrackedTask) -> None:
+        """
+        Fetch status of the task which is not running anymore.
+        """
+        try:
+            completed, info = self._get_task(task.task_id)
+        except self._retryable as exc:
+            self._on_check_error(tasks=[task], exc=exc)
+            return
+        except Exception as exc:
+            self._fail(task=task, exc=exc)
+            return
+
+        task.check_errors = 0
+        self._report_progress(task=task, info=info)
+        if completed:
+            logger.info(f"Task finished: {task.task_id}")
+            self._untrack(task=task)
+            if not task.future.done():
+                task.future.set_result(task.task_id)
+
+    def _on_check_error(self, tasks: list[TrackedTask], exc: BaseException) -> None:
+        """
+        Keep tracking tasks with unknown status, fail them if it lasts too long.
+        """
+        logger.warning(f"Can not check status of {len(tasks)} reindex tasks: {exc}")
+        for task in tasks:
+            task.check_errors += 1
+            if task.check_errors >= self.max_check_errors:
+                self._fail(task=task, exc=exc)
+
+    def _fail(self, task: TrackedTask, exc: BaseException) -> None:
+        """
+        Stop tracking the task and fail its future, unless already resolved.
+        """
+        self._untrack(task=task)
+        if not task.future.done():
+            task.future.set_exception(exc)
+
+    def _report_progress(self, task: TrackedTask, info: dict[str, int]) -> None:
+        if not self._on_progress:
+            return
+        try:
+            self._on_progress(task.task_id, task.es_slice, info)
+        except Exception as exc:
+            logger.error(f"Can not report progress of task {task.task_id}: {exc}")
+
+    def _untrack(self, task: TrackedTask) -> None:
+        with self._lock:
+            self._tasks.pop(task.task_id, None)
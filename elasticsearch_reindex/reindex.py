@@ -1,17 +1,51 @@
-from time import sleep
+import asyncio
+import gzip
+import json
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from itertools import count
+from threading import Lock
+from typing import Any
+from uuid import uuid4
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from elasticsearch_reindex.batching import BatchSizeController
 from elasticsearch_reindex.const import (
+    DEFAULT_BREAKER_RESET_TIMEOUT,
+    DEFAULT_MAX_CHECK_ERRORS,
+    DEFAULT_NODE_PROBE_TIMEOUT,
+    ES_CHECK_NODE_ENDPOINT,
     ES_CHECK_REINDEX_TASK_ENDPOINT,
     ES_CREATE_REINDEX_TASK_ENDPOINT,
+    ES_LIST_REINDEX_TASKS_ENDPOINT,
+    ES_NODES_HTTP_ENDPOINT,
+    ES_OPAQUE_ID_HEADER,
+    ES_RETHROTTLE_REINDEX_TASK_ENDPOINT,
+    ES_TASK_NOT_FOUND_ERROR_TYPES,
+    ES_TRANSIENT_ERROR_TYPES,
+    ES_TRANSIENT_STATUSES,
 )
 from elasticsearch_reindex.errors import (
+    ES_TASK_CREATE_ERROR,
+    ES_TASK_FAILED_ERROR,
     ES_TASK_ID_ERROR,
+    ES_TRANSIENT_ERROR,
     ElasticSearchInvalidTaskIDException,
+    ElasticSearchTaskException,
+    ElasticSearchTransientException,
 )
 from elasticsearch_reindex.logger import create_logger
-from elasticsearch_reindex.schema import Config
+from elasticsearch_reindex.metrics import ReindexMetrics, ThroughputStats
+from elasticsearch_reindex.nodes import DestNode, NodePool
+from elasticsearch_reindex.poller import TaskPoller
+from elasticsearch_reindex.retry import CircuitBreaker, Retryable, RetryPolicy
+from elasticsearch_reindex.schema import Config, IndexSlice
+from elasticsearch_reindex.state import StateStore
+from elasticsearch_reindex.tracing import Tracer
 
 logger = create_logger()
 
@@ -23,12 +57,42 @@ class ReindexService:
 
     # Default Headers for call ElasticSearch API.
     headers = {"Content-Type": "application/json"}
-
-    # Sleep interval before start checking ElasticSearch tasks statuses.
-    initial_sleep_interval = 2
-
-    def __init__(self, config: Config):
+    # Errors of requests worth retrying. Task creation is retried only after
+    # looking up the task the failed request may have created.
+    retryable_errors: Retryable = (
+        requests.ConnectionError,
+        requests.Timeout,
+        ElasticSearchTransientException,
+    )
+    # Polls in a row with unknown task status before the task is failed.
+    max_check_errors = DEFAULT_MAX_CHECK_ERRORS
+
+    def __init__(self, config: Config, state_store: StateStore | None = None):
         self.config = config
+        self.state_store = state_store
+        self.dest_breaker = CircuitBreaker(host=config.dest_host)
+        self._retry = RetryPolicy(
+            breaker=self.dest_breaker, retries=config.request_retries
+        )
+        # Last status of every task grouped by index.
+        self._progress: dict[str, dict[str, dict[str, int]]] = {}
+        self._progress_lock = Lock()
+        self.metrics = ReindexMetrics()
+        self._poller: TaskPoller | None = None
+        self._poller_lock = Lock()
+        self._http_session: requests.Session | None = None
+        self._http_session_lock = Lock()
+        # Throttle of new tasks, changed by adaptive throttling.
+        self.requests_per_second = config.requests_per_second
+        # Cap of the throttle while source is stressed, set by source guard.
+        self.source_requests_per_second: float | None = None
+        # Sizes batches of new tasks, if adaptive batch size is enabled.
+        self.batch_controller: BatchSizeController | None = None
+        # Destination nodes tasks are spread across, discovered on first use.
+        self._dest_nodes: NodePool | None = None
+        self._dest_nodes_lock = Lock()
+        # Records spans of tasks and polls, if tracing is enabled.
+        self.tracer = Tracer()
 
     @property
     def http_auth(self) -> tuple[str, str] | None:
@@ -41,74 +105,564 @@ class ReindexService:
             else None
         )
 
-    def transfer_index(self, es_index: str, check_interval: int = 10) -> str:
+    @property
+    def breakers(self) -> dict[str, CircuitBreaker]:
+        """
+        Return circuit breakers of clusters by their role.
+        """
+        return {"dest": self.dest_breaker}
+
+    @property
+    def http_session(self) -> requests.Session:
+        """
+        Return keep-alive HTTP session shared by all requests to destination.
+
+        Connections pool is sized to the amount of concurrent tasks, so polls and
+        task creation reuse TCP (and TLS) connections instead of opening new ones.
+        """
+        with self._http_session_lock:
+            if self._http_session is None:
+                self._http_session = self._create_http_session(http_auth=self.http_auth)
+            return self._http_session
+
+    @property
+    def poller(self) -> TaskPoller:
+        """
+        Return poller of reindex tasks, created on first use.
+        """
+        with self._poller_lock:
+            if self._poller is None:
+                self._poller = TaskPoller(
+                    list_tasks=self._poll_reindex_tasks,
+                    get_task=self._poll_task,
+                    check_interval=self.config.check_interval,
+                    on_progress=self._on_task_progress,
+                    retryable=self.retryable_errors,
+                    max_check_errors=self.max_check_errors,
+                )
+            return self._poller
+
+    @property
+    def dest_nodes(self) -> NodePool | None:
+        """
+        Return destination nodes to spread tasks across, if enabled.
+        """
+        if not self.config.spread_dest_nodes:
+            return None
+        with self._dest_nodes_lock:
+            if self._dest_nodes is None:
+                self._dest_nodes = self._discover_dest_nodes()
+            return self._dest_nodes
+
+    @property
+    def pool_size(self) -> int:
+        """
+        Return size of HTTP connections pool.
+        """
+        return max(self.config.concurrent_tasks, 1)
+
+    @property
+    def body_headers(self) -> dict[str, str]:
+        """
+        Return headers for requests with body.
+        """
+        if self.config.http_compress:
+            return {**self.headers, "Content-Encoding": "gzip"}
+        return self.headers
+
+    @property
+    def running_tasks(self) -> list[str]:
+        """
+        Return IDs of reindex tasks waiting for completion.
+        """
+        if self._poller is None:
+            return []
+        return self._poller.tracked_tasks
+
+    @property
+    def effective_requests_per_second(self) -> float | None:
+        """
+        Return throttle of tasks, the lower of destination and source ones.
+        """
+        limits = [
+            requests_per_second
+            for requests_per_second in (
+                self.requests_per_second,
+                self.source_requests_per_second,
+            )
+            if requests_per_second is not None
+        ]
+        return min(limits) if limits else None
+
+    @property
+    def task_params(self) -> dict[str, float]:
+        """
+        Return URL params for reindex task creation.
+        """
+        if (requests_per_second := self.effective_requests_per_second) is None:
+            return {}
+        return {"requests_per_second": requests_per_second}
+
+    def transfer_index(self, es_index: str, check_interval: int | None = None) -> str:
         """
         Create reindex task and wait for it to finish.
 
         Args:
             es_index (str): Elasticsearch index to reindex.
-            check_interval (int): Interval between task status checks in seconds. Defaults to 10.
+            check_interval (int | None): Interval between task status checks in
+                seconds. Defaults to the config one. All tasks share one poller,
+                so the interval applies to every tracked task.
 
         Returns:
             str: The ID of the completed reindex task.
         """
-        task_id = self._create_reindex_task(es_index=es_index)
-        logger.info(f"Reindex task: {task_id}")
+        if check_interval is not None:
+            self.poller.check_interval = check_interval
+        return self.transfer_slice(es_slice=IndexSlice(index=es_index))
 
-        # Wait for Elasticsearch manage input task.
-        sleep(self.initial_sleep_interval)
+    def transfer_slice(self, es_slice: IndexSlice) -> str:
+        """
+        Create reindex task for part of index and wait for it to finish.
 
-        return self._wait_for_task_completion(
-            task_id=task_id, check_interval=check_interval
-        )
+        Args:
+            es_slice (IndexSlice): Part of Elasticsearch index to reindex.
 
-    def _create_reindex_task(self, es_index: str) -> str:
+        Returns:
+            str: The ID of the completed reindex task.
         """
-        Create reindex task via Elasticsearch API.
+        return self.submit_slice(es_slice=es_slice).result()
+
+    def submit_slice(self, es_slice: IndexSlice) -> Future:
         """
-        response = requests.post(
-            url=ES_CREATE_REINDEX_TASK_ENDPOINT.format(es_host=self.config.dest_host),
-            json=self._get_reindex_body(es_index=es_index),
-            headers=self.headers,
-            auth=self.http_auth,
-            timeout=self.config.request_timeout,
+        Create reindex task for part of index without waiting for it.
+
+        Args:
+            es_slice (IndexSlice): Part of Elasticsearch index to reindex.
+
+        Returns:
+            Future: Resolved with the task ID when the task is completed.
+        """
+        task_id = self._create_reindex_task(es_slice=es_slice)
+        logger.info(f"Reindex task: {task_id} for {es_slice.name}")
+        self._record_submitted(es_slice=es_slice, task_id=task_id)
+        future = self.poller.track(task_id=task_id, es_slice=es_slice)
+        self._trace_task(future=future, es_slice=es_slice, task_id=task_id)
+        return future
+
+    def attach_slice(self, es_slice: IndexSlice, task_id: str) -> Future:
+        """
+        Track already running reindex task, e.g. created by a killed run.
+
+        Args:
+            es_slice (IndexSlice): Part of Elasticsearch index transferred by the task.
+            task_id (str): The ID of the running reindex task.
+
+        Returns:
+            Future: Resolved with the task ID when the task is completed.
+        """
+        logger.info(f"Reattached to reindex task: {task_id} for {es_slice.name}")
+        future = self.poller.track(task_id=task_id, es_slice=es_slice)
+        self._trace_task(future=future, es_slice=es_slice, task_id=task_id)
+        return future
+
+    def is_task_completed(self, task_id: str) -> bool:
+        """
+        Check if the reindex task is completed.
+
+        Raises:
+            Exception: If the task can not be found on the destination.
+        """
+        completed, _ = self._retry.call(
+            func=partial(self._check_task_completed, task_id=task_id),
+            retryable=self.retryable_errors,
         )
-        return response.json()["task"]
+        return completed
+
+    def get_task_stats(self, es_slice: IndexSlice, task_id: str) -> dict[str, int]:
+        """
+        Return the last documents counters reported for the task.
+        """
+        with self._progress_lock:
+            return dict(self._progress.get(es_slice.index, {}).get(task_id, {}))
+
+    def close(self) -> None:
+        """
+        Stop polling of reindex tasks and close HTTP connections.
+        """
+        if self._poller is not None:
+            self._poller.stop()
+        with self._http_session_lock:
+            if self._http_session is not None:
+                self._http_session.close()
+                self._http_session = None
+
+    def _create_reindex_task(self, es_slice: IndexSlice) -> str:
+        """
+        Create reindex task via Elasticsearch API, retrying transient failures.
+        """
+        with self.tracer.span(name="submit", category="task", slice=es_slice.name):
+            return self._retry.call(
+                func=partial(
+                    self._submit_reindex_task,
+                    es_slice=es_slice,
+                    opaque_id=uuid4().hex,
+                    attempts=count(),
+                ),
+                retryable=self.retryable_errors,
+            )
+
+    def _submit_reindex_task(
+        self, es_slice: IndexSlice, opaque_id: str, attempts: Iterator[int]
+    ) -> str:
+        """
+        Create the task, unless a failed attempt has already created it.
+
+        Timed out request may still create the task, so retries look it up by
+        its opaque ID first. A task finished in the meantime is not listed
+        and its slice is transferred again.
+        """
+        if next(attempts) and (task_id := self._find_reindex_task(opaque_id=opaque_id)):
+            logger.info(
+                f"Reindex task: {task_id} for {es_slice.name} found after failed request"
+            )
+            return task_id
+        return self._post_reindex_task(es_slice=es_slice, opaque_id=opaque_id)
+
+    def _post_reindex_task(self, es_slice: IndexSlice, opaque_id: str) -> str:
+        """
+        Make single request to Elasticsearch Reindex API.
+        """
+        with self._node_request(node=self._choose_dest_node()) as es_host:
+            response = self.http_session.post(
+                url=ES_CREATE_REINDEX_TASK_ENDPOINT.format(es_host=es_host),
+                data=self._encode_body(body=self._get_reindex_body(es_slice=es_slice)),
+                headers={**self.body_headers, ES_OPAQUE_ID_HEADER: opaque_id},
+                params=self.task_params,
+                timeout=self.config.request_timeout,
+            )
+            self._check_transient_status(
+                status=response.status_code, error=response.text, host=es_host
+            )
+        return self._parse_create_response(json_data=response.json(), es_slice=es_slice)
+
+    def rethrottle_task(self, task_id: str, requests_per_second: float) -> None:
+        """
+        Change throttle of the running reindex task.
+        """
+        with self._node_request(node=self._get_task_node(task_id=task_id)) as es_host:
+            response = self.http_session.post(
+                url=ES_RETHROTTLE_REINDEX_TASK_ENDPOINT.format(
+                    es_host=es_host, task_id=task_id
+                ),
+                params={"requests_per_second": requests_per_second},
+                timeout=self.config.request_timeout,
+            )
+        response.raise_for_status()
+
+    def rethrottle_running_tasks(self) -> None:
+        """
+        Apply the current throttle to all running tasks, -1 lifts it.
+        """
+        requests_per_second = self.effective_requests_per_second
+        for task_id in self.running_tasks:
+            try:
+                self.rethrottle_task(
+                    task_id=task_id,
+                    requests_per_second=(
+                        requests_per_second if requests_per_second is not None else -1
+                    ),
+                )
+            except Exception as exc:
+                logger.error(f"Can not rethrottle task {task_id}: {exc}")
 
     def _check_task_completed(self, task_id: str) -> tuple[bool, dict[str, int]]:
         """
         Make request to Elasticsearch Tasks API and check task status.
         """
-        endpoint = ES_CHECK_REINDEX_TASK_ENDPOINT.format(
-            es_host=self.config.dest_host, task_id=task_id
+        with self._node_request(node=self._get_task_node(task_id=task_id)) as es_host:
+            response = self.http_session.get(
+                url=ES_CHECK_REINDEX_TASK_ENDPOINT.format(
+                    es_host=es_host, task_id=task_id
+                ),
+                timeout=self.config.request_timeout,
+            )
+            self._check_transient_status(
+                status=response.status_code, error=response.text, host=es_host
+            )
+        return self._parse_task_response(json_data=response.json(), task_id=task_id)
+
+    def _list_reindex_tasks(self) -> dict[str, dict[str, int]]:
+        """
+        Make single request to Elasticsearch Tasks API for all running reindex tasks.
+        """
+        return self._parse_tasks_list(json_data=self._get_tasks_list())
+
+    def _find_reindex_task(self, opaque_id: str) -> str | None:
+        """
+        Return ID of running reindex task created with the opaque ID.
+        """
+        return self._get_task_by_opaque_id(
+            json_data=self._get_tasks_list(), opaque_id=opaque_id
         )
-        response = requests.get(url=endpoint, auth=self.http_auth, timeout=60)
 
-        json_data = response.json()
+    def _get_tasks_list(self) -> dict:
+        """
+        Return Tasks API list of running reindex tasks.
+        """
+        with self._node_request(node=self._get_poll_node()) as es_host:
+            response = self.http_session.get(
+                url=ES_LIST_REINDEX_TASKS_ENDPOINT.format(es_host=es_host),
+                timeout=self.config.request_timeout,
+            )
+            self._check_transient_status(
+                status=response.status_code, error=response.text, host=es_host
+            )
+        response.raise_for_status()
+        return response.json()
+
+    def _poll_reindex_tasks(self) -> dict[str, dict[str, int]]:
+        """
+        List running reindex tasks through circuit breaker of destination.
+
+        Polls are repeated every check interval anyway, so they are not retried.
+        """
+        with (
+            self.metrics.time_poll(),
+            self.tracer.span(name="poll", category="poll") as span,
+        ):
+            running = self.dest_breaker.call(
+                func=self._list_reindex_tasks, retryable=self.retryable_errors
+            )
+            span["running"] = len(running)
+            return running
+
+    def _poll_task(self, task_id: str) -> tuple[bool, dict[str, int]]:
+        """
+        Check task status through circuit breaker of destination.
+        """
+        with (
+            self.metrics.time_poll(),
+            self.tracer.span(name="check_task", category="poll", task=task_id),
+        ):
+            return self.dest_breaker.call(
+                func=partial(self._check_task_completed, task_id=task_id),
+                retryable=self.retryable_errors,
+            )
+
+    def _choose_dest_node(self) -> DestNode | None:
+        """
+        Return node for a new task, None to send it to destination host.
+        """
+        if self.dest_nodes is None:
+            return None
+        return self.dest_nodes.choose(running_tasks=self.running_tasks)
+
+    def _get_task_node(self, task_id: str) -> DestNode | None:
+        if self.dest_nodes is None:
+            return None
+        return self.dest_nodes.get_task_node(task_id=task_id)
+
+    def _get_poll_node(self) -> DestNode | None:
+        if self.dest_nodes is None:
+            return None
+        return self.dest_nodes.get_poll_node()
+
+    @contextmanager
+    def _node_request(self, node: DestNode | None) -> Iterator[str]:
+        """
+        Yield host of the node for a request, suspending the node if it fails.
+        """
+        if node is None:
+            yield self.config.dest_host
+            return
+        try:
+            yield node.url
+        except self.retryable_errors:
+            node.breaker.record_failure()
+            raise
+        node.breaker.record_success()
+
+    def _discover_dest_nodes(self) -> NodePool:
+        """
+        Return reachable destination data nodes by their HTTP publish addresses.
+
+        Publish addresses may be unreachable from outside of the cluster,
+        e.g. behind a load balancer, then all requests go to destination host.
+        """
+        try:
+            response = self.http_session.get(
+                url=ES_NODES_HTTP_ENDPOINT.format(es_host=self.config.dest_host),
+                timeout=self.config.request_timeout,
+            )
+            response.raise_for_status()
+            pool = NodePool.from_nodes_info(
+                default_host=self.config.dest_host,
+                json_data=response.json(),
+                reset_timeout=DEFAULT_BREAKER_RESET_TIMEOUT,
+            )
+        except (requests.RequestException, ValueError) as exc:
+            logger.warning(f"Destination nodes discovery failed: {exc}")
+            return NodePool(default_host=self.config.dest_host, nodes=[])
+
+        # Keep a pool per node and destination host, so switching does not evict.
+        self._mount_http_adapter(session=self.http_session, hosts=len(pool.nodes) + 1)
+        with ThreadPoolExecutor(max_workers=max(len(pool.nodes), 1)) as executor:
+            reachable = list(executor.map(self._is_node_reachable, pool.nodes))
+        nodes = [node for node, ok in zip(pool.nodes, reachable) if ok]
+        if nodes:
+            logger.info(
+                f"Spreading tasks across {len(nodes)} destination nodes: "
+                f"{', '.join(node.url for node in nodes)}"
+            )
+        else:
+            logger.warning(
+                f"Destination nodes are not reachable by publish addresses, "
+                f"tasks are sent to {self.config.dest_host}"
+            )
+        return NodePool(default_host=self.config.dest_host, nodes=nodes)
+
+    def _is_node_reachable(self, node: DestNode) -> bool:
+        try:
+            response = self.http_session.get(
+                url=ES_CHECK_NODE_ENDPOINT.format(es_host=node.url),
+                timeout=DEFAULT_NODE_PROBE_TIMEOUT,
+            )
+        except requests.RequestException:
+            return False
+        return response.ok
+
+    def _check_transient_status(
+        self, status: int, error: str, host: str | None = None
+    ) -> None:
+        """
+        Raise retryable exception if cluster, destination by default, is
+        overloaded or restarting.
+        """
+        if status in ES_TRANSIENT_STATUSES:
+            raise ElasticSearchTransientException(
+                ES_TRANSIENT_ERROR.format(
+                    host=host or self.config.dest_host, error=f"{status} {error[:200]}"
+                )
+            )
+
+    def _parse_create_response(self, json_data: dict, es_slice: IndexSlice) -> str:
+        """
+        Return ID of created task from Reindex API response.
+        """
+        if "task" not in json_data:
+            raise ElasticSearchTaskException(
+                ES_TASK_CREATE_ERROR.format(
+                    es_index=es_slice.name, error=json_data.get("error", json_data)
+                )
+            )
+        return json_data["task"]
+
+    def _parse_task_response(
+        self, json_data: dict, task_id: str
+    ) -> tuple[bool, dict[str, int]]:
+        """
+        Return completion flag and documents counters from Tasks API response.
 
+        Status may be missing in responses of some versions and proxies, then
+        counters are zero. Finished task with an error, failures or canceled
+        is failed.
+        """
+        completed = json_data.get("completed", False)
         if err_data := json_data.get("error"):
+            if completed:
+                raise ElasticSearchTaskException(
+                    ES_TASK_FAILED_ERROR.format(
+                        task_id=task_id, error=self._format_error(error=err_data)
+                    )
+                )
             self._handle_error(err_data=err_data, task_id=task_id)
 
-        response_status = json_data["task"]["status"]
-
-        return json_data["completed"], {
-            "total": response_status["total"],
-            "created": response_status["created"],
+        if completed:
+            self._check_task_failures(
+                response=json_data.get("response") or json_data, task_id=task_id
+            )
+        task = json_data.get("task") or {}
+        info = self._get_task_info(status=task.get("status") or {})
+        if running_nanos := task.get("running_time_in_nanos"):
+            # Exact duration of the task, polls see its end a bit later.
+            info["running_millis"] = running_nanos // 1_000_000
+        return completed, info
+
+    def _parse_tasks_list(self, json_data: dict) -> dict[str, dict[str, int]]:
+        """
+        Return documents counters of running tasks from Tasks API list response.
+        """
+        if node_failures := json_data.get("node_failures"):
+            # Tasks of failed nodes are missing, so they are checked one by one.
+            logger.warning(f"Can not list reindex tasks of nodes: {node_failures}")
+        return {
+            task_id: self._get_task_info(status=task.get("status") or {})
+            for node in json_data.get("nodes", {}).values()
+            for task_id, task in node.get("tasks", {}).items()
         }
 
-    def _get_reindex_body(self, es_index: str) -> dict:
+    @staticmethod
+    def _get_task_by_opaque_id(json_data: dict, opaque_id: str) -> str | None:
+        """
+        Return ID of the listed task with the opaque ID header, if any.
+        """
+        for node in json_data.get("nodes", {}).values():
+            for task_id, task in node.get("tasks", {}).items():
+                if task.get("headers", {}).get(ES_OPAQUE_ID_HEADER) == opaque_id:
+                    return task_id
+        return None
+
+    def _create_http_session(
+        self, http_auth: tuple[str, str] | None
+    ) -> requests.Session:
+        """
+        Create HTTP session with connections pool sized to concurrent tasks.
+        """
+        session = requests.Session()
+        self._mount_http_adapter(session=session, hosts=1)
+        session.auth = http_auth
+        session.headers.update(self.headers)
+        return session
+
+    def _mount_http_adapter(self, session: requests.Session, hosts: int) -> None:
+        """
+        Mount adapter keeping a connections pool per host for the amount of hosts.
+        """
+        adapter = HTTPAdapter(
+            pool_connections=max(hosts, 1), pool_maxsize=self.pool_size
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    def _encode_body(self, body: dict) -> bytes:
+        """
+        Serialize request body, gzip compressed if enabled.
+        """
+        data = json.dumps(body).encode()
+        return gzip.compress(data) if self.config.http_compress else data
+
+    def _get_reindex_body(self, es_slice: IndexSlice) -> dict:
         """
         Return ElasticSearch reindex body for API request.
 
         This method creates a dictionary that represents the body of a reindex API request
-        to ElasticSearch.
+        to ElasticSearch. Optional query limits documents to a single index slice,
+        optional op_type `create` skips documents already existing on destination.
+        Batch size is set only by adaptive batch sizing, ES default is 1000.
         """
         remote_settings = self._get_remote_settings()
-        return {
-            "source": {"remote": remote_settings, "index": es_index},
-            "conflicts": "proceed",
-            "dest": {"index": es_index},
-        }
+        source: dict[str, Any] = {"remote": remote_settings, "index": es_slice.index}
+        if es_slice.query:
+            source["query"] = es_slice.query
+        if self.batch_controller:
+            source["size"] = self.batch_controller.get_size(es_slice=es_slice)
+        dest = {"index": es_slice.dest_name}
+        if es_slice.op_type:
+            dest["op_type"] = es_slice.op_type
+        body: dict[str, Any] = {"source": source, "conflicts": "proceed", "dest": dest}
+        if es_slice.max_docs:
+            body["max_docs"] = es_slice.max_docs
+        return body
 
     def _get_remote_settings(self) -> dict[str, str]:
         """
@@ -135,47 +689,181 @@ class ReindexService:
             task_id (str): The ID of the task being checked.
 
         Raises:
-            ElasticSearchInvalidTaskIDException: If the task ID is invalid.
+            ElasticSearchInvalidTaskIDException: If the task is unknown to destination.
+            ElasticSearchTransientException: If the node of the task is unreachable.
+            ElasticSearchTaskException: For any other error.
         """
         logger.error(f"Error during task check: {err_data}")
 
-        if err_data["type"] == "illegal_argument_exception":
+        error_type = err_data.get("type") if isinstance(err_data, dict) else None
+        if error_type in ES_TASK_NOT_FOUND_ERROR_TYPES:
             raise ElasticSearchInvalidTaskIDException(
                 ES_TASK_ID_ERROR.format(host=self.config.dest_host, task_id=task_id)
             )
+        if error_type in ES_TRANSIENT_ERROR_TYPES:
+            raise ElasticSearchTransientException(
+                ES_TRANSIENT_ERROR.format(
+                    host=self.config.dest_host, error=self._format_error(error=err_data)
+                )
+            )
+        raise ElasticSearchTaskException(
+            ES_TASK_FAILED_ERROR.format(
+                task_id=task_id, error=self._format_error(error=err_data)
+            )
+        )
 
-    def _wait_for_task_completion(self, task_id: str, check_interval: int) -> str:
+    def _check_task_failures(self, response: dict, task_id: str) -> None:
         """
-        Wait for the reindex task to complete, periodically checking its status.
+        Raise if finished task has failed documents or was canceled.
 
-        Args:
-            task_id (str): The ID of the reindex task.
-            check_interval (int): Interval between status checks in seconds.
+        Reindex stops at the first bulk failure, so the rest of its documents
+        were not copied either.
+        """
+        if failures := response.get("failures"):
+            failure = failures[0]
+            raise ElasticSearchTaskException(
+                ES_TASK_FAILED_ERROR.format(
+                    task_id=task_id,
+                    error=f"{len(failures)} failures, first: "
+                    + self._format_error(
+                        error=failure.get("cause") or failure.get("reason") or failure
+                    ),
+                )
+            )
+        if canceled := response.get("canceled"):
+            raise ElasticSearchTaskException(
+                ES_TASK_FAILED_ERROR.format(
+                    task_id=task_id, error=f"canceled {canceled}"
+                )
+            )
 
-        Returns:
-            str: The ID of the completed task.
+    def _on_task_progress(
+        self, task_id: str, es_slice: IndexSlice, info: dict[str, int]
+    ) -> None:
+        """
+        Log the progress of the task reported by the poller.
+        """
+        if self.state_store:
+            self.state_store.task_progress(task_id=task_id, info=info)
+        with self._progress_lock:
+            self._progress.setdefault(es_slice.index, {})[task_id] = info
+        stats = self.metrics.update(task_id=task_id, es_slice=es_slice, info=info)
+        self._log_migration_progress(task_id=task_id, info=info, stats=stats)
+        if es_slice.slices > 1:
+            self._log_index_progress(es_slice=es_slice)
+        if self.metrics.should_report(interval=self.config.check_interval):
+            self._log_run_progress(stats=self.metrics.get_run_stats())
+
+    def _record_submitted(self, es_slice: IndexSlice, task_id: str) -> None:
+        """
+        Record created task in the state store and start its metrics.
+        """
+        self.metrics.start_task(task_id=task_id)
+        if self.state_store:
+            self.state_store.task_submitted(es_slice=es_slice, task_id=task_id)
 
-        Raises:
-            ElasticSearchInvalidTaskIDException: If the task ID becomes invalid during execution.
+    def _trace_task(
+        self, future: Future | asyncio.Future, es_slice: IndexSlice, task_id: str
+    ) -> None:
+        """
+        Record span of the task from now until its future is resolved.
         """
-        while True:
-            completed, info = self._check_task_completed(task_id=task_id)
-            self._log_migration_progress(task_id=task_id, info=info)
+        if self.tracer.enabled:
+            future.add_done_callback(
+                partial(
+                    self._end_task_span,
+                    es_slice=es_slice,
+                    task_id=task_id,
+                    started=self.tracer.now(),
+                )
+            )
 
-            if completed:
-                logger.info(f"Task finished: {task_id}")
-                return task_id
+    def _end_task_span(
+        self,
+        future: Future | asyncio.Future,
+        es_slice: IndexSlice,
+        task_id: str,
+        started: float,
+    ) -> None:
+        stats = self.get_task_stats(es_slice=es_slice, task_id=task_id)
+        self.tracer.add_span(
+            name="copy",
+            started=started,
+            finished=self.tracer.now(),
+            category="task",
+            slice=es_slice.name,
+            task=task_id,
+            docs=stats.get("created", 0) + stats.get("updated", 0),
+            failed=future.cancelled() or future.exception() is not None,
+        )
+
+    @staticmethod
+    def _format_error(error: dict | str) -> str:
+        """
+        Return short description of Elasticsearch error.
+        """
+        if isinstance(error, dict) and "type" in error:
+            return f"{error['type']}: {error.get('reason')}"
+        return str(error)
 
-            sleep(check_interval)
+    @staticmethod
+    def _get_task_info(status: dict) -> dict[str, int]:
+        """
+        Return documents counters from the task status.
+        """
+        return {
+            key: status.get(key, 0)
+            for key in (
+                "total",
+                "created",
+                "updated",
+                "deleted",
+                "noops",
+                "version_conflicts",
+                "batches",
+                "throttled_millis",
+            )
+        }
 
     @staticmethod
-    def _log_migration_progress(task_id: str, info: dict[str, int]) -> None:
+    def _log_migration_progress(
+        task_id: str, info: dict[str, int], stats: ThroughputStats
+    ) -> None:
         """
         Log the progress of the migration task.
 
         Args:
             task_id (str): The ID of the reindex task.
             info (Dict[str, int]): Dictionary containing 'created' and 'total' document counts.
+            stats (ThroughputStats): Rates and ETA of the task.
         """
         created, total = info["created"], info["total"]
-        logger.info(f"Migrated {created}/{total} documents for task {task_id}")
+        message = f"Migrated {created}/{total} documents for task {task_id}"
+        if version_conflicts := info.get("version_conflicts"):
+            message += f", {version_conflicts} version conflicts"
+        logger.info(f"{message}, {stats.format()}")
+
+    def _log_index_progress(self, es_slice: IndexSlice) -> None:
+        """
+        Log the progress summed up across all slices of the index.
+        """
+        with self._progress_lock:
+            started = len(self._progress[es_slice.index])
+        stats = self.metrics.get_index_stats(es_index=es_slice.index)
+
+        logger.info(
+            f"Migrated {stats.docs}/{stats.total} documents for index "
+            f"{es_slice.index} ({started}/{es_slice.slices} slices started), "
+            f"{stats.format()}"
+        )
+
+    @staticmethod
+    def _log_run_progress(stats: ThroughputStats) -> None:
+        """
+        Log the progress summed up across all tasks.
+        """
+        logger.info(
+            f"Migrated {stats.docs}/{stats.total} documents in total "
+            f"({stats.batches} batches, {stats.version_conflicts} version "
+            f"conflicts), {stats.format()}"
+        )
@@ -0,0 +1,199 @@
+"""
+Module with retries of transient Elasticsearch failures and circuit breakers.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from threading import Lock
+from typing import TypeVar
+
+from elasticsearch_reindex.const import (
+    DEFAULT_BREAKER_RESET_TIMEOUT,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_REQUEST_RETRIES,
+    DEFAULT_RETRY_BASE_DELAY,
+    DEFAULT_RETRY_MAX_DELAY,
+)
+from elasticsearch_reindex.errors import (
+    ES_CIRCUIT_OPEN_ERROR,
+    ElasticSearchCircuitOpenException,
+)
+from elasticsearch_reindex.logger import create_logger
+
+logger = create_logger()
+
+T = TypeVar("T")
+# Exception types of requests worth retrying.
+Retryable = tuple[type[BaseException], ...]
+
+
+class CircuitBreaker:
+    """
+    Suspend requests to a cluster after consecutive transient failures.
+
+    After `failure_threshold` failures in a row the breaker opens and calls
+    fail fast without reaching the cluster for `reset_timeout` seconds. Then
+    calls are let through again: a success closes the breaker, a failure opens
+    it for another period.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        reset_timeout: float = DEFAULT_BREAKER_RESET_TIMEOUT,
+    ) -> None:
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        # Transient failures since start, consecutive or not.
+        self.failures_total = 0
+        self._opened_at: float | None = None
+        self._lock = Lock()
+
+    @property
+    def retry_after(self) -> float:
+        """
+        Return seconds until calls are let through again, 0 if closed.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+
+    def before_call(self) -> None:
+        """
+        Raise if calls to the cluster are suspended.
+        """
+        if retry_after := self.retry_after:
+            raise ElasticSearchCircuitOpenException(
+                ES_CIRCUIT_OPEN_ERROR.format(host=self.host, retry_after=retry_after)
+            )
+
+    def record_success(self) -> None:
+        """
+        Close the breaker after a successful call.
+        """
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"Requests to {self.host} resumed")
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        """
+        Count a transient failure, open the breaker when threshold is reached.
+        """
+        with self._lock:
+            self._failures += 1
+            self.failures_total += 1
+            if self._failures < self.failure_threshold:
+                return
+            if self._opened_at is None:
+                logger.warning(
+                    f"Requests to {self.host} suspended for {self.reset_timeout}s "
+                    f"after {self._failures} failures in a row"
+                )
+            self._opened_at = time.monotonic()
+
+    def call(self, func: Callable[[], T], retryable: Retryable) -> T:
+        """
+        Make single call through the breaker.
+        """
+        self.before_call()
+        try:
+            result = func()
+        except retryable:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    async def call_async(
+        self, func: Callable[[], Awaitable[T]], retryable: Retryable
+    ) -> T:
+        """
+        Make single call of coroutine function through the breaker.
+        """
+        self.before_call()
+        try:
+            result = await func()
+        except retryable:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+class RetryPolicy:
+    """
+    Retry transient failures with exponential backoff and full jitter.
+
+    Delay before retry `n` is random between 0 and `base_delay * 2 ** n`, capped
+    by `max_delay`, so clients failed together do not come back together.
+    While the circuit breaker of the cluster is open, retries wait for it.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        retries: int = DEFAULT_REQUEST_RETRIES,
+        base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+        max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+    ) -> None:
+        self.breaker = breaker
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def call(self, func: Callable[[], T], retryable: Retryable) -> T:
+        """
+        Call function until it succeeds, fails permanently or retries run out.
+        """
+        attempt = 0
+        while True:
+            try:
+                return self.breaker.call(func=func, retryable=retryable)
+            except retryable as exc:
+                if (delay := self._get_delay(exc=exc, attempt=attempt)) is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(
+        self, func: Callable[[], Awaitable[T]], retryable: Retryable
+    ) -> T:
+        """
+        Await coroutine function until it succeeds, fails permanently or retries run out.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self.breaker.call_async(func=func, retryable=retryable)
+            except retryable as exc:
+                if (delay := self._get_delay(exc=exc, attempt=attempt)) is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def get_backoff(self, attempt: int) -> float:
+        """
+        Return jittered delay before the retry.
+        """
+        return random.uniform(0, min(self.base_delay * 2**attempt, self.max_delay))
+
+    def _get_delay(self, exc: BaseException, attempt: int) -> float | None:
+        """
+        Return delay before the next attempt, None if retries are exhausted.
+        """
+        if attempt >= self.retries:
+            return None
+        delay = max(self.get_backoff(attempt=attempt), self.breaker.retry_after)
+        logger.warning(
+            f"Request to {self.breaker.host} failed: {exc}. "
+            f"Retry {attempt + 1}/{self.retries} in {delay:.1f}s"
+        )
+        return delay
@@ -0,0 +1,99 @@
+"""
+Module with scheduling of reindex tasks across worker slots.
+"""
+
+import heapq
+from dataclasses import dataclass
+
+from elasticsearch_reindex.const import SCHEDULING_LONGEST_FIRST, SCHEDULING_STRATEGIES
+from elasticsearch_reindex.schema import IndexSlice
+
+
+@dataclass
+class SchedulePlan:
+    """
+    Dataclass for storing order of reindex tasks and expected makespan.
+    """
+
+    index_slices: list[IndexSlice]
+    workers: int
+    # Load of the busiest worker slot, in documents and bytes.
+    makespan_docs: int
+    makespan_bytes: int
+    total_docs: int
+    total_bytes: int
+
+    @property
+    def parallel_ratio(self) -> float:
+        """
+        Return expected makespan relative to sequential run.
+        """
+        if self.total_bytes:
+            return self.makespan_bytes / self.total_bytes
+        if self.total_docs:
+            return self.makespan_docs / self.total_docs
+        return 0.0
+
+
+def get_slice_weight(es_slice: IndexSlice) -> int:
+    """
+    Return expected cost of slice transfer.
+
+    Store size reflects documents size better, docs count is used when
+    store size is unknown.
+    """
+    return es_slice.store_size or es_slice.docs_count
+
+
+class ReindexScheduler:
+    """
+    Order reindex tasks so the largest ones do not start last.
+
+    Tasks are submitted to a pool of worker slots which picks the next task as
+    soon as any slot is free, so longest-first order gives LPT bin-packing.
+    """
+
+    def __init__(self, workers: int, strategy: str = SCHEDULING_LONGEST_FIRST):
+        if strategy not in SCHEDULING_STRATEGIES:
+            raise ValueError(
+                f"Invalid scheduling strategy: {strategy}. "
+                f"Expected one of: {', '.join(SCHEDULING_STRATEGIES)}"
+            )
+        self.workers = max(workers, 1)
+        self.strategy = strategy
+
+    def plan(self, index_slices: list[IndexSlice]) -> SchedulePlan:
+        """
+        Return submission order of slices and expected makespan.
+        """
+        ordered = list(index_slices)
+        if self.strategy == SCHEDULING_LONGEST_FIRST:
+            ordered.sort(key=get_slice_weight, reverse=True)
+
+        slots = self._assign_slots(index_slices=ordered)
+        busiest = max(slots, key=lambda slot: slot[0])
+
+        return SchedulePlan(
+            index_slices=ordered,
+            workers=self.workers,
+            makespan_docs=busiest[1],
+            makespan_bytes=busiest[2],
+            total_docs=sum(item.docs_count for item in ordered),
+            total_bytes=sum(item.store_size for item in ordered),
+        )
+
+    def _assign_slots(self, index_slices: list[IndexSlice]) -> list[list[int]]:
+        """
+        Simulate greedy assignment of slices to the least loaded worker slot.
+
+        Every slot is stored as [weight, docs, bytes, slot number].
+        """
+        slots = [[0, 0, 0, slot] for slot in range(self.workers)]
+        heapq.heapify(slots)
+        for es_slice in index_slices:
+            slot = heapq.heappop(slots)
+            slot[0] += get_slice_weight(es_slice)
+            slot[1] += es_slice.docs_count
+            slot[2] += es_slice.store_size
+            heapq.heappush(slots, slot)
+        return slots
@@ -1,9 +1,24 @@
 from dataclasses import dataclass
 
 from elasticsearch_reindex.const import (
+    DEFAULT_BATCH_TARGET_BYTES,
+    DEFAULT_CATALOG_TTL,
     DEFAULT_CHECK_INTERVAL,
     DEFAULT_CONCURRENT_TASKS,
+    DEFAULT_ENGINE,
+    DEFAULT_REQUEST_RETRIES,
     DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SCHEDULING,
+    DEFAULT_SLICE_MIN_DOCS,
+    DEFAULT_SLICES,
+    DEFAULT_STREAM_BATCH_SIZE,
+    DEFAULT_STREAM_WRITERS,
+    DEFAULT_TASK_RETRIES,
+    DEFAULT_THROTTLE_MAX_RPS,
+    DEFAULT_THROTTLE_MIN_RPS,
+    DEFAULT_TUNING_JOURNAL,
+    DEFAULT_VERIFY_BUCKETS,
+    DEFAULT_VERIFY_SAMPLE,
 )
 
 
@@ -15,6 +30,55 @@ class Index:
 
     name: str
     docs_count: int
+    store_size: int = 0
+
+
+@dataclass
+class IndexSlice:
+    """
+    Dataclass for storing part of ES index transferred by single reindex task.
+    """
+
+    index: str
+    slice_id: int = 0
+    slices: int = 1
+    query: dict | None = None
+    # Destination op_type, `create` skips already existing documents.
+    op_type: str | None = None
+    # Estimated size of the slice, used by the scheduler.
+    docs_count: int = 0
+    store_size: int = 0
+    # Destination index if it differs from the source one, e.g. of a benchmark.
+    dest_index: str | None = None
+    # Limit of transferred documents, e.g. of a benchmark sample.
+    max_docs: int | None = None
+
+    @property
+    def name(self) -> str:
+        if self.slices == 1:
+            return self.index
+        return f"{self.index}[{self.slice_id + 1}/{self.slices}]"
+
+    @property
+    def dest_name(self) -> str:
+        return self.dest_index or self.index
+
+
+@dataclass
+class DataStream:
+    """
+    Dataclass for storing ES data stream with its backing indices.
+    """
+
+    name: str
+    # Backing indices from the oldest one, the last one is the write index.
+    indices: list[str]
+    template: str | None = None
+    ilm_policy: str | None = None
+
+    @property
+    def write_index(self) -> str | None:
+        return self.indices[-1] if self.indices else None
 
 
 @dataclass
@@ -84,6 +148,57 @@ class Config:
     request_timeout: int = DEFAULT_REQUEST_TIMEOUT
     concurrent_tasks: int = DEFAULT_CONCURRENT_TASKS
     check_interval: int = DEFAULT_CHECK_INTERVAL
+    slices: int = DEFAULT_SLICES
+    slice_field: str | None = None
+    slice_min_docs: int = DEFAULT_SLICE_MIN_DOCS
+    scheduling: str = DEFAULT_SCHEDULING
+    engine: str = DEFAULT_ENGINE
+    http_compress: bool = True
+    requests_per_second: float | None = None
+    throttle_target_latency: float | None = None
+    throttle_min_rps: float = DEFAULT_THROTTLE_MIN_RPS
+    throttle_max_rps: float = DEFAULT_THROTTLE_MAX_RPS
+    guard_search_queue: int | None = None
+    guard_search_latency: float | None = None
+    guard_cpu: float | None = None
+    tune_dest: bool = False
+    force_merge: bool = False
+    tuning_journal: str = DEFAULT_TUNING_JOURNAL
+    state_file: str | None = None
+    delta_field: str | None = None
+    reconcile: bool = False
+    stream_batch_size: int = DEFAULT_STREAM_BATCH_SIZE
+    stream_writers: int = DEFAULT_STREAM_WRITERS
+    adaptive_batch: bool = False
+    batch_target_bytes: int = DEFAULT_BATCH_TARGET_BYTES
+    request_retries: int = DEFAULT_REQUEST_RETRIES
+    task_retries: int = DEFAULT_TASK_RETRIES
+    metrics_port: int | None = None
+    metrics_textfile: str | None = None
+    dry_run: bool = False
+    plan_file: str | None = None
+    benchmark_docs: int = 0
+    verify_field: str | None = None
+    verify_buckets: int = DEFAULT_VERIFY_BUCKETS
+    verify_sample: int = DEFAULT_VERIFY_SAMPLE
+    verify_file: str | None = None
+    catalog_ttl: float = DEFAULT_CATALOG_TTL
+    data_streams: bool = False
+    cutover: bool = False
+    spread_dest_nodes: bool = False
+    trace_file: str | None = None
+    profile_file: str | None = None
+
+    @property
+    def guard_enabled(self) -> bool:
+        return any(
+            threshold is not None
+            for threshold in (
+                self.guard_search_queue,
+                self.guard_search_latency,
+                self.guard_cpu,
+            )
+        )
 
     @property
     def http_auth_dest(self) -> HttpAuth | None:
@@ -0,0 +1,274 @@
+"""
+Module with local state store of reindex tasks for resumable migrations.
+"""
+
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from threading import Lock
+
+from elasticsearch_reindex.schema import IndexSlice
+
+TASK_PENDING = "pending"
+TASK_RUNNING = "running"
+TASK_DONE = "done"
+TASK_FAILED = "failed"
+
+CREATE_TASKS_TABLE = """
+CREATE TABLE IF NOT EXISTS tasks (
+    dest_host TEXT NOT NULL,
+    name TEXT NOT NULL,
+    es_index TEXT NOT NULL,
+    slice_id INTEGER NOT NULL,
+    slices INTEGER NOT NULL,
+    query TEXT,
+    op_type TEXT,
+    docs_count INTEGER NOT NULL DEFAULT 0,
+    store_size INTEGER NOT NULL DEFAULT 0,
+    task_id TEXT,
+    status TEXT NOT NULL,
+    created INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (dest_host, name)
+)
+"""
+
+CREATE_WATERMARKS_TABLE = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    dest_host TEXT NOT NULL,
+    es_index TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value REAL,
+    pending REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (dest_host, es_index)
+)
+"""
+
+
+@dataclass
+class TaskRecord:
+    """
+    Dataclass for storing state of a single index slice transfer.
+    """
+
+    es_slice: IndexSlice
+    task_id: str | None
+    status: str
+    created: int
+    total: int
+
+
+class StateStore:
+    """
+    SQLite journal of index slices, their task IDs and last progress.
+
+    Every slice is recorded before its task is created and updated on every
+    poll, so a restarted run can reattach to tasks still running on the
+    destination and resubmit only failed or missing work.
+
+    Read only store of a dry run ignores all writes.
+    """
+
+    def __init__(self, path: str, es_host: str, read_only: bool = False) -> None:
+        self.path = path
+        self.es_host = es_host
+        self.read_only = read_only
+        self._lock = Lock()
+        if read_only:
+            self._connection = sqlite3.connect(
+                f"file:{path}?mode=ro", uri=True, check_same_thread=False
+            )
+            return
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(CREATE_TASKS_TABLE)
+            self._connection.execute(CREATE_WATERMARKS_TABLE)
+
+    def close(self) -> None:
+        """
+        Close database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def add_slices(self, index_slices: list[IndexSlice]) -> None:
+        """
+        Record planned slices, already recorded ones are kept as is.
+        """
+        rows = [
+            (
+                self.es_host,
+                es_slice.name,
+                es_slice.index,
+                es_slice.slice_id,
+                es_slice.slices,
+                json.dumps(es_slice.query) if es_slice.query else None,
+                es_slice.op_type,
+                es_slice.docs_count,
+                es_slice.store_size,
+                TASK_PENDING,
+                time.time(),
+            )
+            for es_slice in index_slices
+        ]
+        self._execute_many(
+            "INSERT OR IGNORE INTO tasks (dest_host, name, es_index, slice_id, "
+            "slices, query, op_type, docs_count, store_size, status, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def reset_slices(self, index_slices: list[IndexSlice]) -> None:
+        """
+        Replace recorded slices of the indexes, e.g. by a delta pass.
+        """
+        indexes = {es_slice.index for es_slice in index_slices}
+        self._execute_many(
+            "DELETE FROM tasks WHERE dest_host = ? AND es_index = ?",
+            [(self.es_host, es_index) for es_index in indexes],
+        )
+        self.add_slices(index_slices=index_slices)
+
+    def task_submitted(self, es_slice: IndexSlice, task_id: str) -> None:
+        """
+        Record task created for the slice.
+        """
+        self._execute(
+            "UPDATE tasks SET task_id = ?, status = ?, updated_at = ? "
+            "WHERE dest_host = ? AND name = ?",
+            (task_id, TASK_RUNNING, time.time(), self.es_host, es_slice.name),
+        )
+
+    def task_progress(self, task_id: str, info: dict[str, int]) -> None:
+        """
+        Record last progress of the task.
+        """
+        self._execute(
+            "UPDATE tasks SET created = ?, total = ?, updated_at = ? "
+            "WHERE dest_host = ? AND task_id = ?",
+            (info["created"], info["total"], time.time(), self.es_host, task_id),
+        )
+
+    def task_finished(self, es_slice: IndexSlice, status: str) -> None:
+        """
+        Record final status of the slice transfer.
+        """
+        self._execute(
+            "UPDATE tasks SET status = ?, updated_at = ? "
+            "WHERE dest_host = ? AND name = ?",
+            (status, time.time(), self.es_host, es_slice.name),
+        )
+
+    def get_records(self, es_index: str | None = None) -> list[TaskRecord]:
+        """
+        Return recorded slices of the destination, optionally of single index.
+        """
+        query = (
+            "SELECT es_index, slice_id, slices, query, op_type, docs_count, "
+            "store_size, task_id, status, created, total FROM tasks WHERE dest_host = ?"
+        )
+        params: tuple = (self.es_host,)
+        if es_index is not None:
+            query += " AND es_index = ?"
+            params += (es_index,)
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"{query} ORDER BY es_index, slice_id", params
+            ).fetchall()
+
+        return [self._get_record(row=row) for row in rows]
+
+    def get_unfinished_indexes(self) -> set[str]:
+        """
+        Return names of indexes with not finished slices recorded for the destination.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT DISTINCT es_index FROM tasks WHERE dest_host = ? AND status != ?",
+                (self.es_host, TASK_DONE),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def get_watermark(self, es_index: str, field: str) -> float | None:
+        """
+        Return the last committed high-water mark of the index field.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM watermarks "
+                "WHERE dest_host = ? AND es_index = ? AND field = ?",
+                (self.es_host, es_index, field),
+            ).fetchone()
+        return row[0] if row else None
+
+    def begin_watermark(self, es_index: str, field: str, value: float) -> None:
+        """
+        Record high-water mark of the source before the index transfer starts.
+
+        Mark of an interrupted transfer is kept, so a resumed run never commits
+        a mark newer than the data its tasks actually saw.
+        """
+        self._execute(
+            "INSERT INTO watermarks (dest_host, es_index, field, pending, updated_at) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (dest_host, es_index) DO UPDATE SET "
+            "value = CASE WHEN field = excluded.field THEN value END, "
+            "pending = CASE WHEN field = excluded.field AND pending IS NOT NULL "
+            "THEN pending ELSE excluded.pending END, "
+            "field = excluded.field, updated_at = excluded.updated_at",
+            (self.es_host, es_index, field, value, time.time()),
+        )
+
+    def commit_watermark(self, es_index: str) -> float | None:
+        """
+        Make pending high-water mark of the transferred index the committed one.
+        """
+        self._execute(
+            "UPDATE watermarks SET value = pending, pending = NULL, updated_at = ? "
+            "WHERE dest_host = ? AND es_index = ? AND pending IS NOT NULL",
+            (time.time(), self.es_host, es_index),
+        )
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM watermarks WHERE dest_host = ? AND es_index = ?",
+                (self.es_host, es_index),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _execute(self, query: str, params: tuple) -> None:
+        if self.read_only:
+            return
+        with self._lock, self._connection:
+            self._connection.execute(query, params)
+
+    def _execute_many(self, query: str, rows: list[tuple]) -> None:
+        if self.read_only:
+            return
+        with self._lock, self._connection:
+            self._connection.executemany(query, rows)
+
+    @staticmethod
+    def _get_record(row: tuple) -> TaskRecord:
+        es_index, slice_id, slices, query, op_type, docs_count, store_size = row[:7]
+        task_id, status, created, total = row[7:]
+        es_slice = IndexSlice(
+            index=es_index,
+            slice_id=slice_id,
+            slices=slices,
+            query=json.loads(query) if query else None,
+            op_type=op_type,
+            docs_count=docs_count,
+            store_size=store_size,
+        )
+        return TaskRecord(
+            es_slice=es_slice,
+            task_id=task_id,
+            status=status,
+            created=created,
+            total=total,
+        )
@@ -0,0 +1,556 @@
+"""
+Module with client-side streaming of documents from source to destination.
+"""
+
+import gzip
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from itertools import count
+from queue import Queue
+from threading import Condition, Lock, Thread
+from typing import cast
+
+import requests
+
+from elasticsearch_reindex.bulk import (
+    BULK_FILTER_PATH,
+    SEARCH_FILTER_PATH,
+    BulkBuffer,
+    SearchPageDecoder,
+    dumps,
+    loads,
+)
+from elasticsearch_reindex.client import ElasticsearchClient
+from elasticsearch_reindex.const import (
+    DEFAULT_STREAM_KEEP_ALIVE,
+    ES_BULK_ENDPOINT,
+    ES_SEARCH_ENDPOINT,
+    OP_TYPE_CREATE,
+)
+from elasticsearch_reindex.errors import ES_BULK_ERROR, ElasticSearchBulkException
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.reindex import ReindexService
+from elasticsearch_reindex.retry import CircuitBreaker, RetryPolicy
+from elasticsearch_reindex.schema import Config, IndexSlice
+from elasticsearch_reindex.state import StateStore
+
+logger = create_logger()
+
+# Prefix of IDs of client-side stream tasks, unknown to destination Tasks API.
+STREAM_TASK_PREFIX = "stream:"
+# Bulk item status of document rejected by op_type `create`.
+VERSION_CONFLICT_STATUS = 409
+# Bulk request or item status of write rejected by overloaded destination.
+TOO_MANY_REQUESTS_STATUS = 429
+
+
+class SliceProgress:
+    """
+    Counters of a single slice transfer shared by its reader and bulk writers.
+    """
+
+    def __init__(self, task_id: str, es_slice: IndexSlice) -> None:
+        self.task_id = task_id
+        self.es_slice = es_slice
+        self.info = {
+            "total": es_slice.docs_count,
+            "created": 0,
+            "updated": 0,
+            "version_conflicts": 0,
+            "failed": 0,
+            "rejected": 0,
+            "batches": 0,
+            "bytes": 0,
+        }
+        self.first_error: str | None = None
+        self.error: BaseException | None = None
+        self._pending = 0
+        self._reported_at = time.monotonic()
+        self._condition = Condition()
+
+    def add_chunk(self) -> None:
+        """
+        Register chunk queued for bulk writers.
+        """
+        with self._condition:
+            self._pending += 1
+
+    def chunk_done(
+        self, counters: dict[str, int] | None, error: BaseException | None = None
+    ) -> None:
+        """
+        Add counters of written chunk, or error of failed one.
+        """
+        with self._condition:
+            if error is not None:
+                self.error = self.error or error
+            for key, value in (counters or {}).items():
+                self.info[key] += value
+            self._pending -= 1
+            self._condition.notify_all()
+
+    def wait(self) -> None:
+        """
+        Wait until all queued chunks are written.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending == 0)
+
+    def should_report(self, interval: float) -> bool:
+        """
+        Return True at most once per interval.
+        """
+        with self._condition:
+            now = time.monotonic()
+            if now - self._reported_at < interval:
+                return False
+            self._reported_at = now
+            return True
+
+
+@dataclass
+class BulkChunk:
+    """
+    Dataclass for storing search page waiting for bulk writer.
+    """
+
+    hits: list[tuple[str, str | None, bytes]]
+    progress: SliceProgress
+
+
+class StreamReindexService(ReindexService):
+    """
+    This class transfers documents through the client instead of remote reindex.
+
+    Every slice is read by point in time search with `search_after` and sent
+    to a bounded queue, from which a pool of writers sends `_bulk` requests to
+    the destination. Full queue blocks readers, so memory stays bounded when
+    the destination is slower than the source.
+
+    Documents stay raw `_source` bytes all the way, search and bulk requests
+    go through pooled sessions instead of the decoding Elasticsearch client.
+    """
+
+    # Bulk body is compressed on the CPU bound path, so favor speed over ratio.
+    bulk_compress_level = 1
+    bulk_headers = {"Content-Type": "application/x-ndjson"}
+
+    def __init__(
+        self,
+        config: Config,
+        source_client: ElasticsearchClient,
+        dest_client: ElasticsearchClient,
+        state_store: StateStore | None = None,
+    ):
+        super().__init__(config=config, state_store=state_store)
+        self._source_client = source_client
+        self._dest_client = dest_client
+        self._readers = ThreadPoolExecutor(
+            max_workers=max(config.concurrent_tasks, 1),
+            thread_name_prefix="stream-reader",
+        )
+        # Two chunks per writer keep writers busy while readers wait for pages.
+        self._queue: Queue[BulkChunk | None] = Queue(maxsize=config.stream_writers * 2)
+        self._writers: list[Thread] = []
+        self._writers_lock = Lock()
+        self._task_ids = count(start=1)
+        self._decoder = SearchPageDecoder()
+        self._source_session: requests.Session | None = None
+        self._source_session_lock = Lock()
+        self.source_breaker = CircuitBreaker(host=config.source_host)
+        self._source_retry = RetryPolicy(
+            breaker=self.source_breaker, retries=config.request_retries
+        )
+        # Reading pace in documents per second, set by adaptive throttling.
+        self._next_read = 0.0
+        self._pace_lock = Lock()
+
+    @property
+    def breakers(self) -> dict[str, CircuitBreaker]:
+        """
+        Return circuit breakers of clusters by their role.
+        """
+        return {"source": self.source_breaker, **super().breakers}
+
+    @property
+    def pool_size(self) -> int:
+        """
+        Return connections pool size: every bulk writer holds a connection.
+        """
+        return max(self.config.concurrent_tasks, self.config.stream_writers, 1)
+
+    @property
+    def source_session(self) -> requests.Session:
+        """
+        Return keep-alive HTTP session shared by readers of source.
+        """
+        with self._source_session_lock:
+            if self._source_session is None:
+                self._source_session = self._create_http_session(
+                    http_auth=(
+                        self.config.http_auth_source.as_tuple()
+                        if self.config.http_auth_source
+                        else None
+                    )
+                )
+            return self._source_session
+
+    def submit_slice(self, es_slice: IndexSlice) -> Future:
+        """
+        Start streaming part of index without waiting for it.
+
+        Args:
+            es_slice (IndexSlice): Part of Elasticsearch index to transfer.
+
+        Returns:
+            Future: Resolved with the stream task ID when all documents are written.
+        """
+        self._start_writers()
+        task_id = f"{STREAM_TASK_PREFIX}{next(self._task_ids)}"
+        self._record_submitted(es_slice=es_slice, task_id=task_id)
+        logger.info(
+            f"Stream task: {task_id} for {es_slice.name} "
+            f"({self._decoder.backend} decoder)"
+        )
+        future = self._readers.submit(self._stream_slice, es_slice, task_id)
+        self._trace_task(future=future, es_slice=es_slice, task_id=task_id)
+        return future
+
+    def attach_slice(self, es_slice: IndexSlice, task_id: str) -> Future:
+        """
+        Stream the slice again: client-side streams do not survive the process.
+        """
+        return self.submit_slice(es_slice=es_slice)
+
+    def is_task_completed(self, task_id: str) -> bool:
+        """
+        Check if the task is completed, stream tasks of a previous run never are.
+
+        Stream recorded as running was interrupted with its process, so the
+        slice is attached and streamed again instead of asking destination.
+        """
+        if task_id.startswith(STREAM_TASK_PREFIX):
+            return False
+        return super().is_task_completed(task_id=task_id)
+
+    def close(self) -> None:
+        """
+        Wait for readers, stop bulk writers and close HTTP connections.
+        """
+        self._readers.shutdown(wait=True)
+        with self._writers_lock:
+            for _ in self._writers:
+                self._queue.put(None)
+            for writer in self._writers:
+                writer.join()
+            self._writers = []
+        with self._source_session_lock:
+            if self._source_session is not None:
+                self._source_session.close()
+                self._source_session = None
+        super().close()
+
+    def _start_writers(self) -> None:
+        """
+        Start bulk writer threads on first submitted slice.
+        """
+        with self._writers_lock:
+            if self._writers:
+                return
+            for i in range(self.config.stream_writers):
+                writer = Thread(
+                    target=self._write_chunks, name=f"stream-writer-{i}", daemon=True
+                )
+                writer.start()
+                self._writers.append(writer)
+
+    def _stream_slice(self, es_slice: IndexSlice, task_id: str) -> str:
+        """
+        Read all documents of the slice and queue them for bulk writers.
+        """
+        progress = SliceProgress(task_id=task_id, es_slice=es_slice)
+        pit_id = self._source_client.open_point_in_time(
+            es_index=es_slice.index, keep_alive=DEFAULT_STREAM_KEEP_ALIVE
+        )
+        try:
+            search_after = None
+            # Documents left to read, if the slice is limited.
+            docs_left = es_slice.max_docs
+            while progress.error is None and docs_left != 0:
+                page = self._decoder.decode(
+                    body=self._source_retry.call(
+                        func=partial(
+                            self._search_page,
+                            pit_id=pit_id,
+                            es_slice=es_slice,
+                            search_after=search_after,
+                        ),
+                        retryable=self.retryable_errors,
+                    )
+                )
+                pit_id = page.pit_id or pit_id
+                hits = page.hits if docs_left is None else page.hits[:docs_left]
+                if not hits:
+                    break
+                if docs_left is not None:
+                    docs_left -= len(hits)
+
+                self._pace(docs=len(hits))
+                progress.add_chunk()
+                self._queue.put(BulkChunk(hits=hits, progress=progress))
+                search_after = page.search_after
+        finally:
+            progress.wait()
+            self._close_point_in_time(pit_id=pit_id)
+
+        if progress.error is not None:
+            raise progress.error
+        if failed := progress.info["failed"]:
+            raise ElasticSearchBulkException(
+                ES_BULK_ERROR.format(
+                    failed=failed, es_index=es_slice.name, error=progress.first_error
+                )
+            )
+
+        progress.info["total"] = sum(
+            progress.info[key] for key in ("created", "updated", "version_conflicts")
+        )
+        self._on_task_progress(task_id=task_id, es_slice=es_slice, info=progress.info)
+        logger.info(f"Task finished: {task_id}")
+        return task_id
+
+    def _write_chunks(self) -> None:
+        """
+        Send queued chunks to destination until stopped.
+        """
+        # Every writer reuses its own body buffer for all requests.
+        buffer = BulkBuffer()
+        while (chunk := self._queue.get()) is not None:
+            progress = chunk.progress
+            try:
+                counters = self._write_chunk(chunk=chunk, buffer=buffer)
+            except Exception as exc:
+                progress.chunk_done(counters=None, error=exc)
+                continue
+
+            progress.chunk_done(counters=counters)
+            if progress.should_report(interval=self.config.check_interval):
+                self._on_task_progress(
+                    task_id=progress.task_id,
+                    es_slice=progress.es_slice,
+                    info=dict(progress.info),
+                )
+
+    def _write_chunk(self, chunk: BulkChunk, buffer: BulkBuffer) -> dict[str, int]:
+        """
+        Send chunk to destination and return counters of its items.
+
+        Documents rejected by overloaded destination (429) are sent again after
+        backoff, until request retries run out.
+        """
+        counters = dict.fromkeys(
+            (
+                "created",
+                "updated",
+                "version_conflicts",
+                "failed",
+                "rejected",
+                "batches",
+                "bytes",
+            ),
+            0,
+        )
+        hits = chunk.hits
+        attempt = 0
+        while True:
+            rejected = self._send_hits(
+                hits=hits, progress=chunk.progress, buffer=buffer, counters=counters
+            )
+            if not rejected:
+                return counters
+            if attempt >= self.config.request_retries:
+                counters["failed"] += len(rejected)
+                chunk.progress.first_error = chunk.progress.first_error or (
+                    f"{len(rejected)} documents rejected by overloaded destination"
+                )
+                return counters
+
+            logger.warning(
+                f"Destination rejected {len(rejected)} documents of "
+                f"{chunk.progress.es_slice.name}, retry "
+                f"{attempt + 1}/{self.config.request_retries}"
+            )
+            time.sleep(self._retry.get_backoff(attempt=attempt))
+            hits = [hits[position] for position in rejected]
+            attempt += 1
+
+    def _send_hits(
+        self,
+        hits: list[tuple[str, str | None, bytes]],
+        progress: SliceProgress,
+        buffer: BulkBuffer,
+        counters: dict[str, int],
+    ) -> list[int]:
+        """
+        Send single bulk request, count its items and return rejected positions.
+        """
+        es_slice = progress.es_slice
+        action = es_slice.op_type or "index"
+        buffer.clear()
+        for doc_id, routing, source in hits:
+            buffer.add(
+                action=action,
+                es_index=es_slice.dest_name,
+                doc_id=doc_id,
+                routing=routing,
+                source=source,
+            )
+
+        started = time.monotonic()
+        with buffer.getbuffer() as body:
+            response = self._retry.call(
+                func=partial(self._send_bulk, body=body),
+                retryable=self.retryable_errors,
+            )
+        counters["batches"] += 1
+        counters["bytes"] += len(buffer)
+
+        rejected = self._count_bulk_items(
+            response=response, progress=progress, counters=counters
+        )
+        self._update_batch_size(
+            latency=(time.monotonic() - started) * 1000 / len(hits),
+            rejected=bool(rejected),
+        )
+        return rejected
+
+    def _update_batch_size(self, latency: float, rejected: bool) -> None:
+        """
+        Report bulk latency per document and rejections to batch sizing.
+        """
+        if self.batch_controller:
+            self.batch_controller.update(latency=latency, rejected=rejected)
+
+    def _get_page_size(self, es_slice: IndexSlice) -> int:
+        """
+        Return documents per search page and bulk request of the slice.
+        """
+        if self.batch_controller:
+            return self.batch_controller.get_size(es_slice=es_slice)
+        return self.config.stream_batch_size
+
+    def _search_page(
+        self, pit_id: str, es_slice: IndexSlice, search_after: list | None
+    ) -> bytes:
+        """
+        Return raw response of the next point in time search page.
+        """
+        body = {
+            "pit": {"id": pit_id, "keep_alive": DEFAULT_STREAM_KEEP_ALIVE},
+            "size": self._get_page_size(es_slice=es_slice),
+            "sort": ["_shard_doc"],
+            "track_total_hits": False,
+        }
+        if es_slice.query:
+            body["query"] = es_slice.query
+        if pit_slice := self._get_pit_slice(es_slice=es_slice):
+            body["slice"] = pit_slice
+        if search_after:
+            body["search_after"] = search_after
+
+        response = self.source_session.post(
+            url=ES_SEARCH_ENDPOINT.format(es_host=self.config.source_host),
+            data=dumps(body),
+            params={"filter_path": SEARCH_FILTER_PATH},
+            timeout=self.config.request_timeout,
+        )
+        self._check_transient_status(
+            status=response.status_code,
+            error=response.text,
+            host=self.config.source_host,
+        )
+        response.raise_for_status()
+        return response.content
+
+    def _send_bulk(self, body: memoryview) -> dict:
+        """
+        Send NDJSON body to destination Bulk API and return its response.
+        """
+        headers = self.bulk_headers
+        data: bytes | memoryview = body
+        if self.config.http_compress:
+            headers = {**headers, "Content-Encoding": "gzip"}
+            data = gzip.compress(body, compresslevel=self.bulk_compress_level)
+
+        response = self.http_session.post(
+            url=ES_BULK_ENDPOINT.format(es_host=self.config.dest_host),
+            # Buffer is sent without a copy, requests takes any bytes-like body.
+            data=cast(bytes, data),
+            headers=headers,
+            params={"filter_path": BULK_FILTER_PATH},
+            timeout=self.config.request_timeout,
+        )
+        if response.status_code == TOO_MANY_REQUESTS_STATUS:
+            self._update_batch_size(latency=0.0, rejected=True)
+        self._check_transient_status(status=response.status_code, error=response.text)
+        response.raise_for_status()
+        return loads(response.content)
+
+    def _pace(self, docs: int) -> None:
+        """
+        Hold the reader, so all readers together keep the throttle.
+
+        The lower of destination and source guard throttles applies, read on
+        every page, so changes reach streams already running.
+        """
+        if not (requests_per_second := self.effective_requests_per_second):
+            return
+        with self._pace_lock:
+            start = max(self._next_read, time.monotonic())
+            self._next_read = start + docs / requests_per_second
+        if (delay := start - time.monotonic()) > 0:
+            time.sleep(delay)
+
+    def _close_point_in_time(self, pit_id: str) -> None:
+        """
+        Close point in time, it expires by keep alive if request fails.
+        """
+        try:
+            self._source_client.close_point_in_time(pit_id=pit_id)
+        except Exception as exc:
+            logger.warning(f"Can not close point in time: {exc}")
+
+    @staticmethod
+    def _get_pit_slice(es_slice: IndexSlice) -> dict | None:
+        """
+        Return point in time slice, range slices are limited by query instead.
+        """
+        if es_slice.slices <= 1 or es_slice.query is not None:
+            return None
+        return {"id": es_slice.slice_id, "max": es_slice.slices}
+
+    @staticmethod
+    def _count_bulk_items(
+        response: dict, progress: SliceProgress, counters: dict[str, int]
+    ) -> list[int]:
+        """
+        Add bulk response items to counters, return positions of rejected ones.
+        """
+        rejected = []
+        for position, item in enumerate(response.get("items", [])):
+            result = next(iter(item.values()))
+            if "error" not in result:
+                counters["updated" if result["result"] == "updated" else "created"] += 1
+            elif result["status"] == VERSION_CONFLICT_STATUS and (
+                progress.es_slice.op_type == OP_TYPE_CREATE
+            ):
+                counters["version_conflicts"] += 1
+            elif result["status"] == TOO_MANY_REQUESTS_STATUS:
+                counters["rejected"] += 1
+                rejected.append(position)
+            else:
+                counters["failed"] += 1
+                progress.first_error = progress.first_error or str(result["error"])
+        return rejected
@@ -0,0 +1,206 @@
+"""
+Module with adaptive throttling of reindex tasks by destination pressure.
+"""
+
+from dataclasses import dataclass
+from threading import Event, Thread
+
+from elasticsearch_reindex.batching import BatchSizeController
+from elasticsearch_reindex.client import ElasticsearchClient
+from elasticsearch_reindex.const import (
+    DEFAULT_THROTTLE_MAX_RPS,
+    DEFAULT_THROTTLE_MIN_RPS,
+    DEFAULT_THROTTLE_WRITE_QUEUE,
+)
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.reindex import ReindexService
+
+logger = create_logger()
+
+
+@dataclass
+class NodesPressure:
+    """
+    Dataclass for storing write pressure summed up across cluster nodes.
+
+    Rejected, index total and index time are cumulative node counters.
+    """
+
+    write_queue: int
+    write_rejected: int
+    index_total: int
+    index_time_ms: int
+
+    @classmethod
+    def from_nodes_stats(cls, stats: dict) -> "NodesPressure":
+        """
+        Initialize NodesPressure from Nodes Stats API response.
+        """
+        pressure = cls(write_queue=0, write_rejected=0, index_total=0, index_time_ms=0)
+        for node in stats["nodes"].values():
+            write_pool = node.get("thread_pool", {}).get("write", {})
+            indexing = node.get("indices", {}).get("indexing", {})
+            pressure.write_queue += write_pool.get("queue", 0)
+            pressure.write_rejected += write_pool.get("rejected", 0)
+            pressure.index_total += indexing.get("index_total", 0)
+            pressure.index_time_ms += indexing.get("index_time_in_millis", 0)
+        return pressure
+
+    def latency_since(self, previous: "NodesPressure") -> float:
+        """
+        Return average indexing latency (ms per document) since previous sample.
+        """
+        indexed = self.index_total - previous.index_total
+        if indexed <= 0:
+            return 0.0
+        return (self.index_time_ms - previous.index_time_ms) / indexed
+
+    def rejected_since(self, previous: "NodesPressure") -> int:
+        """
+        Return amount of rejected write requests since previous sample.
+        """
+        return max(self.write_rejected - previous.write_rejected, 0)
+
+
+class ThrottleController:
+    """
+    AIMD controller of reindex `requests_per_second`.
+
+    Throttle is halved when destination rejects writes, queues them or indexing
+    latency exceeds the target, and grows by a fixed step while it stays low.
+    """
+
+    # Grow throttle only while latency is below this part of the target.
+    headroom = 0.8
+    backoff_factor = 0.5
+
+    def __init__(
+        self,
+        target_latency: float,
+        requests_per_second: float | None = None,
+        min_rps: float = DEFAULT_THROTTLE_MIN_RPS,
+        max_rps: float = DEFAULT_THROTTLE_MAX_RPS,
+        max_write_queue: int = DEFAULT_THROTTLE_WRITE_QUEUE,
+    ) -> None:
+        self.target_latency = target_latency
+        self.min_rps = min_rps
+        self.max_rps = max_rps
+        self.max_write_queue = max_write_queue
+        self.step = max((max_rps - min_rps) / 20, 1)
+        self.requests_per_second = min(
+            max(requests_per_second or max_rps, min_rps), max_rps
+        )
+
+    def update(self, previous: NodesPressure, current: NodesPressure) -> float | None:
+        """
+        Return new throttle for the pressure change or None if it is unchanged.
+        """
+        latency = current.latency_since(previous)
+        overloaded = (
+            current.rejected_since(previous) > 0
+            or current.write_queue > self.max_write_queue
+            or latency > self.target_latency
+        )
+
+        if overloaded:
+            requests_per_second = max(
+                self.requests_per_second * self.backoff_factor, self.min_rps
+            )
+        elif latency < self.target_latency * self.headroom:
+            requests_per_second = min(
+                self.requests_per_second + self.step, self.max_rps
+            )
+        else:
+            return None
+
+        if requests_per_second == self.requests_per_second:
+            return None
+
+        logger.info(
+            f"Destination indexing latency: {latency:.2f}ms, "
+            f"write queue: {current.write_queue}. "
+            f"Throttle: {self.requests_per_second:.0f} -> {requests_per_second:.0f} "
+            f"requests per second"
+        )
+        self.requests_per_second = requests_per_second
+        return requests_per_second
+
+
+class ThrottleMonitor:
+    """
+    Sample destination nodes stats, rethrottle live reindex tasks and resize
+    batches of new ones.
+    """
+
+    def __init__(
+        self,
+        es_client: ElasticsearchClient,
+        reindex_service: ReindexService,
+        controller: ThrottleController | None,
+        check_interval: int,
+        batch_controller: BatchSizeController | None = None,
+    ) -> None:
+        self._es_client = es_client
+        self._reindex_service = reindex_service
+        self._controller = controller
+        self._batch_controller = batch_controller
+        self._check_interval = check_interval
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, name="reindex-throttle", daemon=True)
+
+    def start(self) -> None:
+        """
+        Apply initial throttle to new tasks and start sampling thread.
+        """
+        if self._controller:
+            self._reindex_service.requests_per_second = (
+                self._controller.requests_per_second
+            )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling thread.
+        """
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        previous = self._sample()
+        while not self._stopped.wait(self._check_interval):
+            current = self._sample()
+            if previous is not None and current is not None:
+                self._apply(previous=previous, current=current)
+            previous = current or previous
+
+    def _sample(self) -> NodesPressure | None:
+        try:
+            return NodesPressure.from_nodes_stats(
+                stats=self._es_client.get_nodes_stats()
+            )
+        except Exception as exc:
+            logger.error(f"Can not get destination nodes stats: {exc}")
+            return None
+
+    def _apply(self, previous: NodesPressure, current: NodesPressure) -> None:
+        """
+        Resize batches and rethrottle running tasks if controller changed the throttle.
+        """
+        if self._batch_controller:
+            self._batch_controller.update(
+                latency=current.latency_since(previous),
+                rejected=current.rejected_since(previous) > 0,
+            )
+        if not self._controller:
+            return
+
+        requests_per_second = self._controller.update(
+            previous=previous, current=current
+        )
+        if requests_per_second is None:
+            return
+
+        # New tasks are created with the current throttle.
+        self._reindex_service.requests_per_second = requests_per_second
+        self._reindex_service.rethrottle_running_tasks()
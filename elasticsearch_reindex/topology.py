@@ -0,0 +1,150 @@
+"""
+Module with runs of several source and destination cluster pairs in one process.
+"""
+
+import json
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from elasticsearch_reindex.budget import ConcurrencyBudget
+from elasticsearch_reindex.const import DEFAULT_CONCURRENT_TASKS
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.manager import ReindexManager
+from elasticsearch_reindex.verify import IndexVerification
+
+logger = create_logger()
+
+T = TypeVar("T")
+
+# Options with files which are per route, so routes do not overwrite each other.
+ROUTE_FILE_OPTIONS = (
+    "state_file",
+    "tuning_journal",
+    "plan_file",
+    "verify_file",
+    "metrics_textfile",
+    "trace_file",
+    "profile_file",
+)
+
+
+def get_route_path(path: str, number: int) -> str:
+    """
+    Return path of the file of the route, e.g. `reindex.2.db`.
+    """
+    root, ext = os.path.splitext(path)
+    return f"{root}.{number}{ext}"
+
+
+def get_route_configs(base: dict, topology: dict) -> list[dict]:
+    """
+    Return settings of every route of the topology.
+
+    Route settings override settings of its clusters, which override base
+    ones. With several routes, files of base settings get the route number
+    and metrics port is incremented by it.
+    """
+    routes = topology.get("routes") or []
+    if not routes:
+        raise ValueError("Topology has no routes")
+    clusters = topology.get("clusters", {})
+    concurrent_tasks = get_total_tasks(base=base, topology=topology)
+
+    route_configs = []
+    for number, route in enumerate(routes, start=1):
+        if not route.get("source_host") or not route.get("dest_host"):
+            raise ValueError(f"Route {number} requires source_host and dest_host")
+
+        data = dict(base, concurrent_tasks=concurrent_tasks)
+        if len(routes) > 1:
+            for key in ROUTE_FILE_OPTIONS:
+                if data.get(key):
+                    data[key] = get_route_path(path=data[key], number=number)
+            if data.get("metrics_port"):
+                data["metrics_port"] += number - 1
+        for prefix in ("source", "dest"):
+            cluster = clusters.get(route[f"{prefix}_host"], {})
+            if "http_auth" in cluster:
+                data[f"{prefix}_http_auth"] = cluster["http_auth"]
+        data.update(route)
+        route_configs.append(data)
+    return route_configs
+
+
+def get_total_tasks(base: dict, topology: dict) -> int:
+    return (
+        topology.get("concurrent_tasks")
+        or base.get("concurrent_tasks")
+        or DEFAULT_CONCURRENT_TASKS
+    )
+
+
+class TopologyRunner:
+    """
+    Migrate several source to destination routes under a shared budget.
+
+    Sources consolidated into one destination (fan-in) and a source written
+    into several destinations (fan-out) are routes of the same topology.
+    Routes run concurrently, every task holds a slot of the global budget
+    and of both its clusters, so routes do not overload shared clusters.
+    """
+
+    def __init__(self, managers: list[ReindexManager]) -> None:
+        self.managers = managers
+
+    @classmethod
+    def from_dict(cls, base: dict, topology: dict) -> "TopologyRunner":
+        """
+        Initialize runner from base settings and topology with routes.
+        """
+        clusters = topology.get("clusters", {})
+        budget = ConcurrencyBudget(
+            total=get_total_tasks(base=base, topology=topology),
+            cluster_tasks=topology.get("cluster_tasks"),
+            cluster_limits={
+                host: cluster["tasks"]
+                for host, cluster in clusters.items()
+                if "tasks" in cluster
+            },
+        )
+        return cls(
+            managers=[
+                ReindexManager.from_dict(data=data, budget=budget)
+                for data in get_route_configs(base=base, topology=topology)
+            ]
+        )
+
+    @classmethod
+    def from_file(cls, base: dict, path: str) -> "TopologyRunner":
+        with open(path) as file:
+            return cls.from_dict(base=base, topology=json.load(file))
+
+    def start_reindex(self) -> None:
+        """
+        Run reindex of all routes, raise the first error after all finished.
+        """
+        self._run(method=ReindexManager.start_reindex)
+
+    def start_verify(self) -> list[IndexVerification]:
+        """
+        Verify all routes, return results of all of them.
+        """
+        results = []
+        for route_results in self._run(method=ReindexManager.start_verify):
+            results.extend(route_results)
+        return results
+
+    def _run(self, method: Callable[[ReindexManager], T]) -> list[T]:
+        with ThreadPoolExecutor(max_workers=len(self.managers)) as executor:
+            futures = [executor.submit(method, manager) for manager in self.managers]
+
+        errors = []
+        for number, future in enumerate(futures, start=1):
+            if exc := future.exception():
+                logger.error(f"Route {number} failed: {exc}")
+                errors.append(exc)
+        if errors:
+            raise errors[0]
+        return [future.result() for future in futures]
@@ -0,0 +1,125 @@
+"""
+Module with tracing of reindex phases in Chrome trace format.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import count
+from typing import Any
+
+from elasticsearch_reindex.logger import create_logger
+
+logger = create_logger()
+
+
+class Tracer:
+    """
+    Recorder of spans with durations and counts of reindex phases.
+
+    Spans are written as async begin/end event pairs of Chrome trace format,
+    so spans overlapping on one thread, e.g. tasks of the asyncio engine, are
+    shown correctly by `chrome://tracing` and Perfetto. Disabled tracer
+    records nothing.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._ids = count(1)
+        self._events: list[dict[str, Any]] = []
+        self._threads: dict[int, str] = {}
+        # Amount and total duration (seconds) of spans by name.
+        self._totals: dict[str, tuple[int, float]] = defaultdict(lambda: (0, 0.0))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    @contextmanager
+    def span(
+        self, name: str, category: str = "phase", **args: Any
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Record span of the block, counts can be added to the yielded args.
+        """
+        started = self.now()
+        try:
+            yield args
+        except BaseException as exc:
+            args["error"] = type(exc).__name__
+            raise
+        finally:
+            self.add_span(
+                name=name,
+                started=started,
+                finished=self.now(),
+                category=category,
+                **args,
+            )
+
+    def add_span(
+        self,
+        name: str,
+        started: float,
+        finished: float,
+        category: str = "phase",
+        **args: Any,
+    ) -> None:
+        """
+        Record span measured elsewhere, e.g. started and finished on other threads.
+        """
+        if not self.enabled:
+            return
+        thread_id = threading.get_ident()
+        event = {"name": name, "cat": category, "pid": self._pid, "tid": thread_id}
+        with self._lock:
+            span_id = next(self._ids)
+            self._threads[thread_id] = threading.current_thread().name
+            spans, seconds = self._totals[name]
+            self._totals[name] = (spans + 1, seconds + finished - started)
+            self._events.append(
+                dict(event, ph="b", id=span_id, ts=self._get_ts(started), args=args)
+            )
+            self._events.append(
+                dict(event, ph="e", id=span_id, ts=self._get_ts(finished))
+            )
+
+    def get_totals(self) -> dict[str, tuple[int, float]]:
+        """
+        Return amount and total duration (seconds) of spans by name.
+        """
+        with self._lock:
+            return dict(self._totals)
+
+    def write(self, path: str) -> None:
+        """
+        Write recorded spans to JSON trace file.
+        """
+        with self._lock:
+            events = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self._threads.items()
+            ]
+            events.extend(self._events)
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+        logger.info(f"Trace written to {path}")
+
+    def _get_ts(self, moment: float) -> float:
+        """
+        Return microseconds since the tracer creation.
+        """
+        return round((moment - self._origin) * 1e6, 1)
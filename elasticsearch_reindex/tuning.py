@@ -0,0 +1,216 @@
+"""
+Module with destination indexes tuning for bulk load and its restore.
+"""
+
+import json
+import os
+from collections import Counter
+from threading import Lock
+
+from elasticsearch_reindex.client import ElasticsearchClient
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.schema import IndexSlice
+
+logger = create_logger()
+
+# Settings changed for the time of reindex and restored afterwards.
+TUNED_SETTINGS = ("index.refresh_interval", "index.number_of_replicas")
+BULK_LOAD_SETTINGS = {"index.refresh_interval": "-1", "index.number_of_replicas": 0}
+
+# Source index settings which can not be copied to a new index.
+PRIVATE_INDEX_SETTINGS = (
+    "uuid",
+    "creation_date",
+    "provided_name",
+    "version",
+    "resize",
+    "routing",
+    "history_uuid",
+    "verified_before_close",
+    "blocks",
+    "lifecycle",
+)
+
+
+class TuningJournal:
+    """
+    Local journal of original destination settings.
+
+    Original settings are written before an index is tuned, so indexes of
+    a killed run are restored by the next one.
+    """
+
+    def __init__(self, path: str, es_host: str) -> None:
+        self.path = path
+        self.es_host = es_host
+        self._lock = Lock()
+
+    def add(self, es_index: str, settings: dict) -> None:
+        """
+        Record original settings of the index.
+        """
+        with self._lock:
+            entries = self._read()
+            entries[self._key(es_index)] = {
+                "host": self.es_host,
+                "index": es_index,
+                "settings": settings,
+            }
+            self._write(entries=entries)
+
+    def remove(self, es_index: str) -> None:
+        """
+        Remove restored index from the journal.
+        """
+        with self._lock:
+            entries = self._read()
+            entries.pop(self._key(es_index), None)
+            self._write(entries=entries)
+
+    def pending(self) -> dict[str, dict]:
+        """
+        Return original settings of not restored indexes of the host.
+        """
+        with self._lock:
+            entries = self._read()
+        return {
+            entry["index"]: entry["settings"]
+            for entry in entries.values()
+            if entry["host"] == self.es_host
+        }
+
+    def _key(self, es_index: str) -> str:
+        return f"{self.es_host}/{es_index}"
+
+    def _read(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as journal:
+            return json.load(journal)
+
+    def _write(self, entries: dict) -> None:
+        if not entries:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+
+        # Replace the journal atomically, so it is never left half-written.
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as journal:
+            json.dump(entries, journal, indent=2)
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class IndexTuner:
+    """
+    Prepare destination indexes for bulk load and restore them afterwards.
+
+    Before the first slice of an index is transferred, the index is created
+    with mappings and settings of the source index (if it does not exist),
+    refresh is disabled and replicas are removed. After the last slice the
+    original values are restored, index is optionally force merged and
+    waited for green status.
+    """
+
+    def __init__(
+        self,
+        source_client: ElasticsearchClient,
+        dest_client: ElasticsearchClient,
+        journal: TuningJournal,
+        force_merge: bool = False,
+    ) -> None:
+        self._source_client = source_client
+        self._dest_client = dest_client
+        self._journal = journal
+        self._force_merge = force_merge
+
+        self._slices_left: Counter = Counter()
+        self._prepared: set[str] = set()
+        self._lock = Lock()
+
+    def register(self, index_slices: list[IndexSlice]) -> None:
+        """
+        Register slices which will be transferred.
+        """
+        with self._lock:
+            self._slices_left.update(es_slice.index for es_slice in index_slices)
+
+    def before_slice(self, es_slice: IndexSlice) -> None:
+        """
+        Prepare the index before its first slice is transferred.
+        """
+        with self._lock:
+            if es_slice.index in self._prepared:
+                return
+            self._prepared.add(es_slice.index)
+        self.prepare(es_index=es_slice.index)
+
+    def after_slice(self, es_slice: IndexSlice) -> bool:
+        """
+        Mark slice as finished, return True when the whole index is finished.
+        """
+        with self._lock:
+            self._slices_left[es_slice.index] -= 1
+            return self._slices_left[es_slice.index] <= 0
+
+    def prepare(self, es_index: str) -> None:
+        """
+        Create destination index if needed and apply bulk load settings.
+        """
+        if not self._dest_client.index_exists(es_index=es_index):
+            self._copy_index(es_index=es_index)
+
+        original = self._dest_client.get_index_settings(
+            es_index=es_index, names=TUNED_SETTINGS
+        )
+        self._journal.add(es_index=es_index, settings=original)
+        self._dest_client.put_index_settings(
+            es_index=es_index, settings=BULK_LOAD_SETTINGS
+        )
+        logger.info(f"Index: {es_index} tuned for bulk load, original: {original}")
+
+    def restore(self, es_index: str) -> None:
+        """
+        Restore original settings of the index recorded in the journal.
+        """
+        original = self._journal.pending().get(es_index)
+        if original is None:
+            return
+
+        self._dest_client.put_index_settings(es_index=es_index, settings=original)
+        if self._force_merge:
+            self._dest_client.force_merge(es_index=es_index)
+        self._journal.remove(es_index=es_index)
+        logger.info(f"Index: {es_index} settings restored: {original}")
+
+        if not self._dest_client.wait_for_green(es_index=es_index):
+            logger.warning(f"Index: {es_index} did not reach green status")
+
+    def restore_pending(self) -> None:
+        """
+        Restore all indexes left tuned, e.g. by a killed run.
+        """
+        for es_index in self._journal.pending():
+            try:
+                self.restore(es_index=es_index)
+            except Exception as exc:
+                logger.error(f"Index: {es_index} settings restore failed: {exc}")
+
+    def _copy_index(self, es_index: str) -> None:
+        """
+        Create destination index with mappings and settings of source index.
+        """
+        definition = self._source_client.get_index_definition(es_index=es_index)
+        settings = {
+            key: value
+            for key, value in definition["settings"].get("index", {}).items()
+            if key not in PRIVATE_INDEX_SETTINGS
+        }
+        self._dest_client.create_index(
+            es_index=es_index,
+            mappings=definition["mappings"],
+            settings={"index": settings},
+        )
+        logger.info(f"Index: {es_index} created with source mappings and settings")
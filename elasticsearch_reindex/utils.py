@@ -1,7 +1,7 @@
 from collections.abc import Iterable
 
 from elasticsearch_reindex.logger import create_logger
-from elasticsearch_reindex.schema import Index
+from elasticsearch_reindex.schema import Index, IndexSlice
 
 logger = create_logger()
 
@@ -14,6 +14,30 @@ def chunkify(lst: list, n: int) -> Iterable:
     yield from (lst[slice(i, i + n)] for i in range(0, len(lst), n))
 
 
+def format_bytes(size: float) -> str:
+    """
+    Return human readable representation of bytes amount.
+    """
+    for unit in ("b", "kb", "mb", "gb", "tb"):
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}pb"
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Return human readable representation of duration.
+    """
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
 def _get_flatten_dict(data: list[Index]) -> dict:
     """
     Convert list of dataclasses to dict for fast searching.
@@ -41,3 +65,88 @@ def check_migrated_indexes(
             not_migrated.append(index)
 
     return not_migrated, partial_migrated
+
+
+def get_range_query(
+    field: str, lower: float, upper: float, first: bool, last: bool
+) -> dict:
+    """
+    Return range query for a single slice or bucket.
+
+    The last slice includes upper bound, the first one also picks up documents
+    without slicing field, so no document is lost between slices.
+    """
+    bounds = {"gte": lower, "lte" if last else "lt": upper}
+    query: dict = {"range": {field: bounds}}
+    if first:
+        missing_field = {"bool": {"must_not": {"exists": {"field": field}}}}
+        query = {"bool": {"should": [query, missing_field], "minimum_should_match": 1}}
+    return query
+
+
+def get_delta_query(field: str, watermark: float) -> dict:
+    """
+    Return query for documents changed since the high-water mark.
+
+    Documents equal to the mark are transferred again, as more of them could
+    be written after the mark was taken.
+    """
+    if float(watermark).is_integer():
+        watermark = int(watermark)
+    return {"range": {field: {"gte": watermark}}}
+
+
+def get_range_bounds(min_value: float, max_value: float, parts: int) -> list[float]:
+    """
+    Return bounds of `parts` equal ranges between min and max values.
+    """
+    step = (max_value - min_value) / parts
+    bounds: list[float] = [min_value + step * i for i in range(parts)] + [max_value]
+    if float(min_value).is_integer() and float(max_value).is_integer():
+        # Dates and integer fields are compared as whole numbers.
+        bounds = [int(bound) for bound in bounds]
+    return bounds
+
+
+def build_range_slices(
+    es_index: str, field: str, min_value: float, max_value: float, slices: int
+) -> list[IndexSlice]:
+    """
+    Split index into `slices` parts by range over numeric or date field.
+
+    Remote reindex does not support `slice` parameter, so every part is
+    described by range query and transferred by separate reindex task.
+    """
+    if slices <= 1 or min_value >= max_value:
+        return [IndexSlice(index=es_index)]
+
+    bounds = get_range_bounds(min_value=min_value, max_value=max_value, parts=slices)
+    return [
+        IndexSlice(
+            index=es_index,
+            slice_id=i,
+            slices=slices,
+            query=get_range_query(
+                field=field,
+                lower=bounds[i],
+                upper=bounds[i + 1],
+                first=i == 0,
+                last=i == slices - 1,
+            ),
+        )
+        for i in range(slices)
+    ]
+
+
+def build_pit_slices(es_index: str, slices: int) -> list[IndexSlice]:
+    """
+    Split index into `slices` parts read by sliced point in time search.
+
+    Streaming engine reads the source itself, so unlike remote reindex it
+    does not need a range field: parts are slices of the point in time.
+    """
+    if slices <= 1:
+        return [IndexSlice(index=es_index)]
+    return [
+        IndexSlice(index=es_index, slice_id=i, slices=slices) for i in range(slices)
+    ]
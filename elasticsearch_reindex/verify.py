@@ -0,0 +1,296 @@
+"""
+Module with verification of migrated indexes by bucket counts and sampled hashes.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+from elasticsearch_reindex.client import ElasticsearchClient
+from elasticsearch_reindex.const import DEFAULT_VERIFY_MIN_DOCS, VERIFY_SAMPLE_SEED
+from elasticsearch_reindex.logger import create_logger
+from elasticsearch_reindex.utils import get_range_bounds, get_range_query
+
+logger = create_logger()
+
+
+def get_source_hash(source: dict) -> str:
+    """
+    Return hash of document source, independent of keys order.
+    """
+    data = json.dumps(source, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+@dataclass
+class VerifyRange:
+    """
+    Dataclass for storing range of verified field, a bucket or its part.
+    """
+
+    lower: float
+    upper: float
+    # The first range also holds documents without the field, the last one
+    # includes upper bound.
+    first: bool
+    last: bool
+
+    def get_query(self, field: str) -> dict:
+        return get_range_query(
+            field=field,
+            lower=self.lower,
+            upper=self.upper,
+            first=self.first,
+            last=self.last,
+        )
+
+    def split(self) -> list["VerifyRange"]:
+        """
+        Return two halves of the range, nothing if it can not be split.
+        """
+        if float(self.lower).is_integer() and float(self.upper).is_integer():
+            middle: float = (int(self.lower) + int(self.upper)) // 2
+        else:
+            middle = (self.lower + self.upper) / 2
+        if not self.lower < middle < self.upper:
+            return []
+        return [
+            VerifyRange(lower=self.lower, upper=middle, first=self.first, last=False),
+            VerifyRange(lower=middle, upper=self.upper, first=False, last=self.last),
+        ]
+
+
+@dataclass
+class RangeMismatch:
+    """
+    Dataclass for storing range with different amount of documents.
+
+    Query selects documents of the range, so it can be re-copied as a slice.
+    Range without bounds is the whole index.
+    """
+
+    lower: float | None
+    upper: float | None
+    query: dict | None
+    source_docs: int
+    dest_docs: int
+
+
+@dataclass
+class IndexVerification:
+    """
+    Dataclass for storing result of index verification.
+    """
+
+    index: str
+    field: str | None
+    source_docs: int
+    dest_docs: int
+    buckets: int
+    sampled_docs: int = 0
+    ranges: list[RangeMismatch] = field(default_factory=list)
+    # Sampled documents missing on destination or with different source.
+    missing_ids: list[str] = field(default_factory=list)
+    different_ids: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.ranges and not self.missing_ids and not self.different_ids
+
+
+class IndexVerifier:
+    """
+    Compare index on source and destination without reading all documents.
+
+    Documents are split into range buckets of the verified field and counted
+    on both clusters by a single filters aggregation. Ranges with different
+    counts are bisected until they hold at most `min_docs` source documents.
+    In buckets with equal counts a seeded random sample of source documents
+    is looked up on destination by ID and compared by source hash.
+    Without the field the whole index is a single bucket.
+    """
+
+    def __init__(
+        self,
+        source_client: ElasticsearchClient,
+        dest_client: ElasticsearchClient,
+        field: str | None,
+        buckets: int,
+        sample_docs: int,
+        min_docs: int = DEFAULT_VERIFY_MIN_DOCS,
+    ) -> None:
+        self.source_client = source_client
+        self.dest_client = dest_client
+        self.field = field
+        self.buckets = buckets
+        self.sample_docs = sample_docs
+        self.min_docs = min_docs
+
+    def verify(self, es_index: str) -> IndexVerification:
+        """
+        Return ranges and sampled documents of the index which differ.
+        """
+        ranges = self._get_ranges(es_index=es_index)
+        source_counts, dest_counts = self._count(es_index=es_index, ranges=ranges)
+        result = IndexVerification(
+            index=es_index,
+            field=self.field if ranges[0] is not None else None,
+            source_docs=self.source_client.count_documents(es_index=es_index),
+            dest_docs=self.dest_client.count_documents(es_index=es_index),
+            buckets=len(ranges),
+        )
+        for verify_range, source_docs, dest_docs in zip(
+            ranges, source_counts, dest_counts
+        ):
+            if source_docs != dest_docs:
+                result.ranges.extend(
+                    self._bisect(
+                        es_index=es_index,
+                        verify_range=verify_range,
+                        source_docs=source_docs,
+                        dest_docs=dest_docs,
+                    )
+                )
+            elif source_docs and self.sample_docs:
+                self._compare_sample(
+                    es_index=es_index, verify_range=verify_range, result=result
+                )
+
+        if result.source_docs != result.dest_docs and not result.ranges:
+            # Destination documents with field values out of the source range.
+            result.ranges.append(
+                self._get_mismatch(
+                    verify_range=None,
+                    source_docs=result.source_docs,
+                    dest_docs=result.dest_docs,
+                )
+            )
+        return result
+
+    def _get_ranges(self, es_index: str) -> list[VerifyRange | None]:
+        """
+        Return buckets over the range of field values on source.
+        """
+        if not self.field:
+            return [None]
+        field_range = self.source_client.get_field_range(
+            es_index=es_index, field=self.field
+        )
+        if field_range is None:
+            return [None]
+
+        min_value, max_value = field_range
+        if min_value >= max_value:
+            return [
+                VerifyRange(lower=min_value, upper=max_value, first=True, last=True)
+            ]
+        # Narrow ranges of whole numbers may repeat bounds.
+        bounds = list(
+            dict.fromkeys(
+                get_range_bounds(
+                    min_value=min_value, max_value=max_value, parts=self.buckets
+                )
+            )
+        )
+        return [
+            VerifyRange(
+                lower=bounds[i],
+                upper=bounds[i + 1],
+                first=i == 0,
+                last=i == len(bounds) - 2,
+            )
+            for i in range(len(bounds) - 1)
+        ]
+
+    def _get_query(self, verify_range: VerifyRange | None) -> dict | None:
+        if verify_range is None or not self.field:
+            return None
+        return verify_range.get_query(field=self.field)
+
+    def _count(
+        self, es_index: str, ranges: list[VerifyRange | None]
+    ) -> tuple[list[int], list[int]]:
+        """
+        Return documents of every range on source and destination.
+        """
+        queries = [
+            self._get_query(verify_range=verify_range) or {"match_all": {}}
+            for verify_range in ranges
+        ]
+        return (
+            self.source_client.count_buckets(es_index=es_index, queries=queries),
+            self.dest_client.count_buckets(es_index=es_index, queries=queries),
+        )
+
+    def _bisect(
+        self,
+        es_index: str,
+        verify_range: VerifyRange | None,
+        source_docs: int,
+        dest_docs: int,
+    ) -> list[RangeMismatch]:
+        """
+        Narrow range with different counts down to the smallest differing ones.
+        """
+        halves = []
+        if verify_range is not None and max(source_docs, dest_docs) > self.min_docs:
+            halves = verify_range.split()
+        if not halves:
+            return [
+                self._get_mismatch(
+                    verify_range=verify_range,
+                    source_docs=source_docs,
+                    dest_docs=dest_docs,
+                )
+            ]
+
+        mismatches = []
+        source_counts, dest_counts = self._count(es_index=es_index, ranges=halves)
+        for half, half_source_docs, half_dest_docs in zip(
+            halves, source_counts, dest_counts
+        ):
+            if half_source_docs != half_dest_docs:
+                mismatches.extend(
+                    self._bisect(
+                        es_index=es_index,
+                        verify_range=half,
+                        source_docs=half_source_docs,
+                        dest_docs=half_dest_docs,
+                    )
+                )
+        return mismatches
+
+    def _compare_sample(
+        self, es_index: str, verify_range: VerifyRange | None, result: IndexVerification
+    ) -> None:
+        """
+        Compare hashes of random source documents of the range with destination.
+        """
+        sources = self.source_client.get_random_documents(
+            es_index=es_index,
+            query=self._get_query(verify_range=verify_range),
+            size=self.sample_docs,
+            seed=VERIFY_SAMPLE_SEED,
+        )
+        if not sources:
+            return
+        dest_sources = self.dest_client.get_documents(
+            es_index=es_index, ids=list(sources)
+        )
+        result.sampled_docs += len(sources)
+        for doc_id, source in sources.items():
+            if (dest_source := dest_sources.get(doc_id)) is None:
+                result.missing_ids.append(doc_id)
+            elif get_source_hash(source=dest_source) != get_source_hash(source=source):
+                result.different_ids.append(doc_id)
+
+    def _get_mismatch(
+        self, verify_range: VerifyRange | None, source_docs: int, dest_docs: int
+    ) -> RangeMismatch:
+        return RangeMismatch(
+            lower=verify_range.lower if verify_range else None,
+            upper=verify_range.upper if verify_range else None,
+            query=self._get_query(verify_range=verify_range),
+            source_docs=source_docs,
+            dest_docs=dest_docs,
+        )
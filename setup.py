@@ -16,6 +16,7 @@ with open("README.md") as read_me:
 packages = [package for package in find_packages(where=".", exclude=("test*",))]
 
 install_requires = ["click>8", "elasticsearch>7", "requests>=2.32.3"]
+extras_require = {"async": ["aiohttp>=3.9"], "fast": ["pysimdjson>=7.0", "orjson>=3.9"]}
 
 setup(
     name=project_name,
@@ -36,6 +37,7 @@ setup(
     package_data={package_name: ["py.typed"]},
     include_package_data=True,
     install_requires=install_requires,
+    extras_require=extras_require,
     python_requires=">=3.10",
     classifiers=[
         "License :: OSI Approved :: MIT License",
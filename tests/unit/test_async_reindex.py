@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+import aiohttp
+import pytest
+
+from elasticsearch_reindex.async_reindex import AsyncReindexService
+from elasticsearch_reindex.schema import Config, IndexSlice
+
+
+@pytest.fixture
+def service() -> AsyncReindexService:
+    config = Config(
+        source_host="http://source:9200",
+        dest_host="http://dest:9200",
+        source_http_auth=None,
+        dest_http_auth=None,
+        indexes=None,
+        check_interval=0,
+    )
+    return AsyncReindexService(config=config)
+
+
+async def _wait_polled(service: AsyncReindexService, task_id: str) -> str:
+    future = asyncio.get_running_loop().create_future()
+    service._waiters[task_id] = (IndexSlice(index="index1"), future)
+    service._update_task_ids()
+    poll_task = asyncio.create_task(service._poll_tasks())
+    try:
+        return await asyncio.wait_for(future, timeout=5)
+    finally:
+        poll_task.cancel()
+        await asyncio.gather(poll_task, return_exceptions=True)
+
+
+def test_poll_survives_failing_progress(service: AsyncReindexService):
+    polls = []
+
+    async def list_tasks() -> dict[str, dict[str, int]]:
+        polls.append(None)
+        if len(polls) == 1:
+            return {"node:1": {"total": 10, "created": 5}}
+        return {}
+
+    async def check_task(task_id: str) -> tuple[bool, dict[str, int]]:
+        return True, {"total": 10, "created": 10}
+
+    def on_progress(task_id: str, es_slice: IndexSlice, info: dict) -> None:
+        raise RuntimeError("State store is unavailable")
+
+    service._list_reindex_tasks_async = list_tasks
+    service._check_task_completed_async = check_task
+    service._on_task_progress = on_progress
+
+    task_id = asyncio.run(_wait_polled(service=service, task_id="node:1"))
+
+    assert task_id == "node:1"
+    assert len(polls) == 2
+    assert service.running_tasks == []
+
+
+def test_poll_survives_unexpected_error(service: AsyncReindexService):
+    poll_once = service._poll_once
+    polls = []
+
+    async def failing_poll_once() -> None:
+        polls.append(None)
+        if len(polls) == 1:
+            raise KeyError("node:1")
+        await poll_once()
+
+    async def list_tasks() -> dict[str, dict[str, int]]:
+        return {}
+
+    async def check_task(task_id: str) -> tuple[bool, dict[str, int]]:
+        return True, {"total": 1, "created": 1}
+
+    service._poll_once = failing_poll_once
+    service._list_reindex_tasks_async = list_tasks
+    service._check_task_completed_async = check_task
+
+    assert asyncio.run(_wait_polled(service=service, task_id="node:1")) == "node:1"
+    assert len(polls) == 2
+
+
+def test_running_tasks_from_other_thread(service: AsyncReindexService):
+    seen = []
+
+    async def list_tasks() -> dict[str, dict[str, int]]:
+        # Throttle monitor reads running tasks from its thread.
+        thread = threading.Thread(target=lambda: seen.append(service.running_tasks))
+        thread.start()
+        thread.join()
+        return {}
+
+    async def check_task(task_id: str) -> tuple[bool, dict[str, int]]:
+        return True, {"total": 1, "created": 1}
+
+    service._list_reindex_tasks_async = list_tasks
+    service._check_task_completed_async = check_task
+
+    asyncio.run(_wait_polled(service=service, task_id="node:1"))
+
+    assert seen == [["node:1"]]
+    assert service.running_tasks == []
+
+
+def test_poll_fails_task_with_unknown_status(service: AsyncReindexService):
+    service.max_check_errors = 2
+
+    async def list_tasks() -> dict[str, dict[str, int]]:
+        raise aiohttp.ClientConnectionError("Destination is unavailable")
+
+    service._list_reindex_tasks_async = list_tasks
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(_wait_polled(service=service, task_id="node:1"))
+
+    assert service.running_tasks == []
+    # Test case: tasks are polled by the event loop, not by the threaded poller.
+    assert service._poller is None
@@ -0,0 +1,71 @@
+from elasticsearch_reindex.batching import BatchSizeController, get_avg_doc_size
+from elasticsearch_reindex.schema import IndexSlice
+
+
+def _get_slice(docs_count: int = 1000, store_size: int = 1000 * 1024) -> IndexSlice:
+    return IndexSlice(index="index", docs_count=docs_count, store_size=store_size)
+
+
+def test_avg_doc_size():
+    assert get_avg_doc_size(es_slice=_get_slice()) == 1024
+    assert get_avg_doc_size(es_slice=_get_slice(docs_count=0)) == 0
+
+
+def test_get_size_by_avg_doc_size():
+    controller = BatchSizeController(target_bytes=1024 * 1024)
+    assert controller.get_size(es_slice=_get_slice()) == 1024
+
+
+def test_get_size_clamped():
+    controller = BatchSizeController(target_bytes=1024, min_size=10, max_size=100)
+    assert controller.get_size(es_slice=_get_slice(store_size=1000 * 1000)) == 10
+    assert controller.get_size(es_slice=_get_slice(store_size=1000)) == 100
+    assert controller.get_size(es_slice=_get_slice(docs_count=0)) == 100
+
+
+def test_get_size_of_unknown_doc_size():
+    controller = BatchSizeController(target_bytes=1000)
+    es_slice = _get_slice(docs_count=0)
+    # Test case: ES default batch size, shrunk and grown by the controller.
+    assert controller.get_size(es_slice=es_slice) == 1000
+    controller.update(latency=1.0, rejected=True)
+    assert controller.get_size(es_slice=es_slice) == 500
+    controller.update(latency=1.0, rejected=False)
+    assert controller.get_size(es_slice=es_slice) == 750
+
+
+def test_grow_while_latency_flat():
+    controller = BatchSizeController(target_bytes=1000)
+    for _ in range(3):
+        controller.update(latency=1.0, rejected=False)
+    assert controller.batch_bytes == 1750
+
+
+def test_grow_up_to_max():
+    controller = BatchSizeController(target_bytes=1000)
+    for _ in range(100):
+        controller.update(latency=1.0, rejected=False)
+    assert controller.batch_bytes == controller.max_bytes
+
+
+def test_backoff_on_rejection():
+    controller = BatchSizeController(target_bytes=1000)
+    controller.update(latency=1.0, rejected=True)
+    assert controller.batch_bytes == 500
+    for _ in range(10):
+        controller.update(latency=1.0, rejected=True)
+    assert controller.batch_bytes == controller.min_bytes
+
+
+def test_backoff_on_latency_rise():
+    controller = BatchSizeController(target_bytes=1000)
+    controller.update(latency=1.0, rejected=False)
+    controller.update(latency=3.0, rejected=False)
+    assert controller.batch_bytes == 625
+
+
+def test_hold_on_moderate_latency_rise():
+    controller = BatchSizeController(target_bytes=1000)
+    controller.update(latency=1.0, rejected=False)
+    controller.update(latency=1.3, rejected=False)
+    assert controller.batch_bytes == 1250
@@ -0,0 +1,70 @@
+from argparse import Namespace
+
+from benchmarks import bulk_body
+from benchmarks.orchestration import compare, get_ideal_makespan, run_case
+from elasticsearch_reindex import bulk
+
+
+def test_ideal_makespan():
+    assert get_ideal_makespan(tasks=10, workers=10, duration=2.0) == 2.0
+    assert get_ideal_makespan(tasks=11, workers=10, duration=2.0) == 4.0
+    assert get_ideal_makespan(tasks=0, workers=10, duration=2.0) == 0.0
+
+
+def test_compare_with_baseline():
+    baseline = {
+        "results": [
+            {
+                "indexes": 10,
+                "requests_per_task": 4.0,
+                "peak_threads": 10,
+                "poll_latency_p95": 0.1,
+                "makespan_overhead": 0.5,
+            }
+        ]
+    }
+    result = dict(
+        baseline["results"][0],
+        requests_per_task=6.0,
+        peak_threads=11,
+        poll_latency_p95=0.13,
+    )
+    # Test case: small absolute changes are noise, sizes not in baseline are skipped.
+    results = [result, dict(result, indexes=100)]
+
+    regressions = compare(results=results, baseline=baseline, tolerance=0.2)
+
+    assert regressions == ["10 indexes: requests_per_task 4.000 -> 6.000"]
+    assert compare(results=results[:1], baseline=baseline, tolerance=1.0) == []
+
+
+def test_orchestration_smoke():
+    args = Namespace(
+        docs=100,
+        doc_rate=100000.0,
+        latency=0.0,
+        concurrent_tasks=2,
+        check_interval=0.01,
+        engine="thread",
+    )
+
+    result = run_case(indexes=5, args=args)
+
+    assert result["tasks"] == 5
+    assert result["requests"]["POST /_reindex"] == 5
+    assert result["requests_per_task"] > 0
+    assert result["makespan"] >= result["ideal_makespan"]
+
+
+def test_bulk_body_smoke(capsys):
+    available = bulk.HAS_SIMDJSON, bulk.HAS_ORJSON
+
+    bulk_body.main(["--docs", "10", "--doc_size", "64", "--rounds", "1"])
+
+    lines = capsys.readouterr().out.splitlines()
+    names = [name for name, _, _ in bulk_body.get_backends()]
+    assert [line.split()[0] for line in lines[1:]] == ["dicts"] + [
+        f"raw/{name}" for name in names
+    ]
+    # Flags of available backends are restored for the stream engine.
+    assert (bulk.HAS_SIMDJSON, bulk.HAS_ORJSON) == available
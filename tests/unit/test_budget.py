@@ -0,0 +1,76 @@
+import time
+from threading import Thread
+
+from elasticsearch_reindex.budget import ConcurrencyBudget, TaskLimit, TaskSlots
+
+
+def _start_waiter(budget: ConcurrencyBudget, source: str, dest: str) -> Thread:
+    thread = Thread(target=budget.acquire, kwargs={"source": source, "dest": dest})
+    thread.start()
+    return thread
+
+
+def _wait_for(condition, timeout: float = 2) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_cluster_limit():
+    budget = ConcurrencyBudget(total=4, cluster_limits={"dest": 1})
+    budget.acquire(source="a", dest="dest")
+    waiter = _start_waiter(budget=budget, source="b", dest="dest")
+    # Test case: other destination is not blocked by the busy one.
+    budget.acquire(source="b", dest="other")
+    assert waiter.is_alive()
+
+    budget.release(source="a", dest="dest")
+    waiter.join(timeout=2)
+    assert not waiter.is_alive()
+    assert budget.get_running(cluster="b") == 2
+
+
+def test_least_loaded_destination_first():
+    budget = ConcurrencyBudget(total=4)
+    for _ in range(3):
+        budget.acquire(source="a", dest="busy")
+    budget.acquire(source="b", dest="idle")
+    busy_waiter = _start_waiter(budget=budget, source="c", dest="busy")
+    idle_waiter = _start_waiter(budget=budget, source="d", dest="idle")
+    assert _wait_for(lambda: sum(budget._waiting.values()) == 2)
+
+    budget.release(source="a", dest="busy")
+    idle_waiter.join(timeout=2)
+    assert not idle_waiter.is_alive()
+    assert busy_waiter.is_alive()
+
+    budget.release(source="b", dest="idle")
+    busy_waiter.join(timeout=2)
+    assert not busy_waiter.is_alive()
+
+
+def test_task_slots_join():
+    budget = ConcurrencyBudget(total=2)
+    slots = TaskSlots(workers=2, budget=budget, source="a", dest="b")
+    slots.acquire()
+    slots.release()
+    slots.join()
+    assert budget.get_running(cluster="b") == 0
+
+
+def test_task_limit_pause_and_resume():
+    limit = TaskLimit(limit=1)
+    limit.acquire()
+    waiter = Thread(target=limit.acquire)
+    waiter.start()
+    # Test case: lowered limit keeps waiting after running task finished.
+    limit.set_limit(limit=0)
+    limit.release()
+    assert not _wait_for(lambda: not waiter.is_alive(), timeout=0.2)
+
+    limit.set_limit(limit=2)
+    assert _wait_for(lambda: not waiter.is_alive())
+    assert limit.running == 1
@@ -0,0 +1,64 @@
+import json
+
+from elasticsearch_reindex.bulk import BulkBuffer, SearchPageDecoder
+
+SEARCH_RESPONSE = {
+    "pit_id": "pit:2",
+    "hits": {
+        "hits": [
+            {"_id": "1", "_source": {"title": 'a "quoted" é'}, "sort": [10]},
+            {
+                "_id": "2",
+                "_routing": "user1",
+                "_source": {"nested": [1, {}]},
+                "sort": [11],
+            },
+        ]
+    },
+}
+
+
+def test_bulk_buffer():
+    buffer = BulkBuffer()
+    buffer.add(
+        action="index", es_index="index1", doc_id="1", routing=None, source=b"{}"
+    )
+    buffer.add(
+        action="create", es_index="index1", doc_id='a"b', routing="r", source=b'{"x":1}'
+    )
+    with buffer.getbuffer() as body:
+        lines = [json.loads(line) for line in bytes(body).splitlines()]
+
+    assert lines == [
+        {"index": {"_index": "index1", "_id": "1"}},
+        {},
+        {"create": {"_index": "index1", "_id": 'a"b', "routing": "r"}},
+        {"x": 1},
+    ]
+
+    # Test case: cleared buffer is reused for the next request.
+    buffer.clear()
+    assert len(buffer) == 0
+    buffer.add(
+        action="index", es_index="index1", doc_id="2", routing=None, source=b"{}"
+    )
+    assert len(buffer) > 0
+
+
+def test_search_page_decoder():
+    decoder = SearchPageDecoder()
+    body = json.dumps(SEARCH_RESPONSE).encode()
+
+    for page in (decoder.decode(body=body), decoder._decode_full(body=body)):
+        assert page.pit_id == "pit:2"
+        assert page.search_after == [11]
+        assert [(doc_id, routing) for doc_id, routing, _ in page.hits] == [
+            ("1", None),
+            ("2", "user1"),
+        ]
+        sources = [json.loads(source) for _, _, source in page.hits]
+        assert sources == [hit["_source"] for hit in SEARCH_RESPONSE["hits"]["hits"]]
+
+    # Test case: empty page ends the stream.
+    page = decoder.decode(body=b'{"pit_id": "pit:3", "hits": {"hits": []}}')
+    assert (page.hits, page.search_after) == ([], None)
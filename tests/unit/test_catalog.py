@@ -0,0 +1,147 @@
+from elasticsearch import exceptions
+
+from elasticsearch_reindex.catalog import IndexCatalog
+from elasticsearch_reindex.client import ElasticsearchClient
+from elasticsearch_reindex.schema import Index
+
+
+class FakeCatClient(ElasticsearchClient):
+    """
+    Client listing fixed indexes, missing names raise like `_cat/indices`.
+    """
+
+    def __init__(self, names: list[str]) -> None:
+        self.names = names
+        self.expressions: list[str | None] = []
+
+    def _cat_indexes(self, expression: str | None) -> list[Index]:
+        self.expressions.append(expression)
+        if expression is None:
+            names = self.names
+        else:
+            names = []
+            for name in expression.split(","):
+                if name.endswith("*"):
+                    names.extend(n for n in self.names if n.startswith(name[:-1]))
+                elif name in self.names:
+                    names.append(name)
+                else:
+                    raise exceptions.NotFoundError(
+                        message="index_not_found_exception", meta=None, body={}
+                    )
+        return [Index(name=name, docs_count=1, store_size=10) for name in names]
+
+
+def _get_client() -> FakeCatClient:
+    return FakeCatClient(names=[".kibana", "logs-1", "logs-2", "metrics", "users"])
+
+
+def test_parse_indexes():
+    rows = [
+        {"index": "logs", "docs.count": "10", "store.size": "2048"},
+        # Test case: closed index has no counters.
+        {"index": "closed", "docs.count": None, "store.size": None},
+    ]
+    assert ElasticsearchClient._parse_indexes(indexes=rows) == [
+        Index(name="logs", docs_count=10, store_size=2048),
+        Index(name="closed", docs_count=0, store_size=0),
+    ]
+
+
+def test_get_all_indexes_skips_hidden():
+    names = [index.name for index in _get_client().get_indexes()]
+    assert names == ["logs-1", "logs-2", "metrics", "users"]
+
+
+def test_get_indexes_by_expressions():
+    client = _get_client()
+    indexes = client.get_indexes(expressions=["users", "logs-*", "missing", "/met.*/"])
+    assert [index.name for index in indexes] == ["logs-1", "logs-2", "metrics", "users"]
+    # Test case: names are resolved by a single request, halves after a miss.
+    assert client.expressions[:3] == ["users,logs-*,missing", "users", "logs-*,missing"]
+
+
+def test_catalog_cached_until_invalidated():
+    source, dest = _get_client(), FakeCatClient(names=["logs-1"])
+    catalog = IndexCatalog(
+        source_client=source, dest_client=dest, expressions=["logs-*"], ttl=60
+    )
+    assert [index.name for index in catalog.get_source_indexes()] == [
+        "logs-1",
+        "logs-2",
+    ]
+    assert [index.name for index in catalog.get_dest_indexes()] == ["logs-1"]
+    # Test case: destination is listed once and narrowed to resolved names.
+    assert source.expressions == ["logs-*"]
+    assert dest.expressions == [None]
+
+    catalog.invalidate()
+    catalog.get_indexes()
+    assert len(source.expressions) == 2
+
+
+def test_catalog_expires():
+    source, dest = _get_client(), _get_client()
+    catalog = IndexCatalog(
+        source_client=source, dest_client=dest, expressions=None, ttl=0
+    )
+    catalog.get_indexes()
+    catalog.get_indexes()
+    assert len(source.expressions) == len(dest.expressions) == 2
+
+
+class FakeAliasClient(FakeCatClient):
+    """
+    Client resolving an alias to its indexes, like `_cat/indices/<alias>`.
+    """
+
+    def __init__(self, names: list[str], aliases: dict[str, list[str]]) -> None:
+        super().__init__(names=names)
+        self.aliases = aliases
+
+    def _cat_indexes(self, expression: str | None) -> list[Index]:
+        if expression in self.aliases:
+            self.expressions.append(expression)
+            return [
+                Index(name=name, docs_count=1, store_size=10)
+                for name in self.aliases[expression]
+            ]
+        return super()._cat_indexes(expression=expression)
+
+
+def test_catalog_source_only_alias():
+    source = FakeAliasClient(
+        names=["logs-1", "logs-2"], aliases={"logs": ["logs-1", "logs-2"]}
+    )
+    dest = FakeCatClient(names=["logs-1"])
+    catalog = IndexCatalog(
+        source_client=source, dest_client=dest, expressions=["logs"], ttl=60
+    )
+    # Test case: alias missing on destination does not hide migrated indexes.
+    assert [index.name for index in catalog.get_source_indexes()] == [
+        "logs-1",
+        "logs-2",
+    ]
+    assert [index.name for index in catalog.get_dest_indexes()] == ["logs-1"]
+
+
+def test_catalog_lists_destination_once():
+    source = _get_client()
+    dest = FakeCatClient(names=[".kibana", "users"])
+    catalog = IndexCatalog(
+        source_client=source,
+        dest_client=dest,
+        expressions=[".kibana", "users", "missing-*"],
+        ttl=60,
+    )
+    # Test case: explicitly named hidden index is matched on destination too.
+    assert [index.name for index in catalog.get_dest_indexes()] == [".kibana", "users"]
+    assert dest.expressions == [None]
+
+    empty = IndexCatalog(
+        source_client=_get_client(),
+        dest_client=FakeCatClient(names=[]),
+        expressions=["missing-*"],
+        ttl=60,
+    )
+    assert empty.get_indexes() == ([], [])
@@ -4,6 +4,9 @@ from elasticsearch_reindex.const import (
     DEFAULT_CHECK_INTERVAL,
     DEFAULT_CONCURRENT_TASKS,
     DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SCHEDULING,
+    DEFAULT_SLICE_MIN_DOCS,
+    DEFAULT_SLICES,
 )
 from elasticsearch_reindex.schema import (
     Config,
@@ -88,3 +91,10 @@ def test_config_defaults():
     assert config.request_timeout == DEFAULT_REQUEST_TIMEOUT
     assert config.concurrent_tasks == DEFAULT_CONCURRENT_TASKS
     assert config.check_interval == DEFAULT_CHECK_INTERVAL
+    assert config.slices == DEFAULT_SLICES
+    assert config.slice_field is None
+    assert config.slice_min_docs == DEFAULT_SLICE_MIN_DOCS
+    assert config.scheduling == DEFAULT_SCHEDULING
+    assert config.http_compress is True
+    assert config.requests_per_second is None
+    assert config.throttle_target_latency is None
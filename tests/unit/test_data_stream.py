@@ -0,0 +1,49 @@
+from elasticsearch_reindex.data_stream import get_backing_indices, match_expressions
+from elasticsearch_reindex.schema import DataStream
+
+
+def _get_data_streams() -> list[DataStream]:
+    return [
+        DataStream(
+            name="metrics", indices=[".ds-metrics-000001", ".ds-metrics-000002"]
+        ),
+        DataStream(
+            name="logs",
+            indices=[".ds-logs-000001", ".ds-logs-000002", ".ds-logs-000003"],
+        ),
+    ]
+
+
+def test_match_expressions():
+    assert match_expressions(name="logs-app", expressions=None)
+    assert match_expressions(name="logs-app", expressions=["metrics", "logs-*"])
+    assert match_expressions(name="logs-app", expressions=["/logs-(app|web)/"])
+    assert not match_expressions(name="logs-app", expressions=["logs", "/logs/"])
+
+
+def test_backing_indices_oldest_first():
+    backing, held = get_backing_indices(
+        data_streams=_get_data_streams(),
+        ilm_phases={".ds-logs-000002": "hot", ".ds-logs-000001": "warm"},
+        cutover=False,
+    )
+    # Test case: oldest generation of every data stream goes first.
+    assert backing == {".ds-logs-000001": "logs", ".ds-metrics-000001": "metrics"}
+    assert list(backing) == [".ds-logs-000001", ".ds-metrics-000001"]
+    assert held == [".ds-logs-000002", ".ds-metrics-000002", ".ds-logs-000003"]
+
+
+def test_backing_indices_cutover():
+    backing, held = get_backing_indices(
+        data_streams=_get_data_streams(),
+        ilm_phases={".ds-logs-000002": "hot"},
+        cutover=True,
+    )
+    assert list(backing) == [
+        ".ds-logs-000001",
+        ".ds-metrics-000001",
+        ".ds-logs-000002",
+        ".ds-metrics-000002",
+        ".ds-logs-000003",
+    ]
+    assert held == []
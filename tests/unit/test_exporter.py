@@ -0,0 +1,96 @@
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from elasticsearch_reindex.exporter import (
+    MetricFamily,
+    MetricsExporter,
+    collect_service_metrics,
+    format_metrics,
+)
+from elasticsearch_reindex.reindex import ReindexService
+from elasticsearch_reindex.schema import Config, IndexSlice
+
+
+def _collect() -> list[MetricFamily]:
+    return [
+        MetricFamily(name="tasks", type="gauge", help="Tasks.")
+        .add(2, state="queued")
+        .add(3, state="running")
+    ]
+
+
+def test_format_metrics():
+    families = _collect() + [
+        MetricFamily(name="poll_duration_seconds", type="summary", help="Polls.")
+        .add(0.5, suffix="_sum")
+        .add(12345678, suffix="_count"),
+        MetricFamily(name="documents_total", type="counter", help="Docs.").add(
+            1, index='a"b'
+        ),
+    ]
+    assert format_metrics(families=families) == (
+        "# HELP elasticsearch_reindex_tasks Tasks.\n"
+        "# TYPE elasticsearch_reindex_tasks gauge\n"
+        'elasticsearch_reindex_tasks{state="queued"} 2\n'
+        'elasticsearch_reindex_tasks{state="running"} 3\n'
+        "# HELP elasticsearch_reindex_poll_duration_seconds Polls.\n"
+        "# TYPE elasticsearch_reindex_poll_duration_seconds summary\n"
+        "elasticsearch_reindex_poll_duration_seconds_sum 0.5\n"
+        "elasticsearch_reindex_poll_duration_seconds_count 12345678\n"
+        "# HELP elasticsearch_reindex_documents_total Docs.\n"
+        "# TYPE elasticsearch_reindex_documents_total counter\n"
+        'elasticsearch_reindex_documents_total{index="a\\"b"} 1\n'
+    )
+
+
+def test_collect_service_metrics():
+    config = Config(
+        source_host="http://source:9200",
+        dest_host="http://dest:9200",
+        source_http_auth=None,
+        dest_http_auth=None,
+        indexes=None,
+    )
+    service = ReindexService(config=config)
+    es_slice = IndexSlice(index="logs", docs_count=100, store_size=1000)
+    service.metrics.register(index_slices=[es_slice])
+    service.metrics.update(
+        task_id="node:1", es_slice=es_slice, info={"total": 100, "created": 40}
+    )
+    service.dest_breaker.record_failure()
+
+    text = format_metrics(families=collect_service_metrics(service=service))
+    assert 'elasticsearch_reindex_documents_total{index="logs"} 40' in text
+    assert 'elasticsearch_reindex_documents_planned{index="_all"} 100' in text
+    assert 'elasticsearch_reindex_bytes_total{index="logs"} 400' in text
+    assert (
+        'elasticsearch_reindex_request_failures_total{cluster="dest",'
+        'host="http://dest:9200"} 1'
+    ) in text
+    assert 'elasticsearch_reindex_circuit_open{cluster="dest"} 0' in text
+
+
+def test_textfile(tmp_path: Path):
+    path = tmp_path / "reindex.prom"
+    exporter = MetricsExporter(collect=_collect, textfile=str(path), interval=60)
+    exporter.start()
+    exporter.stop()
+    # Final state is written on stop, without waiting for the interval.
+    assert 'elasticsearch_reindex_tasks{state="running"} 3' in path.read_text()
+    assert not (tmp_path / "reindex.prom.tmp").exists()
+
+
+def test_http_endpoint():
+    exporter = MetricsExporter(collect=_collect, port=0)
+    exporter.start()
+    try:
+        with urlopen(f"http://127.0.0.1:{exporter.port}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert b'elasticsearch_reindex_tasks{state="queued"} 2' in response.read()
+        with pytest.raises(HTTPError):
+            urlopen(f"http://127.0.0.1:{exporter.port}/")
+    finally:
+        exporter.stop()
@@ -0,0 +1,81 @@
+from elasticsearch_reindex.guard import GuardDecision, SourceGuard, SourceLoad
+
+
+def _get_load(
+    queue: int = 0,
+    rejected: int = 0,
+    total: int = 0,
+    time_ms: int = 0,
+    cpu: float = 0.0,
+) -> SourceLoad:
+    return SourceLoad(
+        search_queue=queue,
+        search_rejected=rejected,
+        query_total=total,
+        query_time_ms=time_ms,
+        cpu_percent=cpu,
+    )
+
+
+def test_source_load_from_nodes_stats():
+    stats = {
+        "nodes": {
+            "node1": {
+                "thread_pool": {"search": {"queue": 5, "rejected": 1}},
+                "indices": {"search": {"query_total": 100, "query_time_in_millis": 50}},
+                "os": {"cpu": {"percent": 40}},
+            },
+            "node2": {
+                "thread_pool": {"search": {"queue": 3, "rejected": 0}},
+                "indices": {"search": {"query_total": 300, "query_time_in_millis": 70}},
+                "os": {"cpu": {"percent": 90}},
+            },
+        }
+    }
+    load = SourceLoad.from_nodes_stats(stats)
+    assert load == _get_load(queue=8, rejected=1, total=400, time_ms=120, cpu=90)
+
+
+def test_guard_backs_off_to_pause():
+    guard = SourceGuard(max_tasks=4, max_search_queue=10, min_rps=100, max_rps=2000)
+    busy = _get_load(queue=20)
+
+    decision = guard.update(previous=busy, current=busy, requests_per_second=None)
+    assert decision == GuardDecision(tasks=2, requests_per_second=1000)
+    # Test case: throttle backs off from the current one of tasks.
+    decision = guard.update(previous=busy, current=busy, requests_per_second=300)
+    assert decision == GuardDecision(tasks=1, requests_per_second=150)
+    decision = guard.update(previous=busy, current=busy, requests_per_second=150)
+    assert decision == GuardDecision(tasks=0, requests_per_second=100)
+    # Test edge case: paused at minimal throttle.
+    assert guard.update(previous=busy, current=busy, requests_per_second=100) is None
+
+
+def test_guard_rejections_and_latency():
+    guard = SourceGuard(max_tasks=2, max_search_latency=10, max_rps=2000)
+    previous = _get_load(rejected=1, total=100, time_ms=100)
+
+    # Test case: rejected searches are stress even with low latency.
+    decision = guard.update(previous=previous, current=_get_load(rejected=2))
+    assert decision == GuardDecision(tasks=1, requests_per_second=1000)
+
+    current = _get_load(rejected=1, total=200, time_ms=1600)
+    decision = guard.update(previous=previous, current=current)
+    assert decision == GuardDecision(tasks=0, requests_per_second=500)
+
+
+def test_guard_recovers():
+    guard = SourceGuard(max_tasks=2, max_cpu=80, min_rps=100, max_rps=2000)
+    guard.tasks, guard.requests_per_second = 0, 500
+    idle = _get_load(cpu=10)
+
+    decision = guard.update(previous=idle, current=idle)
+    assert decision == GuardDecision(tasks=1, requests_per_second=1000)
+    # Test case: cap is lifted once throttle reaches the maximum.
+    decision = guard.update(previous=idle, current=idle)
+    assert decision == GuardDecision(tasks=2, requests_per_second=None)
+    assert guard.update(previous=idle, current=idle) is None
+
+    # Test edge case: load within headroom keeps limits unchanged.
+    guard.tasks = 1
+    assert guard.update(previous=idle, current=_get_load(cpu=70)) is None
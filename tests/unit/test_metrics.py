@@ -0,0 +1,101 @@
+from elasticsearch_reindex.metrics import ReindexMetrics, RollingRate, ThroughputStats
+from elasticsearch_reindex.schema import IndexSlice
+
+
+def test_rolling_rate_window():
+    rate = RollingRate(window=10)
+    rate.add(timestamp=0, docs=0, size=0)
+    rate.add(timestamp=5, docs=5000, size=50)
+    assert rate.get() == (1000, 10)
+
+    # Samples older than window are dropped, except the newest one as base.
+    rate.add(timestamp=20, docs=5100, size=60)
+    rate.add(timestamp=25, docs=5600, size=110)
+    assert rate.get() == (30, 3)
+
+
+def test_rolling_rate_single_sample():
+    rate = RollingRate(window=10)
+    rate.add(timestamp=0, docs=10, size=0)
+    assert rate.get() == (0, 0)
+
+
+def test_eta():
+    stats = ThroughputStats(
+        docs=1000,
+        total=3000,
+        bytes=0,
+        batches=1,
+        version_conflicts=0,
+        throttled_millis=0,
+        docs_per_second=100,
+        bytes_per_second=0,
+        elapsed=10,
+    )
+    assert stats.eta == 20
+    assert "ETA 20s" in stats.format()
+    stats.docs_per_second = 0
+    assert stats.eta is None
+
+
+def test_metrics_sum_up_tasks():
+    metrics = ReindexMetrics()
+    slices = [
+        IndexSlice(index="index1", slice_id=i, slices=2, docs_count=500, store_size=50)
+        for i in range(2)
+    ]
+    metrics.register(index_slices=slices)
+    for task_id, es_slice in zip(("node:1", "node:2"), slices):
+        metrics.start_task(task_id=task_id)
+        metrics.update(
+            task_id=task_id,
+            es_slice=es_slice,
+            info={"total": 500, "created": 100, "batches": 1},
+        )
+
+    stats = metrics.update(
+        task_id="node:1",
+        es_slice=slices[0],
+        info={"total": 500, "created": 300, "version_conflicts": 50, "batches": 4},
+    )
+    assert (stats.docs, stats.total, stats.batches) == (350, 500, 4)
+    assert stats.docs_per_second > 0
+
+    index_stats = metrics.get_index_stats(es_index="index1")
+    assert (index_stats.docs, index_stats.total) == (450, 1000)
+    assert index_stats.version_conflicts == 50
+    # Bytes of remote tasks are estimated by average document size.
+    assert index_stats.bytes == 45
+
+    run_stats = metrics.get_run_stats()
+    assert (run_stats.docs, run_stats.batches) == (450, 5)
+
+
+def test_metrics_count_retried_slice_once():
+    metrics = ReindexMetrics()
+    es_slice = IndexSlice(index="index1", docs_count=100, store_size=100)
+    metrics.register(index_slices=[es_slice])
+    metrics.start_task(task_id="node:1")
+    metrics.update(
+        task_id="node:1", es_slice=es_slice, info={"total": 100, "created": 40}
+    )
+
+    # Test case: retry with op_type `create` skips documents of the failed task.
+    metrics.start_task(task_id="node:2")
+    stats = metrics.update(
+        task_id="node:2",
+        es_slice=es_slice,
+        info={"total": 100, "created": 10, "version_conflicts": 20},
+    )
+    assert (stats.docs, stats.total) == (30, 100)
+    run_stats = metrics.get_run_stats()
+    assert (run_stats.docs, run_stats.total) == (40, 100)
+
+    metrics.update(
+        task_id="node:2",
+        es_slice=es_slice,
+        info={"total": 100, "created": 60, "version_conflicts": 40},
+    )
+    run_stats = metrics.get_run_stats()
+    assert (run_stats.docs, run_stats.total) == (100, 100)
+    assert metrics.get_index_stats(es_index="index1").docs == 100
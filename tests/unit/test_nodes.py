@@ -0,0 +1,94 @@
+from unittest.mock import Mock
+
+from elasticsearch_reindex.nodes import NodePool, get_node_url, get_task_node_id
+from elasticsearch_reindex.reindex import ReindexService
+from elasticsearch_reindex.schema import Config
+
+NODES_INFO = {
+    "nodes": {
+        "n1": {
+            "roles": ["data_hot", "ingest"],
+            "http": {"publish_address": "10.0.0.1:9200"},
+        },
+        "n2": {"roles": ["data"], "http": {"publish_address": "es-2/10.0.0.2:9200"}},
+        "n3": {"roles": ["data_content"], "http": {"publish_address": "10.0.0.3:9200"}},
+        "m1": {"roles": ["master"], "http": {"publish_address": "10.0.0.9:9200"}},
+    }
+}
+
+
+def _get_pool() -> NodePool:
+    return NodePool.from_nodes_info(
+        default_host="https://dest:9200", json_data=NODES_INFO, reset_timeout=60
+    )
+
+
+def test_node_url():
+    assert get_node_url(publish_address="10.0.0.1:9200", scheme="http") == (
+        "http://10.0.0.1:9200"
+    )
+    assert get_node_url(publish_address="es-1/10.0.0.1:9200", scheme="https") == (
+        "https://es-1:9200"
+    )
+    assert get_node_url(publish_address="[::1]:9200", scheme="http") == (
+        "http://[::1]:9200"
+    )
+    assert get_task_node_id(task_id="oTUltX4IQMOUUVeiohTt8A:124") == (
+        "oTUltX4IQMOUUVeiohTt8A"
+    )
+
+
+def test_data_nodes_discovered():
+    pool = _get_pool()
+    assert [(node.node_id, node.url) for node in pool.nodes] == [
+        ("n1", "https://10.0.0.1:9200"),
+        ("n2", "https://es-2:9200"),
+        ("n3", "https://10.0.0.3:9200"),
+    ]
+
+
+def test_choose_least_loaded_node():
+    pool = _get_pool()
+    assert pool.choose(running_tasks=["n1:1", "n1:2", "n2:1"]).node_id == "n3"
+    # Test case: nodes with equal load are taken in turns.
+    chosen = {pool.choose(running_tasks=[]).node_id for _ in range(3)}
+    assert chosen == {"n1", "n2", "n3"}
+
+
+def test_failed_node_skipped():
+    pool = _get_pool()
+    pool.nodes[2].breaker.record_failure()
+    assert pool.choose(running_tasks=["n1:1", "n2:1"]).node_id in {"n1", "n2"}
+    assert pool.get_task_node(task_id="n3:1") is None
+    assert pool.get_task_node(task_id="n2:1").url == "https://es-2:9200"
+
+    for node in pool.nodes:
+        node.breaker.record_failure()
+    assert pool.choose(running_tasks=[]) is None
+
+
+def test_connection_pool_per_node(monkeypatch):
+    config = Config(
+        source_host="http://source:9200",
+        dest_host="https://dest:9200",
+        source_http_auth=None,
+        dest_http_auth=None,
+        indexes=None,
+        spread_dest_nodes=True,
+    )
+    service = ReindexService(config=config)
+    session = service.http_session
+    monkeypatch.setattr(
+        session, "get", Mock(return_value=Mock(json=lambda: NODES_INFO))
+    )
+    monkeypatch.setattr(service, "_is_node_reachable", lambda node: True)
+
+    hosts = [node.url for node in service.dest_nodes.nodes] + [config.dest_host]
+    pool_manager = session.get_adapter(url=config.dest_host).poolmanager
+    pools = [pool_manager.connection_from_url(url) for url in hosts]
+
+    # Test case: switching between nodes reuses pools instead of evicting them.
+    for _ in range(2):
+        for url, pool in zip(hosts, pools):
+            assert pool_manager.connection_from_url(url) is pool
+    assert len(pool_manager.pools) == len(hosts) == 4
@@ -0,0 +1,49 @@
+import json
+
+from elasticsearch_reindex.planner import BenchmarkResult, build_plan
+from elasticsearch_reindex.scheduler import ReindexScheduler
+from elasticsearch_reindex.schema import Config, IndexSlice
+
+
+def test_build_plan():
+    config = Config(
+        source_host="http://source:9200",
+        dest_host="http://dest:9200",
+        source_http_auth=None,
+        dest_http_auth=None,
+        indexes=None,
+        concurrent_tasks=2,
+    )
+    index_slices = [
+        IndexSlice(index="small", docs_count=100, store_size=1000),
+        IndexSlice(index="big", slice_id=0, slices=2, docs_count=500, store_size=5000),
+        IndexSlice(index="big", slice_id=1, slices=2, docs_count=500, store_size=5000),
+    ]
+    schedule = ReindexScheduler(workers=2).plan(index_slices=index_slices)
+    plan = build_plan(
+        config=config,
+        plan=schedule,
+        actions={"small": "delta", "big[1/2]": "full", "big[2/2]": "full"},
+        reattached_tasks=[],
+    )
+    assert [(index.index, index.docs, index.slices) for index in plan.indexes] == [
+        ("big", 1000, 2),
+        ("small", 100, 1),
+    ]
+    assert plan.order == ["big[1/2]", "big[2/2]", "small"]
+    assert plan.makespan_bytes == 6000
+    assert plan.estimated_seconds is None
+
+    # Test case: busiest slot at the benchmarked rate of a single task.
+    plan.benchmark = BenchmarkResult(index="big", docs=100, bytes=1000, seconds=2)
+    assert plan.estimated_seconds == 12
+    data = json.loads(plan.to_json())
+    assert data["estimated_seconds"] == 12
+    assert data["benchmark"]["docs_per_second"] == 50
+    assert data["indexes"][1] == {
+        "index": "small",
+        "action": "delta",
+        "docs": 100,
+        "bytes": 1000,
+        "slices": 1,
+    }
@@ -0,0 +1,146 @@
+import pytest
+
+from elasticsearch_reindex.poller import TaskPoller
+from elasticsearch_reindex.schema import IndexSlice
+
+
+class FakeTasksAPI:
+    """
+    Fake Elasticsearch Tasks API with running and finished tasks.
+    """
+
+    def __init__(self) -> None:
+        self.running: dict[str, dict[str, int]] = {}
+        self.finished: dict[str, dict[str, int]] = {}
+        self.list_calls = 0
+        self.get_calls: list[str] = []
+        self.progress: list[tuple[str, dict[str, int]]] = []
+
+    def list_tasks(self) -> dict[str, dict[str, int]]:
+        self.list_calls += 1
+        return self.running
+
+    def get_task(self, task_id: str) -> tuple[bool, dict[str, int]]:
+        self.get_calls.append(task_id)
+        if task_id not in self.finished:
+            raise ValueError(f"Unknown task: {task_id}")
+        return True, self.finished[task_id]
+
+    def on_progress(self, task_id: str, es_slice: IndexSlice, info: dict) -> None:
+        self.progress.append((task_id, info))
+
+
+@pytest.fixture
+def tasks_api() -> FakeTasksAPI:
+    return FakeTasksAPI()
+
+
+@pytest.fixture
+def poller(tasks_api: FakeTasksAPI) -> TaskPoller:
+    # Large interval: polling is triggered manually in tests.
+    return TaskPoller(
+        list_tasks=tasks_api.list_tasks,
+        get_task=tasks_api.get_task,
+        check_interval=3600,
+        on_progress=tasks_api.on_progress,
+    )
+
+
+def test_poll_running_tasks_with_single_request(
+    poller: TaskPoller, tasks_api: FakeTasksAPI
+):
+    tasks_api.running = {
+        "node:1": {"total": 10, "created": 5},
+        "node:2": {"total": 20, "created": 1},
+    }
+    future1 = poller.track(task_id="node:1", es_slice=IndexSlice(index="index1"))
+    future2 = poller.track(task_id="node:2", es_slice=IndexSlice(index="index2"))
+
+    poller.poll()
+
+    assert tasks_api.list_calls == 1
+    assert not tasks_api.get_calls
+    assert len(tasks_api.progress) == 2
+    assert not future1.done() and not future2.done()
+    poller.stop()
+
+
+def test_poll_finished_task(poller: TaskPoller, tasks_api: FakeTasksAPI):
+    tasks_api.finished = {"node:1": {"total": 10, "created": 10}}
+    future = poller.track(task_id="node:1", es_slice=IndexSlice(index="index1"))
+
+    poller.poll()
+
+    assert future.result(timeout=1) == "node:1"
+    assert tasks_api.get_calls == ["node:1"]
+    assert not poller.tracked_tasks
+    poller.stop()
+
+
+def test_poll_failed_task(poller: TaskPoller, tasks_api: FakeTasksAPI):
+    future = poller.track(task_id="node:1", es_slice=IndexSlice(index="index1"))
+
+    poller.poll()
+
+    with pytest.raises(ValueError, match="Unknown task"):
+        future.result(timeout=1)
+    assert not poller.tracked_tasks
+    poller.stop()
+
+
+def test_poll_unavailable_destination(tasks_api: FakeTasksAPI):
+    def list_tasks() -> dict:
+        raise ConnectionError("Connection refused")
+
+    poller = TaskPoller(
+        list_tasks=list_tasks,
+        get_task=tasks_api.get_task,
+        check_interval=3600,
+        retryable=(ConnectionError,),
+        max_check_errors=2,
+    )
+    future = poller.track(task_id="node:1", es_slice=IndexSlice(index="index1"))
+
+    poller.poll()
+    assert not future.done()
+    assert not tasks_api.get_calls
+
+    poller.poll()
+    with pytest.raises(ConnectionError):
+        future.result(timeout=1)
+    assert not poller.tracked_tasks
+    poller.stop()
+
+
+def test_poll_survives_failing_callback(tasks_api: FakeTasksAPI):
+    def on_progress(task_id: str, es_slice: IndexSlice, info: dict) -> None:
+        raise RuntimeError("database is locked")
+
+    poller = TaskPoller(
+        list_tasks=tasks_api.list_tasks,
+        get_task=tasks_api.get_task,
+        check_interval=0.01,
+        on_progress=on_progress,
+    )
+    tasks_api.running = {"node:1": {"total": 10, "created": 5}}
+    tasks_api.finished = {"node:2": {"total": 10, "created": 10}}
+    running = poller.track(task_id="node:1", es_slice=IndexSlice(index="index1"))
+    finished = poller.track(task_id="node:2", es_slice=IndexSlice(index="index2"))
+
+    # Test case: polling thread keeps resolving tasks after callback errors.
+    assert finished.result(timeout=1) == "node:2"
+    tasks_api.finished["node:1"] = tasks_api.running.pop("node:1")
+    assert running.result(timeout=1) == "node:1"
+    poller.stop()
+
+
+def test_poll_skips_cancelled_future(poller: TaskPoller, tasks_api: FakeTasksAPI):
+    tasks_api.finished = {"node:1": {"total": 10, "created": 10}}
+    future = poller.track(task_id="node:1", es_slice=IndexSlice(index="index1"))
+    future.cancel()
+
+    poller.poll()
+
+    assert future.cancelled()
+    assert not poller.tracked_tasks
+    poller.stop()
@@ -0,0 +1,176 @@
+import pytest
+import requests
+
+from elasticsearch_reindex.errors import (
+    ElasticSearchInvalidTaskIDException,
+    ElasticSearchTaskException,
+    ElasticSearchTransientException,
+)
+from elasticsearch_reindex.reindex import ReindexService
+from elasticsearch_reindex.schema import Config, IndexSlice
+
+
+@pytest.fixture
+def service() -> ReindexService:
+    config = Config(
+        source_host="http://source:9200",
+        dest_host="http://dest:9200",
+        source_http_auth=None,
+        dest_http_auth=None,
+        indexes=None,
+    )
+    return ReindexService(config=config)
+
+
+def test_parse_running_task(service: ReindexService):
+    completed, info = service._parse_task_response(
+        json_data={"completed": False, "task": {"status": {"total": 10, "created": 4}}},
+        task_id="node:1",
+    )
+    assert not completed
+    assert (info["total"], info["created"], info["updated"]) == (10, 4, 0)
+
+
+def test_parse_task_without_status(service: ReindexService):
+    completed, info = service._parse_task_response(
+        json_data={"completed": True, "task": {}, "response": {"failures": []}},
+        task_id="node:1",
+    )
+    assert completed
+    assert info["total"] == 0
+
+
+def test_parse_task_with_failures(service: ReindexService):
+    failure = {"index": "index1", "cause": {"type": "mapper_parsing_exception"}}
+    json_data = {
+        "completed": True,
+        "task": {"status": {"total": 10, "created": 4}},
+        "response": {"failures": [failure]},
+    }
+    with pytest.raises(ElasticSearchTaskException, match="mapper_parsing_exception"):
+        service._parse_task_response(json_data=json_data, task_id="node:1")
+
+
+def test_parse_failed_task(service: ReindexService):
+    json_data = {"completed": True, "error": {"type": "task_cancelled_exception"}}
+    with pytest.raises(ElasticSearchTaskException, match="task_cancelled_exception"):
+        service._parse_task_response(json_data=json_data, task_id="node:1")
+
+
+@pytest.mark.parametrize(
+    "error_type, exc_type",
+    [
+        ("resource_not_found_exception", ElasticSearchInvalidTaskIDException),
+        ("illegal_argument_exception", ElasticSearchInvalidTaskIDException),
+        ("node_not_connected_exception", ElasticSearchTransientException),
+        ("security_exception", ElasticSearchTaskException),
+    ],
+)
+def test_parse_task_error(service: ReindexService, error_type: str, exc_type: type):
+    with pytest.raises(exc_type):
+        service._parse_task_response(
+            json_data={"error": {"type": error_type}, "status": 404}, task_id="node:1"
+        )
+
+
+def test_transient_status(service: ReindexService):
+    with pytest.raises(ElasticSearchTransientException, match="503"):
+        service._check_transient_status(status=503, error="unavailable")
+    service._check_transient_status(status=404, error="not found")
+
+
+def test_parse_task_running_time(service: ReindexService):
+    _, info = service._parse_task_response(
+        json_data={
+            "completed": True,
+            "task": {"status": {"created": 5}, "running_time_in_nanos": 2_500_000_000},
+            "response": {"failures": []},
+        },
+        task_id="node:1",
+    )
+    assert info["running_millis"] == 2500
+
+
+def test_reindex_body_of_sample(service: ReindexService):
+    body = service._get_reindex_body(
+        es_slice=IndexSlice(index="logs", dest_index="scratch-logs", max_docs=100)
+    )
+    assert body["source"]["index"] == "logs"
+    assert body["dest"] == {"index": "scratch-logs"}
+    assert body["max_docs"] == 100
+    assert "max_docs" not in service._get_reindex_body(
+        es_slice=IndexSlice(index="logs")
+    )
+
+
+def test_transfer_index_check_interval(service: ReindexService):
+    transferred = []
+
+    def transfer_slice(es_slice: IndexSlice) -> str:
+        transferred.append(es_slice)
+        return "node:1"
+
+    service.transfer_slice = transfer_slice
+
+    assert service.transfer_index(es_index="logs", check_interval=1) == "node:1"
+    assert transferred == [IndexSlice(index="logs")]
+    assert service.poller.check_interval == 1
+
+    # Test case: interval is left as is when not provided.
+    service.transfer_index(es_index="logs")
+    assert service.poller.check_interval == 1
+
+
+def test_get_task_by_opaque_id(service: ReindexService):
+    json_data = {
+        "nodes": {
+            "node": {
+                "tasks": {
+                    "node:1": {"headers": {}},
+                    "node:2": {"headers": {"X-Opaque-Id": "abc"}},
+                }
+            }
+        }
+    }
+    get_task = service._get_task_by_opaque_id
+    assert get_task(json_data=json_data, opaque_id="abc") == "node:2"
+    assert get_task(json_data=json_data, opaque_id="missing") is None
+
+
+def test_create_task_finds_task_of_timed_out_request(service: ReindexService):
+    service._retry.base_delay = 0
+    posted, running = [], {}
+
+    def post_reindex_task(es_slice: IndexSlice, opaque_id: str) -> str:
+        # Destination creates the task, but the response is lost.
+        posted.append(opaque_id)
+        running[opaque_id] = f"node:{len(posted)}"
+        raise requests.Timeout("Read timed out")
+
+    service._post_reindex_task = post_reindex_task
+    service._find_reindex_task = lambda opaque_id: running.get(opaque_id)
+
+    task_id = service._create_reindex_task(es_slice=IndexSlice(index="index1"))
+
+    assert task_id == "node:1"
+    assert len(posted) == 1
+
+
+def test_create_task_resubmits_when_no_task_found(service: ReindexService):
+    service._retry.base_delay = 0
+    posted = []
+
+    def post_reindex_task(es_slice: IndexSlice, opaque_id: str) -> str:
+        posted.append(opaque_id)
+        if len(posted) == 1:
+            raise requests.ConnectionError("Connection refused")
+        return "node:2"
+
+    service._post_reindex_task = post_reindex_task
+    service._find_reindex_task = lambda opaque_id: None
+
+    task_id = service._create_reindex_task(es_slice=IndexSlice(index="index1"))
+
+    assert task_id == "node:2"
+    # Test case: every attempt of the slice is marked by the same opaque ID.
+    assert len(set(posted)) == 1
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from elasticsearch_reindex.errors import (
+    ElasticSearchCircuitOpenException,
+    ElasticSearchTransientException,
+)
+from elasticsearch_reindex.retry import CircuitBreaker, RetryPolicy
+
+RETRYABLE = (ElasticSearchTransientException,)
+
+
+class FlakyCall:
+    """
+    Callable failing with transient error the given amount of times.
+    """
+
+    def __init__(self, failures: int, exc: Exception | None = None) -> None:
+        self.failures = failures
+        self.exc = exc or ElasticSearchTransientException("502 Bad Gateway")
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.exc
+        return "ok"
+
+
+@pytest.fixture
+def breaker() -> CircuitBreaker:
+    return CircuitBreaker(host="http://dest:9200", failure_threshold=3)
+
+
+@pytest.fixture
+def policy(breaker: CircuitBreaker) -> RetryPolicy:
+    return RetryPolicy(breaker=breaker, retries=2, base_delay=0, max_delay=0)
+
+
+def test_breaker_opens_after_failures_in_row(breaker: CircuitBreaker):
+    for _ in range(2):
+        breaker.record_failure()
+    breaker.before_call()
+
+    breaker.record_failure()
+    with pytest.raises(ElasticSearchCircuitOpenException):
+        breaker.before_call()
+    assert breaker.retry_after > 0
+
+    breaker.record_success()
+    breaker.before_call()
+    assert breaker.retry_after == 0
+
+
+def test_breaker_lets_calls_through_after_reset_timeout(breaker: CircuitBreaker):
+    breaker.reset_timeout = 0
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.call(func=lambda: "ok", retryable=RETRYABLE) == "ok"
+
+
+def test_retry_transient_failures(policy: RetryPolicy):
+    func = FlakyCall(failures=2)
+    assert policy.call(func=func, retryable=RETRYABLE) == "ok"
+    assert func.calls == 3
+
+
+def test_retry_gives_up(policy: RetryPolicy):
+    func = FlakyCall(failures=3)
+    with pytest.raises(ElasticSearchTransientException):
+        policy.call(func=func, retryable=RETRYABLE)
+    assert func.calls == 3
+
+
+def test_retry_skips_permanent_failures(policy: RetryPolicy):
+    func = FlakyCall(failures=1, exc=ValueError("mapping"))
+    with pytest.raises(ValueError):
+        policy.call(func=func, retryable=RETRYABLE)
+    assert func.calls == 1
+
+
+def test_retry_waits_for_open_breaker(policy: RetryPolicy, breaker: CircuitBreaker):
+    breaker.reset_timeout = 0.05
+    func = FlakyCall(failures=3)
+    policy.retries = 5
+    assert policy.call(func=func, retryable=RETRYABLE) == "ok"
+    # Breaker opened after 3 failures, the next attempt waited for it.
+    assert func.calls == 4
+
+
+def test_retry_async(policy: RetryPolicy):
+    func = FlakyCall(failures=2)
+
+    async def call() -> str:
+        return func()
+
+    assert asyncio.run(policy.call_async(func=call, retryable=RETRYABLE)) == "ok"
+    assert func.calls == 3
+
+
+def test_backoff_is_jittered_and_capped(breaker: CircuitBreaker):
+    policy = RetryPolicy(breaker=breaker, base_delay=1, max_delay=5)
+    delays = [policy.get_backoff(attempt=10) for _ in range(100)]
+    assert all(0 <= delay <= 5 for delay in delays)
+    assert len(set(delays)) > 1
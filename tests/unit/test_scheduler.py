@@ -0,0 +1,45 @@
+import pytest
+
+from elasticsearch_reindex.const import SCHEDULING_FIFO, SCHEDULING_LONGEST_FIRST
+from elasticsearch_reindex.scheduler import ReindexScheduler, get_slice_weight
+from elasticsearch_reindex.schema import IndexSlice
+
+
+@pytest.fixture
+def index_slices() -> list[IndexSlice]:
+    return [
+        IndexSlice(index="index1", docs_count=10, store_size=100),
+        IndexSlice(index="index2", docs_count=20, store_size=200),
+        IndexSlice(index="index3", docs_count=70, store_size=700),
+    ]
+
+
+def test_get_slice_weight():
+    assert get_slice_weight(IndexSlice(index="index1", docs_count=10)) == 10
+    assert (
+        get_slice_weight(IndexSlice(index="index1", docs_count=10, store_size=500))
+        == 500
+    )
+
+
+def test_longest_first_plan(index_slices: list[IndexSlice]):
+    plan = ReindexScheduler(workers=2, strategy=SCHEDULING_LONGEST_FIRST).plan(
+        index_slices
+    )
+    assert [item.index for item in plan.index_slices] == ["index3", "index2", "index1"]
+    assert plan.makespan_bytes == 700
+    assert plan.makespan_docs == 70
+    assert plan.total_bytes == 1000
+    assert plan.parallel_ratio == 0.7
+
+
+def test_fifo_plan(index_slices: list[IndexSlice]):
+    plan = ReindexScheduler(workers=2, strategy=SCHEDULING_FIFO).plan(index_slices)
+    assert [item.index for item in plan.index_slices] == ["index1", "index2", "index3"]
+    # The largest index starts last on the slot which already did index1.
+    assert plan.makespan_bytes == 800
+
+
+def test_invalid_strategy():
+    with pytest.raises(ValueError, match="Invalid scheduling strategy"):
+        ReindexScheduler(workers=2, strategy="random")
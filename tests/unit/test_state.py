@@ -0,0 +1,96 @@
+from pathlib import Path
+
+from elasticsearch_reindex.schema import IndexSlice
+from elasticsearch_reindex.state import (
+    TASK_DONE,
+    TASK_PENDING,
+    TASK_RUNNING,
+    StateStore,
+)
+
+
+def test_state_store(tmp_path: Path):
+    path = str(tmp_path / "state.db")
+    store = StateStore(path=path, es_host="http://dest:9200")
+    query = {"range": {"id": {"gte": 0, "lt": 10}}}
+    first = IndexSlice(
+        index="index1",
+        slice_id=0,
+        slices=2,
+        query=query,
+        op_type="create",
+        docs_count=5,
+    )
+    second = IndexSlice(index="index1", slice_id=1, slices=2, docs_count=5)
+
+    store.add_slices(index_slices=[first, second])
+    store.task_submitted(es_slice=first, task_id="node:1")
+    store.task_progress(task_id="node:1", info={"created": 3, "total": 5})
+    store.close()
+
+    # Test case: state survives restart of the process.
+    store = StateStore(path=path, es_host="http://dest:9200")
+    records = store.get_records(es_index="index1")
+    assert [record.es_slice for record in records] == [first, second]
+    assert (records[0].task_id, records[0].status) == ("node:1", TASK_RUNNING)
+    assert (records[0].created, records[0].total) == (3, 5)
+    assert (records[1].task_id, records[1].status) == (None, TASK_PENDING)
+
+    # Test case: already recorded slices are not reset.
+    store.add_slices(index_slices=[first])
+    store.task_finished(es_slice=first, status=TASK_DONE)
+    assert store.get_records()[0].status == TASK_DONE
+    assert store.get_unfinished_indexes() == {"index1"}
+    store.task_finished(es_slice=second, status=TASK_DONE)
+    assert store.get_unfinished_indexes() == set()
+
+    # Test case: delta pass replaces recorded slices of the index.
+    delta = IndexSlice(index="index1", query={"range": {"id": {"gte": 10}}})
+    store.reset_slices(index_slices=[delta])
+    records = store.get_records()
+    assert [record.es_slice for record in records] == [delta]
+    assert records[0].status == TASK_PENDING
+
+    # Test case: records of other destination are ignored.
+    other_store = StateStore(path=path, es_host="http://other:9200")
+    assert other_store.get_records() == []
+    other_store.close()
+    store.close()
+
+
+def test_state_store_watermark(tmp_path: Path):
+    store = StateStore(path=str(tmp_path / "state.db"), es_host="http://dest:9200")
+    assert store.get_watermark(es_index="index1", field="updated_at") is None
+
+    store.begin_watermark(es_index="index1", field="updated_at", value=100)
+    # Test case: mark is not visible until the transfer is finished.
+    assert store.get_watermark(es_index="index1", field="updated_at") is None
+
+    # Test case: resumed transfer keeps the mark taken before it started.
+    store.begin_watermark(es_index="index1", field="updated_at", value=200)
+    assert store.commit_watermark(es_index="index1") == 100
+    assert store.get_watermark(es_index="index1", field="updated_at") == 100
+
+    store.begin_watermark(es_index="index1", field="updated_at", value=300)
+    assert store.commit_watermark(es_index="index1") == 300
+
+    # Test case: mark of other field is reset.
+    store.begin_watermark(es_index="index1", field="timestamp", value=400)
+    assert store.get_watermark(es_index="index1", field="timestamp") is None
+    assert store.get_watermark(es_index="index1", field="updated_at") is None
+    store.close()
+
+
+def test_read_only_state_store(tmp_path: Path):
+    path = str(tmp_path / "state.db")
+    store = StateStore(path=path, es_host="http://dest:9200")
+    es_slice = IndexSlice(index="index1")
+    store.add_slices(index_slices=[es_slice])
+    store.close()
+
+    # Test case: dry run reads records, but does not change them.
+    store = StateStore(path=path, es_host="http://dest:9200", read_only=True)
+    store.task_finished(es_slice=es_slice, status=TASK_DONE)
+    store.reset_slices(index_slices=[IndexSlice(index="index1", op_type="create")])
+    assert [record.status for record in store.get_records()] == [TASK_PENDING]
+    store.close()
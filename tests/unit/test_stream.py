@@ -0,0 +1,204 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from elasticsearch_reindex.errors import ElasticSearchBulkException
+from elasticsearch_reindex.schema import Config, IndexSlice
+from elasticsearch_reindex.state import TASK_DONE, TASK_RUNNING, StateStore
+from elasticsearch_reindex.stream import StreamReindexService
+
+
+class FakeSourceClient:
+    """
+    Fake source Elasticsearch client opening points in time.
+    """
+
+    def __init__(self) -> None:
+        self.closed: list[str] = []
+
+    def open_point_in_time(self, es_index: str, keep_alive: str) -> str:
+        return f"pit:{es_index}"
+
+    def close_point_in_time(self, pit_id: str) -> None:
+        self.closed.append(pit_id)
+
+
+class FakeStreamService(StreamReindexService):
+    """
+    Stream service reading numbered documents and writing them to a set of IDs.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        docs: int,
+        existing: set[str] = frozenset(),
+        state_store: StateStore | None = None,
+    ):
+        self.source_client = FakeSourceClient()
+        super().__init__(
+            config=config,
+            source_client=self.source_client,
+            dest_client=None,
+            state_store=state_store,
+        )
+        self.docs = docs
+        self.ids = set(existing)
+        self.bulk_calls = 0
+
+    def _search_page(self, pit_id, es_slice, search_after) -> bytes:
+        pit_slice = self._get_pit_slice(es_slice=es_slice)
+        start = search_after[0] + 1 if search_after else 0
+        ids = [
+            i
+            for i in range(start, self.docs)
+            if not pit_slice or i % pit_slice["max"] == pit_slice["id"]
+        ][: self.config.stream_batch_size]
+        hits = [{"_id": str(i), "_source": {"id": i}, "sort": [i]} for i in ids]
+        return json.dumps({"pit_id": pit_id, "hits": {"hits": hits}}).encode()
+
+    def _send_bulk(self, body: memoryview) -> dict:
+        self.bulk_calls += 1
+        lines = bytes(body).splitlines()
+        items = []
+        for line in lines[::2]:
+            op_type, meta = next(iter(json.loads(line).items()))
+            if op_type == "create" and meta["_id"] in self.ids:
+                items.append({op_type: {"status": 409, "error": {"type": "conflict"}}})
+                continue
+            self.ids.add(meta["_id"])
+            items.append({op_type: {"status": 201, "result": "created"}})
+        return {"errors": False, "items": items}
+
+
+@pytest.fixture
+def config() -> Config:
+    return Config(
+        source_host="http://source:9200",
+        dest_host="http://dest:9200",
+        source_http_auth=None,
+        dest_http_auth=None,
+        indexes=None,
+        concurrent_tasks=2,
+        stream_batch_size=7,
+        stream_writers=2,
+    )
+
+
+def test_stream_slices(config: Config):
+    service = FakeStreamService(config=config, docs=100)
+    futures = [
+        service.submit_slice(es_slice=IndexSlice(index="index1", slice_id=i, slices=2))
+        for i in range(2)
+    ]
+    task_ids = [future.result(timeout=10) for future in futures]
+    service.close()
+
+    assert service.ids == {str(i) for i in range(100)}
+    # Every slice reads 50 documents by pages of 7.
+    assert service.bulk_calls == 2 * 8
+    assert service.source_client.closed == ["pit:index1", "pit:index1"]
+    stats = service.get_task_stats(
+        es_slice=IndexSlice(index="index1"), task_id=task_ids[0]
+    )
+    assert stats["created"] == 50
+
+
+def test_stream_create_skips_existing_documents(config: Config):
+    service = FakeStreamService(
+        config=config, docs=20, existing={str(i) for i in range(5)}
+    )
+    es_slice = IndexSlice(index="index1", op_type="create")
+    task_id = service.submit_slice(es_slice=es_slice).result(timeout=10)
+    service.close()
+
+    stats = service.get_task_stats(es_slice=es_slice, task_id=task_id)
+    assert (stats["created"], stats["version_conflicts"]) == (15, 5)
+
+
+def test_stream_rejected_documents_fail_slice(config: Config):
+    service = FakeStreamService(config=config, docs=10)
+    # First document of every bulk request is rejected by mapping.
+    service._send_bulk = lambda body: {
+        "items": [{"index": {"status": 400, "error": {"type": "mapper"}}}]
+        + [{"index": {"status": 201, "result": "created"}}]
+        * (len(bytes(body).splitlines()) // 2 - 1)
+    }
+    future = service.submit_slice(es_slice=IndexSlice(index="index1"))
+    with pytest.raises(ElasticSearchBulkException):
+        future.result(timeout=10)
+    service.close()
+
+
+def test_stream_retries_rejected_documents(config: Config):
+    service = FakeStreamService(config=config, docs=10)
+    service._retry.base_delay = 0
+    send_bulk = service._send_bulk
+    rejected = {"3", "5"}
+
+    def send_bulk_with_rejections(body: memoryview) -> dict:
+        # Destination write queue is full once for some documents.
+        ids = [
+            json.loads(line)["index"]["_id"] for line in bytes(body).splitlines()[::2]
+        ]
+        response = send_bulk(body=body)
+        for doc_id, item in zip(ids, response["items"]):
+            if doc_id in rejected:
+                rejected.discard(doc_id)
+                service.ids.discard(doc_id)
+                item["index"] = {"status": 429, "error": {"type": "es_rejected"}}
+        return response
+
+    service._send_bulk = send_bulk_with_rejections
+    es_slice = IndexSlice(index="index1")
+    task_id = service.submit_slice(es_slice=es_slice).result(timeout=10)
+    service.close()
+
+    assert service.ids == {str(i) for i in range(10)}
+    stats = service.get_task_stats(es_slice=es_slice, task_id=task_id)
+    assert (stats["created"], stats["rejected"], stats["failed"]) == (10, 2, 0)
+
+
+def test_stream_tasks_recorded_for_resume(config: Config, tmp_path: Path):
+    store = StateStore(path=str(tmp_path / "state.db"), es_host=config.dest_host)
+    es_slices = [IndexSlice(index="index1", slice_id=i, slices=2) for i in range(2)]
+    store.add_slices(index_slices=es_slices)
+    service = FakeStreamService(config=config, docs=20, state_store=store)
+    task_ids = [
+        service.submit_slice(es_slice=es_slice).result(timeout=10)
+        for es_slice in es_slices
+    ]
+    # Test case: the run is interrupted after the first slice is finished.
+    store.task_finished(es_slice=es_slices[0], status=TASK_DONE)
+    service.close()
+
+    records = store.get_records()
+    assert [(r.task_id, r.status) for r in records] == [
+        (task_ids[0], TASK_DONE),
+        (task_ids[1], TASK_RUNNING),
+    ]
+    assert records[1].created == 10
+
+    # Test case: stream of the interrupted run is attached and streamed again.
+    resumed = FakeStreamService(config=config, docs=20, state_store=store)
+    assert not resumed.is_task_completed(task_id=records[1].task_id)
+    resumed.attach_slice(es_slice=es_slices[1], task_id=records[1].task_id).result(
+        timeout=10
+    )
+    resumed.close()
+    assert resumed.ids == {str(i) for i in range(1, 20, 2)}
+
+
+def test_stream_paced_by_source_guard(config: Config):
+    service = FakeStreamService(config=config, docs=20)
+    # Test case: only the source guard throttles, pages of 7 documents.
+    service.source_requests_per_second = 100
+    started = time.monotonic()
+    service.submit_slice(es_slice=IndexSlice(index="index1")).result(timeout=10)
+    service.close()
+
+    # The third page waits until 14 documents are read at 100 docs/s.
+    assert time.monotonic() - started >= 0.13
+    assert service.ids == {str(i) for i in range(20)}
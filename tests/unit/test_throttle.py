@@ -0,0 +1,79 @@
+from elasticsearch_reindex.throttle import NodesPressure, ThrottleController
+
+
+def _get_pressure(
+    queue: int = 0, rejected: int = 0, total: int = 0, time_ms: int = 0
+) -> NodesPressure:
+    return NodesPressure(
+        write_queue=queue,
+        write_rejected=rejected,
+        index_total=total,
+        index_time_ms=time_ms,
+    )
+
+
+def test_nodes_pressure_from_nodes_stats():
+    stats = {
+        "nodes": {
+            "node1": {
+                "thread_pool": {"write": {"queue": 5, "rejected": 1}},
+                "indices": {
+                    "indexing": {"index_total": 1000, "index_time_in_millis": 500}
+                },
+            },
+            "node2": {
+                "thread_pool": {"write": {"queue": 3, "rejected": 0}},
+                "indices": {
+                    "indexing": {"index_total": 3000, "index_time_in_millis": 700}
+                },
+            },
+        }
+    }
+    pressure = NodesPressure.from_nodes_stats(stats)
+    assert pressure == _get_pressure(queue=8, rejected=1, total=4000, time_ms=1200)
+
+
+def test_nodes_pressure_deltas():
+    previous = _get_pressure(rejected=2, total=1000, time_ms=1000)
+    current = _get_pressure(rejected=5, total=3000, time_ms=2000)
+    assert current.latency_since(previous) == 0.5
+    assert current.rejected_since(previous) == 3
+
+    # Test edge case: nothing was indexed between samples.
+    assert previous.latency_since(previous) == 0.0
+
+
+def test_throttle_backoff_on_rejections():
+    controller = ThrottleController(
+        target_latency=1.0, requests_per_second=1000, min_rps=100, max_rps=2000
+    )
+    previous = _get_pressure(total=1000, time_ms=100)
+    current = _get_pressure(rejected=1, total=2000, time_ms=200)
+    assert controller.update(previous, current) == 500
+
+    # Test case: throttle does not go below minimal value.
+    for _ in range(10):
+        controller.update(previous, current)
+    assert controller.requests_per_second == 100
+
+
+def test_throttle_backoff_on_latency():
+    controller = ThrottleController(
+        target_latency=1.0, requests_per_second=1000, min_rps=100, max_rps=2000
+    )
+    previous = _get_pressure(total=1000, time_ms=1000)
+    current = _get_pressure(total=2000, time_ms=3000)
+    assert controller.update(previous, current) == 500
+
+
+def test_throttle_grows_while_latency_is_low():
+    controller = ThrottleController(
+        target_latency=1.0, requests_per_second=1000, min_rps=100, max_rps=2100
+    )
+    previous = _get_pressure(total=1000, time_ms=100)
+    current = _get_pressure(total=2000, time_ms=200)
+    assert controller.update(previous, current) == 1100
+
+    # Test case: latency close to target keeps throttle unchanged.
+    current = _get_pressure(total=2000, time_ms=1000)
+    assert controller.update(previous, current) is None
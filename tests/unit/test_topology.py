@@ -0,0 +1,53 @@
+import pytest
+
+from elasticsearch_reindex.topology import get_route_configs
+
+BASE = {
+    "source_host": None,
+    "dest_host": None,
+    "concurrent_tasks": 2,
+    "state_file": "reindex.db",
+    "metrics_port": 9100,
+}
+
+
+def test_route_configs():
+    topology = {
+        "concurrent_tasks": 6,
+        "clusters": {"http://dest:9200": {"http_auth": "user:password"}},
+        "routes": [
+            {"source_host": "http://a:9200", "dest_host": "http://dest:9200"},
+            {
+                "source_host": "http://b:9200",
+                "dest_host": "http://dest:9200",
+                "indexes": ["logs-*"],
+                "concurrent_tasks": 1,
+            },
+        ],
+    }
+    first, second = get_route_configs(base=BASE, topology=topology)
+    assert (first["source_host"], first["concurrent_tasks"]) == ("http://a:9200", 6)
+    assert first["dest_http_auth"] == "user:password"
+    assert (first["state_file"], second["state_file"]) == (
+        "reindex.1.db",
+        "reindex.2.db",
+    )
+    assert (first["metrics_port"], second["metrics_port"]) == (9100, 9101)
+    assert (second["indexes"], second["concurrent_tasks"]) == (["logs-*"], 1)
+
+
+def test_single_route_keeps_files():
+    topology = {
+        "routes": [{"source_host": "http://a:9200", "dest_host": "http://b:9200"}]
+    }
+    [route] = get_route_configs(base=BASE, topology=topology)
+    assert (route["state_file"], route["concurrent_tasks"]) == ("reindex.db", 2)
+
+
+def test_invalid_topology():
+    with pytest.raises(ValueError):
+        get_route_configs(base=BASE, topology={"routes": []})
+    with pytest.raises(ValueError):
+        get_route_configs(
+            base=BASE, topology={"routes": [{"source_host": "http://a:9200"}]}
+        )
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from elasticsearch_reindex.tracing import Tracer
+
+
+def test_span_records_begin_and_end():
+    tracer = Tracer(enabled=True)
+    with tracer.span(name="discovery", indexes=2) as span:
+        span["slices"] = 4
+
+    begin, end = tracer._events
+    assert begin["ph"] == "b" and end["ph"] == "e"
+    assert begin["id"] == end["id"]
+    assert begin["args"] == {"indexes": 2, "slices": 4}
+    assert end["ts"] >= begin["ts"]
+    assert tracer.get_totals()["discovery"][0] == 1
+
+
+def test_span_records_error():
+    tracer = Tracer(enabled=True)
+    with pytest.raises(ValueError):
+        with tracer.span(name="execution"):
+            raise ValueError("boom")
+
+    assert tracer._events[0]["args"] == {"error": "ValueError"}
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span(name="discovery"):
+        pass
+    tracer.add_span(name="copy", started=tracer.now(), finished=tracer.now())
+
+    assert tracer._events == []
+    assert tracer.get_totals() == {}
+
+
+def test_write_chrome_trace(tmp_path):
+    tracer = Tracer(enabled=True)
+    tracer.add_span(name="copy", started=1.0, finished=3.0, category="task")
+    tracer.add_span(name="copy", started=2.0, finished=3.0, category="task")
+    path = tmp_path / "trace.json"
+    tracer.write(path=str(path))
+
+    events = json.loads(path.read_text())["traceEvents"]
+    # Test case: thread names come first as metadata events.
+    assert events[0]["ph"] == "M"
+    assert [event["ph"] for event in events[1:]] == ["b", "e", "b", "e"]
+    assert tracer.get_totals() == {"copy": (2, 3.0)}
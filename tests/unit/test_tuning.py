@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from elasticsearch_reindex.tuning import TuningJournal
+
+
+def test_tuning_journal(tmp_path: Path):
+    path = str(tmp_path / "journal.json")
+    journal = TuningJournal(path=path, es_host="http://dest:9200")
+    settings = {"index.refresh_interval": "1s", "index.number_of_replicas": "1"}
+
+    journal.add(es_index="index1", settings=settings)
+    journal.add(es_index="index2", settings=settings)
+
+    # Test case: journal survives restart of the process.
+    journal = TuningJournal(path=path, es_host="http://dest:9200")
+    assert journal.pending() == {"index1": settings, "index2": settings}
+
+    # Test case: entries of other destination are ignored.
+    other_journal = TuningJournal(path=path, es_host="http://other:9200")
+    assert other_journal.pending() == {}
+
+    journal.remove(es_index="index1")
+    journal.remove(es_index="index2")
+    assert journal.pending() == {}
+    assert not Path(path).exists()
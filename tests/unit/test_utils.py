@@ -1,5 +1,12 @@
-from elasticsearch_reindex.schema import Index
-from elasticsearch_reindex.utils import check_migrated_indexes, chunkify
+from elasticsearch_reindex.schema import Index, IndexSlice
+from elasticsearch_reindex.utils import (
+    build_pit_slices,
+    build_range_slices,
+    check_migrated_indexes,
+    chunkify,
+    format_duration,
+    get_delta_query,
+)
 
 
 def test_chunkify():
@@ -57,3 +64,56 @@ def test_check_migrated_indexes():
     )
     assert not_migrated == ["index1", "index2", "index3"]
     assert not len(partial_migrated)
+
+
+def test_build_range_slices():
+    slices = build_range_slices(
+        es_index="index1", field="id", min_value=0.0, max_value=100.0, slices=4
+    )
+    assert len(slices) == 4
+    assert [item.name for item in slices] == [
+        "index1[1/4]",
+        "index1[2/4]",
+        "index1[3/4]",
+        "index1[4/4]",
+    ]
+
+    # First slice also includes documents without slicing field.
+    first_query = slices[0].query["bool"]["should"]
+    assert first_query[0] == {"range": {"id": {"gte": 0, "lt": 25}}}
+    assert first_query[1] == {"bool": {"must_not": {"exists": {"field": "id"}}}}
+
+    assert slices[1].query == {"range": {"id": {"gte": 25, "lt": 50}}}
+    # Last slice includes upper bound.
+    assert slices[3].query == {"range": {"id": {"gte": 75, "lte": 100}}}
+
+    # Test edge case: all documents have the same value.
+    slices = build_range_slices(
+        es_index="index1", field="id", min_value=5.0, max_value=5.0, slices=4
+    )
+    assert slices == [IndexSlice(index="index1")]
+
+
+def test_get_delta_query():
+    assert get_delta_query(field="updated_at", watermark=1700000000000.0) == {
+        "range": {"updated_at": {"gte": 1700000000000}}
+    }
+    assert get_delta_query(field="score", watermark=0.5) == {
+        "range": {"score": {"gte": 0.5}}
+    }
+
+
+def test_build_pit_slices():
+    slices = build_pit_slices(es_index="index1", slices=3)
+    assert [(item.slice_id, item.slices, item.query) for item in slices] == [
+        (0, 3, None),
+        (1, 3, None),
+        (2, 3, None),
+    ]
+    assert build_pit_slices(es_index="index1", slices=1) == [IndexSlice(index="index1")]
+
+
+def test_format_duration():
+    assert format_duration(42.7) == "42s"
+    assert format_duration(125) == "2m 5s"
+    assert format_duration(7320) == "2h 2m"
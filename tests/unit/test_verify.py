@@ -0,0 +1,120 @@
+from elasticsearch_reindex.verify import IndexVerifier, VerifyRange, get_source_hash
+
+
+class FakeClient:
+    """
+    Documents of a single index, matched by range and match_all queries.
+    """
+
+    def __init__(self, docs: dict[str, dict]) -> None:
+        self.docs = docs
+
+    def _matches(self, source: dict, query: dict | None) -> bool:
+        if not query or "match_all" in query:
+            return True
+        if "bool" in query:
+            should = query["bool"]["should"]
+            return self._matches(source, should[0]) or "id" not in source
+        bounds = query["range"]["id"]
+        if "id" not in source or source["id"] < bounds["gte"]:
+            return False
+        if "lte" in bounds:
+            return source["id"] <= bounds["lte"]
+        return source["id"] < bounds["lt"]
+
+    def get_field_range(self, es_index: str, field: str) -> tuple[float, float]:
+        values = [doc[field] for doc in self.docs.values() if field in doc]
+        return min(values), max(values)
+
+    def count_documents(self, es_index: str) -> int:
+        return len(self.docs)
+
+    def count_buckets(self, es_index: str, queries: list[dict]) -> list[int]:
+        return [
+            sum(self._matches(source, query) for source in self.docs.values())
+            for query in queries
+        ]
+
+    def get_random_documents(
+        self, es_index: str, query: dict | None, size: int, seed: int
+    ) -> dict[str, dict]:
+        matched = {
+            doc_id: source
+            for doc_id, source in self.docs.items()
+            if self._matches(source, query)
+        }
+        return dict(list(matched.items())[:size])
+
+    def get_documents(self, es_index: str, ids: list[str]) -> dict[str, dict]:
+        return {doc_id: self.docs[doc_id] for doc_id in ids if doc_id in self.docs}
+
+
+def _get_docs(amount: int) -> dict[str, dict]:
+    return {str(i): {"id": i, "value": f"doc {i}"} for i in range(amount)}
+
+
+def _get_verifier(source: dict, dest: dict, sample_docs: int = 0) -> IndexVerifier:
+    return IndexVerifier(
+        source_client=FakeClient(docs=source),
+        dest_client=FakeClient(docs=dest),
+        field="id",
+        buckets=4,
+        sample_docs=sample_docs,
+        min_docs=10,
+    )
+
+
+def test_source_hash():
+    assert get_source_hash({"a": 1, "b": 2}) == get_source_hash({"b": 2, "a": 1})
+    assert get_source_hash({"a": 1}) != get_source_hash({"a": 2})
+
+
+def test_split_range():
+    first, second = VerifyRange(lower=0, upper=10, first=True, last=True).split()
+    assert (first.lower, first.upper, first.first, first.last) == (0, 5, True, False)
+    assert (second.lower, second.upper, second.first, second.last) == (
+        5,
+        10,
+        False,
+        True,
+    )
+    assert VerifyRange(lower=0, upper=1, first=True, last=True).split() == []
+
+
+def test_verify_equal_indexes():
+    docs = _get_docs(amount=400)
+    result = _get_verifier(source=docs, dest=dict(docs), sample_docs=5).verify(
+        es_index="logs"
+    )
+    assert result.ok
+    assert (result.buckets, result.sampled_docs) == (4, 20)
+
+
+def test_verify_bisects_missing_range():
+    source = _get_docs(amount=400)
+    dest = {doc_id: doc for doc_id, doc in source.items() if not 250 <= doc["id"] < 253}
+    result = _get_verifier(source=source, dest=dest).verify(es_index="logs")
+    assert not result.ok
+    assert (result.source_docs, result.dest_docs) == (400, 397)
+    # Test case: range is narrowed down to at most 10 documents.
+    [mismatch] = result.ranges
+    assert mismatch.lower <= 250 and mismatch.upper >= 253
+    assert mismatch.source_docs <= 10
+    assert mismatch.source_docs - mismatch.dest_docs == 3
+    assert mismatch.query == {
+        "range": {"id": {"gte": mismatch.lower, "lt": mismatch.upper}}
+    }
+
+
+def test_verify_sampled_documents():
+    source = _get_docs(amount=400)
+    dest = dict(source)
+    dest["0"] = {"id": 0, "value": "corrupted"}
+    # Test case: documents with equal counts but different IDs.
+    dest.pop("100")
+    dest["extra"] = {"id": 100}
+    result = _get_verifier(source=source, dest=dest, sample_docs=5).verify(
+        es_index="logs"
+    )
+    assert result.ranges == []
+    assert (result.different_ids, result.missing_ids) == (["0"], ["100"])